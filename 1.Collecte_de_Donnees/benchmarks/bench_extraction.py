@@ -0,0 +1,72 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapers import BleepingComputerScraper, KrebsScraper
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+SCRAPERS = {
+    'bleepingcomputer': BleepingComputerScraper,
+    'krebs': KrebsScraper
+}
+
+
+def comparable(article: Dict) -> Dict:
+    return {k: v for k, v in article.items() if k != 'date_extraction'}
+
+
+def time_path(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction BeautifulSoup vs lxml ciblé")
+    parser.add_argument('--fixtures', type=Path, default=FIXTURES_DIR)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    
+    fixtures = sorted(args.fixtures.glob('*.html'))
+    if not fixtures:
+        print(f"Aucune fixture HTML dans {args.fixtures}")
+        return 1
+    
+    status = 0
+    print(f"{'fixture':<35} {'taille':>8} {'soup (ms)':>10} {'rapide (ms)':>12} {'gain':>6}  identique")
+    for path in fixtures:
+        prefix = path.stem.split('_')[0]
+        if prefix not in SCRAPERS:
+            continue
+        
+        scraper = SCRAPERS[prefix](requests_per_second=0)
+        content = path.read_bytes()
+        url = f"https://example.org/{path.stem}"
+        
+        def soup_path():
+            return scraper.extract_article(BeautifulSoup(content, 'lxml'), url)
+        
+        def fast_path():
+            return scraper.extract_article_fast(content, url)
+        
+        same = comparable(soup_path()) == comparable(fast_path())
+        if not same:
+            status = 1
+        
+        soup_time = time_path(soup_path, args.repeat)
+        fast_time = time_path(fast_path, args.repeat)
+        print(f"{path.name:<35} {len(content) // 1024:>6}Ko {soup_time * 1000:>10.2f} "
+              f"{fast_time * 1000:>12.2f} {soup_time / fast_time:>5.1f}x  {'oui' if same else 'NON'}")
+    
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import argparse
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapers import BleepingComputerScraper, KrebsScraper
+from scrapers.replay import FixtureStore, ReplayAdapter
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+SCRAPERS = {
+    'bleepingcomputer': BleepingComputerScraper,
+    'krebs': KrebsScraper
+}
+
+
+def listing_html(prefix: str, article_urls: List[str], next_url: str) -> bytes:
+    if prefix == 'bleepingcomputer':
+        items = ''.join(f'<h4><a href="{url}">Article</a></h4>' for url in article_urls)
+        pagination = f'<a aria-label="Next Page" href="{next_url}">Suivant</a>'
+    else:
+        items = ''.join(f'<h2 class="entry-title"><a href="{url}">Article</a></h2>' for url in article_urls)
+        pagination = f'<a class="next" href="{next_url}">Suivant</a>'
+    return f'<html><body>{items}{pagination}</body></html>'.encode('utf-8')
+
+
+def build_synthetic_store(directory: str, pages: int, per_page: int) -> FixtureStore:
+    # Site factice : pages de listing paginées pointant toutes vers la fixture d'article
+    store = FixtureStore(directory)
+    headers = {'Content-Type': 'text/html; charset=utf-8'}
+    for prefix, scraper_class in SCRAPERS.items():
+        article = (FIXTURES_DIR / f"{prefix}_article.html").read_bytes()
+        scraper = scraper_class(requests_per_second=0)
+        page_url = scraper.start_urls()[0]
+        
+        for page in range(1, pages + 1):
+            article_urls = [
+                f"{scraper.base_url}/news/security/bench-{page}-{i}/" for i in range(per_page)
+            ]
+            if prefix == 'bleepingcomputer':
+                next_url = f"{scraper.base_url}/news/security/page/{page + 1}/"
+            else:
+                next_url = f"{scraper.base_url}/page/{page + 1}/"
+            store.record(page_url, listing_html(prefix, article_urls, next_url), 200, headers)
+            for url in article_urls:
+                store.record(url, article, 200, headers)
+            page_url = next_url
+    return store
+
+
+def run_scraper(scraper_class, store: FixtureStore, args) -> Dict:
+    scraper = scraper_class(max_workers=args.workers, requests_per_second=0, max_depth=args.max_depth,
+                            parse_workers=args.parse_workers)
+    adapter = ReplayAdapter(store, latency=args.latency, jitter=args.jitter,
+                            error_rate=args.error_rate, seed=args.seed)
+    adapter.install(scraper.session)
+    
+    parse_times = []
+    parse_article = scraper.parse_article
+    
+    def timed_parse(content: bytes, url: str):
+        start = time.perf_counter()
+        try:
+            return parse_article(content, url)
+        finally:
+            parse_times.append(time.perf_counter() - start)
+    
+    scraper.parse_article = timed_parse
+    
+    if args.memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    articles = scraper.scrape(max_articles=args.max_articles)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if args.memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    
+    return {
+        'source': scraper.source_name,
+        'articles': len(articles),
+        'requests': adapter.counters['requests'],
+        'errors': adapter.counters['injected_errors'] + adapter.counters['missing'],
+        'elapsed': elapsed,
+        'parse_ms': sum(parse_times) / len(parse_times) * 1000 if parse_times else 0.0,
+        'peak_mb': peak / (1024 * 1024)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de débit des scrapers en mode replay")
+    parser.add_argument('--store', type=str, default=None,
+                        help="Répertoire de fixtures enregistré avec main.py --record (site synthétique sinon)")
+    parser.add_argument('--pages', type=int, default=5, help="Pages de listing du site synthétique")
+    parser.add_argument('--per-page', type=int, default=20, help="Articles par page du site synthétique")
+    parser.add_argument('--max-articles', type=int, default=100)
+    parser.add_argument('--max-depth', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="Processus d'extraction (0 : dans le processus principal ; temps de parsing non mesuré à partir de 1)")
+    parser.add_argument('--latency', type=float, default=0.05, help="Latence simulée par requête (s)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Latence aléatoire supplémentaire (s)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Proportion d'erreurs injectées")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help="Désactiver tracemalloc (mesure de débit sans surcoût)")
+    parser.add_argument('--verbose', action='store_true', help="Afficher les logs des scrapers")
+    args = parser.parse_args()
+    
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.store:
+            store = FixtureStore(args.store)
+        else:
+            store = build_synthetic_store(tmp_dir, args.pages, args.per_page)
+        print(f"Fixtures: {len(store)} réponses, latence {args.latency * 1000:.0f}ms, "
+              f"erreurs {args.error_rate:.0%}, {args.workers} workers")
+        
+        print(f"{'source':<20} {'articles':>8} {'requêtes':>9} {'erreurs':>8} {'pages/s':>8} "
+              f"{'parse (ms)':>11} {'pic (Mo)':>9}")
+        for scraper_class in SCRAPERS.values():
+            result = run_scraper(scraper_class, store, args)
+            pages_per_second = result['requests'] / result['elapsed'] if result['elapsed'] else 0.0
+            print(f"{result['source']:<20} {result['articles']:>8} {result['requests']:>9} "
+                  f"{result['errors']:>8} {pages_per_second:>8.1f} {result['parse_ms']:>11.2f} "
+                  f"{result['peak_mb']:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,14 @@
+import argparse
 import json
 import os
 from typing import List, Dict
 import logging
 from scrapers import BleepingComputerScraper, KrebsScraper
+from scrapers.cache import ResponseCache
+from scrapers.seen_index import SeenIndex
+from scrapers.ndjson_writer import NDJSONWriter
+from scrapers.replay import FixtureStore, ReplayAdapter
+from scrapers.fetch_policy import RetryPolicy
 
 logging.basicConfig(
     level=logging.INFO,
@@ -10,16 +16,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CORPUS_FILENAME = "articles_cybersecurity.json"
+STREAM_FILENAME = "articles_cybersecurity.ndjson"
+
 
 class DataCollector:
-    def __init__(self, output_dir: str = "../data"):
+    def __init__(self, output_dir: str = "../data", max_workers: int = 4,
+                 requests_per_second: float = 1.0, burst: int = 1, use_cache: bool = True,
+                 cache_ttls: Dict[str, int] = None, incremental: bool = False, max_depth: int = 20,
+                 max_age_days: int = None, resume: bool = False, record_dir: str = None,
+                 replay_dir: str = None, max_retries: int = 3, failure_threshold: int = 5,
+                 discovery: str = 'listing', parse_workers: int = 0):
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         self.articles = []
+        self.cache = None
+        if use_cache:
+            self.cache = ResponseCache(os.path.join(output_dir, 'cache', 'http_cache.sqlite'), ttls=cache_ttls)
+        self.incremental = incremental
+        self.resume = resume
+        self.seen_index = None
+        if incremental:
+            self.seen_index = SeenIndex(os.path.join(output_dir, 'seen_urls.sqlite'))
+            self._bootstrap_seen_index()
+        scraper_options = {
+            'max_workers': max_workers,
+            'requests_per_second': requests_per_second,
+            'burst': burst,
+            'cache': self.cache,
+            'seen_index': self.seen_index,
+            'max_depth': max_depth,
+            'max_age_days': max_age_days,
+            'frontier_dir': os.path.join(output_dir, 'frontier'),
+            'resume': resume,
+            'recorder': FixtureStore(record_dir) if record_dir else None,
+            'retry_policy': RetryPolicy(max_retries=max_retries),
+            'failure_threshold': failure_threshold,
+            'discovery': discovery,
+            'parse_workers': parse_workers
+        }
         self.scrapers = [
-            BleepingComputerScraper(),
-            KrebsScraper()
+            BleepingComputerScraper(**scraper_options),
+            KrebsScraper(**scraper_options)
         ]
+        
+        if replay_dir:
+            adapter = ReplayAdapter(FixtureStore(replay_dir))
+            for scraper in self.scrapers:
+                adapter.install(scraper.session)
+            logger.info(f"Mode replay: réponses servies depuis {replay_dir}")
+    
+    def _load_existing(self, filename: str) -> List[Dict]:
+        path = os.path.join(self.output_dir, filename)
+        if not os.path.exists(path):
+            return []
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Impossible de relire le corpus existant {path}: {e}")
+            raise
+    
+    def _bootstrap_seen_index(self) -> None:
+        if len(self.seen_index) > 0:
+            return
+        
+        existing = self._load_existing(CORPUS_FILENAME)
+        if existing:
+            count = self.seen_index.record(existing)
+            logger.info(f"Index initialisé avec {count} articles du corpus existant")
     
     def collect_all(self, max_articles_per_source: int = 50) -> None:
         logger.info("Début de la collecte...")
@@ -34,21 +100,75 @@ class DataCollector:
         
         logger.info(f"Collecte terminée. Total: {len(self.articles)} articles")
         
+        if self.cache:
+            stats = self.cache.stats()
+            logger.info(
+                f"Cache HTTP: {stats['hits']} hits, {stats['revalidated']} revalidés (304), "
+                f"{stats['misses']} téléchargés, taux {stats['hit_rate']:.0%}"
+            )
+        
         if len(self.articles) == 0:
             logger.warning("ATTENTION: Aucun article collecté")
     
-    def save_to_json(self, filename: str = "articles_cybersecurity.json") -> None:
+    def collect_to_ndjson(self, max_articles_per_source: int = 50, filename: str = STREAM_FILENAME,
+                          fsync_every: int = 10, max_bytes: int = None) -> int:
+        output_path = os.path.join(self.output_dir, filename)
+        logger.info(f"Début de la collecte en flux vers {output_path}...")
+        
+        sources = {}
+        # Ajout seulement quand les articles déjà présents ne sont pas recollectés (index des URLs vues,
+        # reprise de frontière) ; sinon le fichier est remplacé pour ne pas dupliquer la collecte
+        append = self.incremental or self.resume
+        with NDJSONWriter(output_path, fsync_every=fsync_every, max_bytes=max_bytes, append=append) as writer:
+            for scraper in self.scrapers:
+                count = 0
+                try:
+                    for article in scraper.iter_articles(max_articles_per_source):
+                        writer.write(article)
+                        if self.seen_index is not None:
+                            self.seen_index.record([article])
+                        count += 1
+                except Exception as e:
+                    logger.error(f"Erreur avec {scraper.source_name}: {e}")
+                
+                sources[scraper.source_name] = count
+                logger.info(f"{scraper.source_name}: {count} articles collectés")
+            
+            total = writer.count
+        
+        logger.info(f"Collecte terminée. Total: {total} articles {'ajoutés à' if append else 'écrits dans'} {output_path}")
+        for source, count in sources.items():
+            logger.info(f"  - {source}: {count} articles")
+        
+        if total == 0:
+            logger.warning("ATTENTION: Aucun article collecté")
+        return total
+    
+    def save_to_json(self, filename: str = CORPUS_FILENAME) -> None:
         output_path = os.path.join(self.output_dir, filename)
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(self.articles, f, ensure_ascii=False, indent=2)
+            corpus = self.articles
+            if self.incremental:
+                existing = self._load_existing(filename)
+                new_urls = {article.get('url') for article in self.articles}
+                corpus = [article for article in existing if article.get('url') not in new_urls]
+                corpus.extend(self.articles)
+                logger.info(f"Fusion: {len(existing)} articles existants + {len(self.articles)} nouveaux")
+            
+            tmp_path = output_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(corpus, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, output_path)
+            
+            if self.seen_index is not None:
+                self.seen_index.record(self.articles)
             
             logger.info(f"Données sauvegardées: {output_path}")
-            logger.info(f"Nombre total d'articles: {len(self.articles)}")
+            logger.info(f"Nombre total d'articles: {len(corpus)}")
             
             sources = {}
-            for article in self.articles:
+            for article in corpus:
                 source = article.get('source', 'Unknown')
                 sources[source] = sources.get(source, 0) + 1
             
@@ -60,10 +180,61 @@ class DataCollector:
             logger.error(f"Erreur lors de la sauvegarde: {e}")
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Collecte d'articles de cybersécurité")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Ne collecter que les nouveaux articles et les fusionner au corpus existant")
+    parser.add_argument('--max-articles', type=int, default=150,
+                        help="Nombre maximal d'articles par source")
+    parser.add_argument('--max-depth', type=int, default=20,
+                        help="Nombre maximal de pages de liste suivies par source")
+    parser.add_argument('--max-age-days', type=int, default=None,
+                        help="Arrêter la pagination sur les articles plus anciens que N jours")
+    parser.add_argument('--resume', action='store_true',
+                        help="Reprendre le crawl interrompu à partir de l'état sauvegardé")
+    parser.add_argument('--discovery', choices=['listing', 'feed'], default='listing',
+                        help="Découverte des articles par pages de listing HTML ou par flux RSS/Atom")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="Processus dédiés à l'extraction des articles, 1 compris (0 : extraction dans le processus principal)")
+    parser.add_argument('--max-retries', type=int, default=3,
+                        help="Nouvelles tentatives sur erreur réseau, 429 ou 5xx (backoff exponentiel)")
+    parser.add_argument('--breaker-threshold', type=int, default=5,
+                        help="Échecs consécutifs avant d'interrompre une source (circuit breaker)")
+    parser.add_argument('--record', metavar='DIR', default=None,
+                        help="Enregistrer les réponses brutes dans un répertoire de fixtures")
+    parser.add_argument('--replay', metavar='DIR', default=None,
+                        help="Rejouer les réponses enregistrées au lieu d'accéder au réseau")
+    parser.add_argument('--stream', action='store_true',
+                        help=f"Écrire chaque article dès son extraction dans {STREAM_FILENAME}")
+    parser.add_argument('--rotate-mb', type=int, default=None,
+                        help="Taille (Mo) déclenchant la rotation du fichier NDJSON")
+    return parser.parse_args()
+
+
 def main():
-    collector = DataCollector(output_dir="../data")
-    collector.collect_all(max_articles_per_source=150)
-    collector.save_to_json("articles_cybersecurity.json")
+    args = parse_args()
+    collector = DataCollector(
+        output_dir="../data",
+        incremental=args.incremental,
+        max_depth=args.max_depth,
+        max_age_days=args.max_age_days,
+        resume=args.resume,
+        record_dir=args.record,
+        replay_dir=args.replay,
+        use_cache=not args.replay,
+        max_retries=args.max_retries,
+        failure_threshold=args.breaker_threshold,
+        discovery=args.discovery,
+        parse_workers=args.parse_workers
+    )
+    
+    if args.stream:
+        max_bytes = args.rotate_mb * 1024 * 1024 if args.rotate_mb else None
+        collector.collect_to_ndjson(max_articles_per_source=args.max_articles, max_bytes=max_bytes)
+        return
+    
+    collector.collect_all(max_articles_per_source=args.max_articles)
+    collector.save_to_json(CORPUS_FILENAME)
 
 
 if __name__ == "__main__":
@@ -1,16 +1,55 @@
 import requests
 from bs4 import BeautifulSoup
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable, Iterator, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import os
+import re
 import time
 from datetime import datetime
+from .throttle import HostRateLimiter
+from .cache import ResponseCache
+from .seen_index import SeenIndex
+from .frontier import CrawlFrontier
+from .replay import FixtureStore
+from .fetch_policy import RetryPolicy, CircuitBreaker, configure_session_pool, parse_retry_after
+from .feed import iter_feed_entries, html_to_text
+from .parse_pool import ParsePool
 
 logger = logging.getLogger(__name__)
 
 
 class BaseScraper:
-    def __init__(self):
+    def __init__(self, max_workers: int = 4, requests_per_second: float = 1.0, burst: int = 1,
+                 cache: Optional[ResponseCache] = None, seen_index: Optional[SeenIndex] = None,
+                 fast_extraction: bool = True, max_depth: int = 20, max_age_days: Optional[int] = None,
+                 frontier_dir: Optional[str] = None, resume: bool = False,
+                 recorder: Optional[FixtureStore] = None, retry_policy: Optional[RetryPolicy] = None,
+                 failure_threshold: int = 5, breaker_reset: float = 60.0, timeout: float = 10,
+                 discovery: str = 'listing', min_feed_content: int = 500, parse_workers: int = 0):
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = HostRateLimiter(requests_per_second, burst)
+        self.cache = cache
+        self.seen_index = seen_index
+        self.fast_extraction = fast_extraction
+        self.max_depth = max_depth
+        self.max_age_days = max_age_days
+        self.frontier_dir = frontier_dir
+        self.resume = resume
+        self.recorder = recorder
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.breaker_reset = breaker_reset
+        self.timeout = timeout
+        self.discovery = discovery
+        self.min_feed_content = min_feed_content
+        self.parse_workers = parse_workers
+        self._breaker = None
+        # URLs refusées par le circuit (ouvert, ou semi-ouvert pendant la requête de test) : à remettre en file
+        self.rejected_urls = set()
         self.session = requests.Session()
+        configure_session_pool(self.session, self.max_workers)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -24,17 +63,360 @@ class BaseScraper:
             'Cache-Control': 'max-age=0'
         })
     
-    def get_page(self, url: str) -> Optional[BeautifulSoup]:
-        try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'lxml')
-        except requests.RequestException as e:
-            logger.error(f"Erreur lors de la récupération de {url}: {e}")
+    def fetch(self, url: str, kind: str = 'article') -> Optional[bytes]:
+        cached = None
+        headers = {}
+        if self.cache:
+            cached, fresh = self.cache.lookup(url, kind)
+            if fresh:
+                self._record(url, cached['body'])
+                return cached['body']
+            if cached:
+                headers = self.cache.conditional_headers(cached)
+        
+        if not self.breaker.allow():
+            logger.debug(f"Circuit ouvert, requête ignorée: {url}")
+            self.rejected_urls.add(url)
             return None
+        
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(url)
+            status, retry_after = None, None
+            try:
+                response = self.session.get(url, timeout=self.timeout, headers=headers)
+                status = response.status_code
+                if cached and status == 304:
+                    self.breaker.record_success()
+                    self.cache.mark_revalidated(url)
+                    self._record(url, cached['body'])
+                    return cached['body']
+                if not self.retry_policy.should_retry(status):
+                    self.breaker.record_success()
+                response.raise_for_status()
+                break
+            except requests.RequestException as e:
+                if not self.retry_policy.should_retry(status):
+                    logger.error(f"Erreur lors de la récupération de {url}: {e}")
+                    return None
+                if status is not None:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                error = e
+            
+            delay = self.retry_policy.delay(attempt, retry_after)
+            if delay is None:
+                self.breaker.record_failure()
+                logger.error(f"Erreur lors de la récupération de {url} après {attempt + 1} tentative(s): {error}")
+                return None
+            
+            attempt += 1
+            logger.warning(f"Nouvelle tentative {attempt}/{self.retry_policy.max_retries} dans {delay:.1f}s: {url}")
+            time.sleep(delay)
+            if self.breaker.is_open:
+                self.rejected_urls.add(url)
+                return None
+        
+        if self.cache:
+            self.cache.store(
+                url,
+                response.content,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified')
+            )
+        self._record(url, response.content, response.status_code, response.headers)
+        return response.content
     
-    def scrape(self, max_articles: int = 50) -> List[Dict]:
+    @property
+    def breaker(self) -> CircuitBreaker:
+        if self._breaker is None:
+            self._breaker = CircuitBreaker(self.source_name, self.failure_threshold, self.breaker_reset)
+        return self._breaker
+    
+    def circuit_rejected(self, url: str) -> bool:
+        # Échec dû au circuit et non à la page : l'URL doit être retentée (plus tard ou à la reprise)
+        if url in self.rejected_urls:
+            self.rejected_urls.discard(url)
+            return True
+        return self.breaker.is_open
+    
+    def _record(self, url: str, content: bytes, status: int = 200, headers: Optional[Dict] = None) -> None:
+        if self.recorder is not None:
+            self.recorder.record(url, content, status, dict(headers or {}))
+    
+    def get_page(self, url: str, kind: str = 'article') -> Optional[BeautifulSoup]:
+        content = self.fetch(url, kind)
+        if content is None:
+            return None
+        return BeautifulSoup(content, 'lxml')
+    
+    def filter_new_urls(self, urls: List[str]) -> List[str]:
+        if self.seen_index is None:
+            return urls
+        
+        new_urls = self.seen_index.filter_unseen(urls)
+        skipped = len(urls) - len(new_urls)
+        if skipped:
+            logger.info(f"{skipped} articles déjà collectés ignorés")
+        return new_urls
+    
+    def fetch_pages(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[bytes]]]:
+        url_iter = iter(urls)
+        
+        if self.max_workers == 1:
+            for url in url_iter:
+                yield url, self.fetch(url)
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            try:
+                for url in url_iter:
+                    pending.append((url, executor.submit(self.fetch, url)))
+                    if len(pending) >= self.max_workers:
+                        break
+                
+                while pending:
+                    url, future = pending.popleft()
+                    page = future.result()
+                    
+                    next_url = next(url_iter, None)
+                    if next_url is not None:
+                        pending.append((next_url, executor.submit(self.fetch, next_url)))
+                    
+                    yield url, page
+            finally:
+                for _, future in pending:
+                    future.cancel()
+    
+    def start_urls(self) -> List[str]:
+        raise NotImplementedError("Méthode à implémenter par les sous-classes")
+    
+    def extract_article_links(self, soup: BeautifulSoup) -> List[str]:
         raise NotImplementedError("Méthode à implémenter par les sous-classes")
     
+    def next_page_url(self, soup: BeautifulSoup, page_url: str, page_number: int) -> Optional[str]:
+        return None
+    
+    def feed_urls(self) -> List[str]:
+        return []
+    
+    def next_feed_url(self, feed_url: str, page_number: int) -> Optional[str]:
+        return None
+    
+    def accept_feed_url(self, url: str) -> bool:
+        return True
+    
+    def feed_content_excluded_tags(self) -> Tuple[str, ...]:
+        return ('script', 'style')
+    
+    def frontier_path(self) -> Optional[str]:
+        if not self.frontier_dir:
+            return None
+        slug = re.sub(r'[^a-z0-9]+', '_', self.source_name.lower()).strip('_')
+        return os.path.join(self.frontier_dir, f"{slug}.json")
+    
+    def open_frontier(self) -> CrawlFrontier:
+        path = self.frontier_path()
+        if self.resume and path and os.path.exists(path):
+            try:
+                frontier = CrawlFrontier.load(path)
+                if len(frontier) > 0:
+                    logger.info(f"Reprise du crawl {self.source_name}: {len(frontier)} URLs en attente")
+                    return frontier
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"État de crawl illisible ({path}), nouveau départ: {e}")
+        
+        frontier = CrawlFrontier(max_depth=self.max_depth, max_age_days=self.max_age_days)
+        feeds = self.feed_urls() if self.discovery == 'feed' else []
+        if self.discovery == 'feed' and not feeds:
+            logger.warning(f"Pas de flux connu pour {self.source_name}, découverte par pages de listing")
+        if feeds:
+            for url in feeds:
+                frontier.push(url, kind='feed', depth=1)
+        else:
+            for url in self.start_urls():
+                frontier.push(url, kind='listing', depth=1)
+        return frontier
+    
+    def _expand_listing(self, frontier: CrawlFrontier, entry: Dict) -> None:
+        soup = self.get_page(entry['url'], kind='listing')
+        if not soup:
+            if self.circuit_rejected(entry['url']):
+                frontier.requeue(entry['url'], kind='listing', depth=entry['depth'])
+                return
+            logger.warning(f"Impossible d'accéder à {entry['url']} ({self.source_name})")
+            return
+        
+        links = self.extract_article_links(soup)
+        new_links = self.filter_new_urls(links)
+        for link in new_links:
+            frontier.push(link, kind='article', depth=entry['depth'])
+        
+        if not links:
+            return
+        if self.seen_index is not None and not new_links:
+            # Mode incrémental : page entièrement déjà collectée, les suivantes sont plus anciennes
+            logger.info(f"Pagination arrêtée à {entry['url']}: aucun nouvel article")
+            return
+        
+        next_url = self.next_page_url(soup, entry['url'], entry['depth'] + 1)
+        if next_url:
+            frontier.push(next_url, kind='listing', depth=entry['depth'] + 1)
+    
+    def article_from_feed(self, entry: Dict) -> Optional[Dict]:
+        text = html_to_text(entry['html'] or '', self.feed_content_excluded_tags())
+        if len(text) < self.min_feed_content:
+            # Contenu absent ou tronqué ("Lire la suite") : la page de l'article sera téléchargée
+            return None
+        return {
+            'source': self.source_name,
+            'url': entry['url'],
+            'titre': entry['titre'] or "Titre non trouvé",
+            'date': entry['date'],
+            'auteur': entry['auteur'] or "Auteur inconnu",
+            'contenu': text,
+            'date_extraction': datetime.now().isoformat()
+        }
+    
+    def _expand_feed(self, frontier: CrawlFrontier, entry: Dict) -> List[Dict]:
+        content = self.fetch(entry['url'], kind='listing')
+        if content is None:
+            if self.circuit_rejected(entry['url']):
+                frontier.requeue(entry['url'], kind='feed', depth=entry['depth'])
+                return []
+            logger.warning(f"Flux inaccessible {entry['url']} ({self.source_name})")
+            if entry['depth'] == 1:
+                for url in self.start_urls():
+                    frontier.push(url, kind='listing', depth=1)
+            return []
+        
+        feed_entries = [item for item in iter_feed_entries(content) if self.accept_feed_url(item['url'])]
+        new_urls = set(self.filter_new_urls([item['url'] for item in feed_entries]))
+        ready = []
+        for item in feed_entries:
+            if item['url'] not in new_urls:
+                continue
+            article = self.article_from_feed(item)
+            if article is None:
+                frontier.push(item['url'], kind='article', depth=entry['depth'])
+            elif frontier.seen.add(item['url']):
+                ready.append(article)
+        logger.info(f"Flux {entry['url']}: {len(feed_entries)} entrées, {len(ready)} articles complets")
+        
+        if not feed_entries:
+            return ready
+        if self.seen_index is not None and not new_urls:
+            logger.info(f"Pagination du flux arrêtée à {entry['url']}: aucun nouvel article")
+            return ready
+        
+        next_url = self.next_feed_url(entry['url'], entry['depth'] + 1)
+        if next_url:
+            frontier.push(next_url, kind='feed', depth=entry['depth'] + 1)
+        return ready
+    
+    def parse_options(self) -> Dict:
+        return {'fast_extraction': self.fast_extraction, 'requests_per_second': 0}
+    
+    def _parse_pages(self, pages: Iterable[Tuple[str, Optional[bytes]]],
+                     parse_pool: Optional[ParsePool]) -> Iterator[Tuple[str, Optional[bytes], object]]:
+        if parse_pool is None:
+            for url, content in pages:
+                yield url, content, None
+            return
+        yield from parse_pool.imap(pages)
+    
+    def iter_articles(self, max_articles: int = 50) -> Iterator[Dict]:
+        frontier = self.open_frontier()
+        produced = 0
+        parse_pool = None
+        if self.parse_workers >= 1:
+            parse_pool = ParsePool(type(self), self.parse_options(), self.parse_workers)
+        batch_size = max(self.max_workers, self.parse_workers) * 2
+        
+        try:
+            while produced < max_articles:
+                if self.breaker.is_open:
+                    logger.warning(f"Collecte {self.source_name} interrompue (circuit ouvert), "
+                                   f"{len(frontier)} URLs conservées")
+                    break
+                
+                entry = frontier.pop()
+                if entry is None:
+                    break
+                
+                if entry['kind'] == 'listing':
+                    self._expand_listing(frontier, entry)
+                    continue
+                
+                if entry['kind'] == 'feed':
+                    ready = self._expand_feed(frontier, entry)
+                    while ready and produced < max_articles:
+                        article = ready.pop(0)
+                        if frontier.is_too_old(article['date']):
+                            frontier.stop_pagination()
+                            continue
+                        yield article
+                        produced += 1
+                    for article in ready:
+                        # Limite atteinte : ces URLs seront téléchargées lors d'une reprise
+                        frontier.requeue(article['url'], kind='article', depth=entry['depth'])
+                    continue
+                
+                batch = [entry] + frontier.pop_articles(batch_size - 1)
+                depths = {item['url']: item['depth'] for item in batch}
+                remaining = [item['url'] for item in batch]
+                
+                try:
+                    pages = self.fetch_pages(list(remaining))
+                    for article_url, content, parsed in self._parse_pages(pages, parse_pool):
+                        remaining.remove(article_url)
+                        try:
+                            logger.info(f"Extraction de: {article_url}")
+                            if not content:
+                                if self.circuit_rejected(article_url):
+                                    frontier.requeue(article_url, kind='article', depth=depths[article_url])
+                                continue
+                            
+                            if parsed is not None:
+                                article = parsed.result()
+                            else:
+                                article = self.parse_article(content, article_url)
+                            if not article or not article.get('contenu'):
+                                continue
+                            
+                            if frontier.is_too_old(article.get('date', '')):
+                                frontier.stop_pagination()
+                                continue
+                            
+                            yield article
+                            produced += 1
+                            if produced >= max_articles:
+                                break
+                        
+                        except Exception as e:
+                            logger.error(f"Erreur lors de l'extraction: {e}")
+                            continue
+                finally:
+                    for url in remaining:
+                        frontier.requeue(url, kind='article', depth=depths[url])
+        finally:
+            if parse_pool is not None:
+                parse_pool.close()
+            path = self.frontier_path()
+            if path:
+                frontier.save(path)
+    
+    def scrape(self, max_articles: int = 50) -> List[Dict]:
+        logger.info(f"Scraping {self.source_name}...")
+        return list(self.iter_articles(max_articles))
+    
     def extract_article(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
         raise NotImplementedError("Méthode à implémenter par les sous-classes")
+    
+    def extract_article_fast(self, content: bytes, url: str) -> Optional[Dict]:
+        return self.extract_article(BeautifulSoup(content, 'lxml'), url)
+    
+    def parse_article(self, content: bytes, url: str) -> Optional[Dict]:
+        if self.fast_extraction:
+            return self.extract_article_fast(content, url)
+        return self.extract_article(BeautifulSoup(content, 'lxml'), url)
@@ -1,76 +1,74 @@
 from .base import BaseScraper
+from .fast_parser import parse_document, compile_finder, find_first, element_text
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from urllib.parse import urljoin
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
+FIND_TITLE = compile_finder('h1', 'class', 'article_title')
+FIND_DATE = compile_finder('time')
+FIND_AUTHOR = compile_finder('a', 'rel', 'author')
+FIND_CONTENT = compile_finder('div', 'class', 'articleBody')
+CONTENT_EXCLUDED_TAGS = ('script', 'style', 'aside')
+
 
 class BleepingComputerScraper(BaseScraper):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.base_url = "https://www.bleepingcomputer.com"
         self.source_name = "BleepingComputer"
     
-    def scrape(self, max_articles: int = 50) -> List[Dict]:
-        logger.info(f"Scraping {self.source_name}...")
-        articles = []
-        
-        category_url = f"{self.base_url}/news/security/"
-        soup = self.get_page(category_url)
-        
-        if not soup:
-            return articles
-        
+    def start_urls(self) -> List[str]:
+        return [f"{self.base_url}/news/security/"]
+    
+    def extract_article_links(self, soup: BeautifulSoup) -> List[str]:
         article_items = soup.find_all('h4')
         if not article_items:
             article_section = soup.find('div', id='bc_latest_news')
             if article_section:
                 article_items = article_section.find_all('a', href=True)
         
-        count = 0
+        article_urls = []
         for item in article_items:
-            if count >= max_articles:
-                break
+            if item.name == 'a':
+                link = item
+            else:
+                link = item.find('a')
+            
+            if not link:
+                continue
+            
+            article_url = link.get('href')
+            if not article_url or 'javascript' in article_url:
+                continue
             
-            try:
-                if item.name == 'a':
-                    link = item
-                else:
-                    link = item.find('a')
-                
-                if not link:
-                    continue
-                
-                article_url = link.get('href')
-                if not article_url or 'javascript' in article_url:
-                    continue
-                
-                if not article_url.startswith('http'):
-                    article_url = urljoin(self.base_url, article_url)
-                
-                if '/news/' not in article_url:
-                    continue
-                
-                logger.info(f"Extraction de: {article_url}")
-                article_soup = self.get_page(article_url)
-                
-                if article_soup:
-                    article = self.extract_article(article_soup, article_url)
-                    if article and article.get('contenu'):
-                        articles.append(article)
-                        count += 1
-                
-                time.sleep(1)
+            if not article_url.startswith('http'):
+                article_url = urljoin(self.base_url, article_url)
             
-            except Exception as e:
-                logger.error(f"Erreur lors de l'extraction: {e}")
+            if '/news/' not in article_url or '/page/' in article_url:
                 continue
+            
+            article_urls.append(article_url)
         
-        return articles
+        return article_urls
+    
+    def next_page_url(self, soup: BeautifulSoup, page_url: str, page_number: int) -> Optional[str]:
+        next_link = soup.find('a', attrs={'aria-label': 'Next Page'}) or soup.find('a', rel='next')
+        if next_link and next_link.get('href'):
+            return urljoin(page_url, next_link['href'])
+        return f"{self.base_url}/news/security/page/{page_number}/"
+    
+    def feed_urls(self) -> List[str]:
+        return [f"{self.base_url}/feed/"]
+    
+    def accept_feed_url(self, url: str) -> bool:
+        return '/news/' in url
+    
+    def feed_content_excluded_tags(self) -> Tuple[str, ...]:
+        return CONTENT_EXCLUDED_TAGS
     
     def extract_article(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
         try:
@@ -104,3 +102,36 @@ class BleepingComputerScraper(BaseScraper):
         except Exception as e:
             logger.error(f"Erreur extraction données: {e}")
             return None
+    
+    def extract_article_fast(self, content: bytes, url: str) -> Optional[Dict]:
+        try:
+            root = parse_document(content)
+            
+            title_elem = find_first(root, FIND_TITLE)
+            title = element_text(title_elem, strip=True) if title_elem is not None else "Titre non trouvé"
+            
+            date_elem = find_first(root, FIND_DATE)
+            date = date_elem.get('datetime', '') if date_elem is not None else ""
+            
+            author_elem = find_first(root, FIND_AUTHOR)
+            author = element_text(author_elem, strip=True) if author_elem is not None else "Auteur inconnu"
+            
+            content_elem = find_first(root, FIND_CONTENT)
+            if content_elem is not None:
+                text = element_text(content_elem, separator='\n', strip=True, excluded=CONTENT_EXCLUDED_TAGS)
+            else:
+                text = ""
+            
+            return {
+                'source': self.source_name,
+                'url': url,
+                'titre': title,
+                'date': date,
+                'auteur': author,
+                'contenu': text,
+                'date_extraction': datetime.now().isoformat()
+            }
+        
+        except Exception as e:
+            logger.error(f"Erreur extraction données: {e}")
+            return None
@@ -0,0 +1,124 @@
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Optional, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTLS = {
+    'listing': 60 * 60,
+    'article': 30 * 24 * 60 * 60
+}
+
+
+class ResponseCache:
+    def __init__(self, path: str, ttls: Optional[Dict[str, int]] = None,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.counters = {'hits': 0, 'revalidated': 0, 'misses': 0, 'evictions': 0}
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)')
+        self.conn.commit()
+    
+    def ttl_for(self, kind: str) -> int:
+        return self.ttls.get(kind, self.ttls['article'])
+    
+    def lookup(self, url: str, kind: str = 'article') -> Tuple[Optional[Dict], bool]:
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            
+            if row is None:
+                return None, False
+            
+            now = time.time()
+            self.conn.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (now, url))
+            self.conn.commit()
+            
+            entry = {'body': row[0], 'etag': row[1], 'last_modified': row[2], 'fetched_at': row[3]}
+            fresh = now - entry['fetched_at'] < self.ttl_for(kind)
+            if fresh:
+                self.counters['hits'] += 1
+            return entry, fresh
+    
+    def conditional_headers(self, entry: Dict) -> Dict[str, str]:
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def mark_revalidated(self, url: str) -> None:
+        with self.lock:
+            self.conn.execute('UPDATE responses SET fetched_at = ? WHERE url = ?', (time.time(), url))
+            self.conn.commit()
+            self.counters['revalidated'] += 1
+    
+    def store(self, url: str, body: bytes, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        now = time.time()
+        with self.lock:
+            self.counters['misses'] += 1
+            if len(body) > self.max_bytes:
+                return
+            self.conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, sqlite3.Binary(body), etag, last_modified, now, now, len(body))
+            )
+            self._evict()
+            self.conn.commit()
+    
+    def _evict(self) -> None:
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        rows = self.conn.execute('SELECT url, size FROM responses ORDER BY accessed_at ASC').fetchall()
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            total -= size
+            self.counters['evictions'] += 1
+    
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            stats = dict(self.counters)
+            entries, size = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+        
+        requests_seen = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['entries'] = entries
+        stats['size_bytes'] = size
+        stats['hit_rate'] = (stats['hits'] + stats['revalidated']) / requests_seen if requests_seen else 0.0
+        return stats
+    
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,50 @@
+from typing import Iterable, Iterator, Optional
+from lxml import etree
+from lxml import html as lxml_html
+
+# Chaînes ignorées par BeautifulSoup.get_text() (Script, Stylesheet, TemplateString)
+NON_TEXT_TAGS = frozenset(['script', 'style', 'template'])
+
+
+def parse_document(content: bytes):
+    try:
+        content.decode('utf-8')
+        parser = lxml_html.HTMLParser(encoding='utf-8')
+    except UnicodeDecodeError:
+        parser = lxml_html.HTMLParser()
+    return lxml_html.document_fromstring(content, parser=parser)
+
+
+def token_predicate(attribute: str, token: str) -> str:
+    return f"contains(concat(' ', normalize-space(@{attribute}), ' '), ' {token} ')"
+
+
+def compile_finder(tag: str, attribute: Optional[str] = None, token: Optional[str] = None) -> etree.XPath:
+    if attribute:
+        return etree.XPath(f"(//{tag}[{token_predicate(attribute, token)}])[1]")
+    return etree.XPath(f"(//{tag})[1]")
+
+
+def find_first(root, finder: etree.XPath):
+    result = finder(root)
+    return result[0] if result else None
+
+
+def _iter_strings(element, excluded: frozenset) -> Iterator[str]:
+    tag = element.tag
+    if isinstance(tag, str) and tag not in excluded and tag not in NON_TEXT_TAGS:
+        if element.text:
+            yield element.text
+        for child in element:
+            yield from _iter_strings(child, excluded)
+            if child.tail:
+                yield child.tail
+
+
+def element_text(element, separator: str = '', strip: bool = False,
+                 excluded: Iterable[str] = ()) -> str:
+    strings = _iter_strings(element, frozenset(excluded))
+    if strip:
+        strings = (s.strip() for s in strings)
+        return separator.join(s for s in strings if s)
+    return separator.join(strings)
@@ -0,0 +1,88 @@
+import io
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+from .fast_parser import parse_document, element_text
+
+logger = logging.getLogger(__name__)
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+CONTENT_ENCODED = '{http://purl.org/rss/1.0/modules/content/}encoded'
+DC_CREATOR = '{http://purl.org/dc/elements/1.1/}creator'
+ENTRY_TAGS = ('item', ATOM + 'entry')
+
+
+def feed_date(value: Optional[str]) -> str:
+    if not value:
+        return ""
+    value = value.strip()
+    try:
+        return parsedate_to_datetime(value).isoformat()
+    except (TypeError, ValueError):
+        pass
+    try:
+        # Atom : RFC 3339, "Z" non accepté par fromisoformat avant Python 3.11
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).isoformat()
+    except ValueError:
+        return value
+
+
+def html_to_text(html: str, excluded: Tuple[str, ...] = ()) -> str:
+    if not html or not html.strip():
+        return ""
+    root = parse_document(html.encode('utf-8'))
+    return element_text(root, separator='\n', strip=True, excluded=excluded)
+
+
+def _text(element: ET.Element, tag: str) -> Optional[str]:
+    child = element.find(tag)
+    if child is None or child.text is None:
+        return None
+    return child.text.strip()
+
+
+def _rss_entry(item: ET.Element) -> Dict:
+    return {
+        'url': _text(item, 'link') or _text(item, 'guid'),
+        'titre': _text(item, 'title'),
+        'date': feed_date(_text(item, 'pubDate')),
+        'auteur': _text(item, DC_CREATOR) or _text(item, 'author'),
+        'html': _text(item, CONTENT_ENCODED),
+        'resume': _text(item, 'description')
+    }
+
+
+def _atom_entry(entry: ET.Element) -> Dict:
+    url = None
+    for link in entry.findall(ATOM + 'link'):
+        if link.get('rel', 'alternate') == 'alternate':
+            url = link.get('href')
+            break
+    
+    author = entry.find(ATOM + 'author')
+    content = entry.find(ATOM + 'content')
+    return {
+        'url': url,
+        'titre': _text(entry, ATOM + 'title'),
+        'date': feed_date(_text(entry, ATOM + 'published') or _text(entry, ATOM + 'updated')),
+        'auteur': _text(author, ATOM + 'name') if author is not None else None,
+        'html': content.text if content is not None and content.get('type', 'text') != 'text' else None,
+        'resume': _text(entry, ATOM + 'summary')
+    }
+
+
+def iter_feed_entries(content: bytes) -> Iterator[Dict]:
+    # iterparse : chaque entrée est libérée dès qu'elle est traitée
+    try:
+        for _, element in ET.iterparse(io.BytesIO(content), events=('end',)):
+            if element.tag not in ENTRY_TAGS:
+                continue
+            entry = _rss_entry(element) if element.tag == 'item' else _atom_entry(element)
+            element.clear()
+            if entry['url']:
+                yield entry
+    except ET.ParseError as e:
+        logger.error(f"Flux XML invalide: {e}")
@@ -0,0 +1,105 @@
+import random
+import threading
+import time
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    def __init__(self, max_retries: int = 3, backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 retry_statuses: Tuple[int, ...] = RETRY_STATUSES):
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+    
+    def should_retry(self, status: Optional[int]) -> bool:
+        # status None : erreur de connexion ou timeout
+        return status is None or status in self.retry_statuses
+    
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        if attempt >= self.max_retries:
+            return None
+        if retry_after is not None:
+            # Attente imposée par le serveur trop longue : on abandonne plutôt que de bloquer la collecte
+            return retry_after if retry_after <= self.backoff_max else None
+        # Backoff exponentiel avec "full jitter"
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+    
+    @property
+    def is_open(self) -> bool:
+        with self.lock:
+            return self.state == self.OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+    
+    def allow(self) -> bool:
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Une seule requête de test passe, les autres attendent son résultat
+                self.state = self.HALF_OPEN
+                return True
+            return False
+    
+    def record_success(self) -> None:
+        with self.lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit refermé pour {self.name}")
+            self.state = self.CLOSED
+            self.failures = 0
+    
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit ouvert pour {self.name} après {self.failures} échecs, "
+                                   f"pause de {self.reset_timeout:.0f}s")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+def configure_session_pool(session: requests.Session, pool_size: int) -> None:
+    # Un pool par hôte dimensionné sur le nombre de workers (10 par défaut dans requests)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
@@ -0,0 +1,167 @@
+import base64
+import hashlib
+import heapq
+import json
+import math
+import os
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Optional, List, Dict
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_ARTICLE = 0
+PRIORITY_LISTING = 1
+
+
+class BloomFilter:
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+    
+    def add(self, item: str) -> bool:
+        added = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+    
+    def to_dict(self) -> Dict:
+        return {
+            'capacity': self.capacity,
+            'error_rate': self.error_rate,
+            'count': self.count,
+            'bits': base64.b64encode(bytes(self.bits)).decode('ascii')
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'BloomFilter':
+        bloom = cls(data['capacity'], data['error_rate'])
+        bloom.bits = bytearray(base64.b64decode(data['bits']))
+        bloom.count = data['count']
+        return bloom
+
+
+def parse_article_date(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        date = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date
+
+
+class CrawlFrontier:
+    def __init__(self, max_depth: int = 20, max_pending: int = 10000,
+                 max_age_days: Optional[int] = None, bloom_capacity: int = 100000):
+        self.max_depth = max_depth
+        self.max_pending = max_pending
+        self.max_age_days = max_age_days
+        self.cutoff = None
+        if max_age_days is not None:
+            self.cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+        self.seen = BloomFilter(bloom_capacity)
+        self.heap = []
+        self.sequence = 0
+        self.pagination_stopped = False
+    
+    def __len__(self) -> int:
+        return len(self.heap)
+    
+    def _push(self, url: str, kind: str, depth: int) -> None:
+        priority = PRIORITY_ARTICLE if kind == 'article' else PRIORITY_LISTING
+        heapq.heappush(self.heap, (priority, depth, self.sequence, url, kind))
+        self.sequence += 1
+    
+    def push(self, url: str, kind: str = 'article', depth: int = 0) -> bool:
+        if kind != 'article' and (self.pagination_stopped or depth > self.max_depth):
+            return False
+        if len(self.heap) >= self.max_pending:
+            logger.debug(f"Frontière pleine, URL ignorée: {url}")
+            return False
+        if not self.seen.add(url):
+            return False
+        self._push(url, kind, depth)
+        return True
+    
+    def requeue(self, url: str, kind: str = 'article', depth: int = 0) -> None:
+        self._push(url, kind, depth)
+    
+    def pop(self) -> Optional[Dict]:
+        while self.heap:
+            _, depth, _, url, kind = heapq.heappop(self.heap)
+            if kind != 'article' and self.pagination_stopped:
+                continue
+            return {'url': url, 'kind': kind, 'depth': depth}
+        return None
+    
+    def pop_articles(self, limit: int) -> List[Dict]:
+        entries = []
+        while self.heap and len(entries) < limit and self.heap[0][0] == PRIORITY_ARTICLE:
+            _, depth, _, url, kind = heapq.heappop(self.heap)
+            entries.append({'url': url, 'kind': kind, 'depth': depth})
+        return entries
+    
+    def is_too_old(self, date: str) -> bool:
+        if self.cutoff is None:
+            return False
+        parsed = parse_article_date(date)
+        return parsed is not None and parsed < self.cutoff
+    
+    def stop_pagination(self) -> None:
+        if not self.pagination_stopped:
+            logger.info("Date limite atteinte, arrêt de la pagination")
+        self.pagination_stopped = True
+    
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        state = {
+            'max_depth': self.max_depth,
+            'max_pending': self.max_pending,
+            'max_age_days': self.max_age_days,
+            'sequence': self.sequence,
+            'pagination_stopped': self.pagination_stopped,
+            'heap': self.heap,
+            'seen': self.seen.to_dict()
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> 'CrawlFrontier':
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        
+        frontier = cls(state['max_depth'], state['max_pending'], state['max_age_days'])
+        frontier.sequence = state['sequence']
+        frontier.pagination_stopped = state['pagination_stopped']
+        frontier.heap = [tuple(entry) for entry in state['heap']]
+        heapq.heapify(frontier.heap)
+        frontier.seen = BloomFilter.from_dict(state['seen'])
+        return frontier
@@ -1,56 +1,61 @@
 from .base import BaseScraper
+from .fast_parser import parse_document, compile_finder, find_first, element_text
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from urllib.parse import urljoin
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
+FIND_TITLE = compile_finder('h1', 'class', 'entry-title')
+FIND_ANY_TITLE = compile_finder('h1')
+FIND_DATE = compile_finder('time', 'class', 'entry-date')
+FIND_AUTHOR = compile_finder('span', 'class', 'author')
+FIND_AUTHOR_LINK = compile_finder('a', 'rel', 'author')
+FIND_CONTENT = compile_finder('div', 'class', 'entry-content')
+FIND_ARTICLE = compile_finder('article')
+CONTENT_EXCLUDED_TAGS = ('script', 'style', 'aside', 'nav', 'iframe')
+
 
 class KrebsScraper(BaseScraper):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.base_url = "https://krebsonsecurity.com"
         self.source_name = "Krebs on Security"
     
-    def scrape(self, max_articles: int = 50) -> List[Dict]:
-        logger.info(f"Scraping {self.source_name}...")
-        articles = []
-        
-        soup = self.get_page(self.base_url)
-        if not soup:
-            logger.warning(f"Impossible d'accéder à {self.source_name}")
-            return articles
-        
-        article_links = soup.find_all('h2', class_='entry-title')[:max_articles]
-        
-        for h2 in article_links:
-            try:
-                link = h2.find('a')
-                if not link:
-                    continue
-                
-                article_url = link.get('href')
-                if not article_url.startswith('http'):
-                    article_url = urljoin(self.base_url, article_url)
-                
-                logger.info(f"Extraction de: {article_url}")
-                article_soup = self.get_page(article_url)
-                
-                if article_soup:
-                    article = self.extract_article(article_soup, article_url)
-                    if article and article.get('contenu'):
-                        articles.append(article)
-                
-                time.sleep(1)
-            
-            except Exception as e:
-                logger.error(f"Erreur lors de l'extraction: {e}")
+    def start_urls(self) -> List[str]:
+        return [self.base_url]
+    
+    def extract_article_links(self, soup: BeautifulSoup) -> List[str]:
+        article_urls = []
+        for h2 in soup.find_all('h2', class_='entry-title'):
+            link = h2.find('a')
+            if not link or not link.get('href'):
                 continue
+            
+            article_url = link.get('href')
+            if not article_url.startswith('http'):
+                article_url = urljoin(self.base_url, article_url)
+            article_urls.append(article_url)
         
-        return articles
+        return article_urls
+    
+    def next_page_url(self, soup: BeautifulSoup, page_url: str, page_number: int) -> Optional[str]:
+        next_link = soup.find('a', class_='next') or soup.select_one('div.nav-previous a')
+        if next_link and next_link.get('href'):
+            return urljoin(page_url, next_link['href'])
+        return f"{self.base_url}/page/{page_number}/"
+    
+    def feed_urls(self) -> List[str]:
+        return [f"{self.base_url}/feed/"]
+    
+    def next_feed_url(self, feed_url: str, page_number: int) -> Optional[str]:
+        # Flux WordPress paginé
+        return f"{self.base_url}/feed/?paged={page_number}"
+    
+    def feed_content_excluded_tags(self) -> Tuple[str, ...]:
+        return CONTENT_EXCLUDED_TAGS
     
     def extract_article(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
         try:
@@ -91,3 +96,43 @@ class KrebsScraper(BaseScraper):
         except Exception as e:
             logger.error(f"Erreur extraction données: {e}")
             return None
+    
+    def extract_article_fast(self, content: bytes, url: str) -> Optional[Dict]:
+        try:
+            root = parse_document(content)
+            
+            title_elem = find_first(root, FIND_TITLE)
+            if title_elem is None:
+                title_elem = find_first(root, FIND_ANY_TITLE)
+            title = element_text(title_elem, strip=True) if title_elem is not None else "Titre non trouvé"
+            
+            date_elem = find_first(root, FIND_DATE)
+            date = date_elem.get('datetime', '') if date_elem is not None else ""
+            
+            author_elem = find_first(root, FIND_AUTHOR)
+            if author_elem is None:
+                author_elem = find_first(root, FIND_AUTHOR_LINK)
+            author = element_text(author_elem, strip=True) if author_elem is not None else "Brian Krebs"
+            
+            content_elem = find_first(root, FIND_CONTENT)
+            if content_elem is None:
+                content_elem = find_first(root, FIND_ARTICLE)
+            
+            if content_elem is not None:
+                text = element_text(content_elem, separator='\n', strip=True, excluded=CONTENT_EXCLUDED_TAGS)
+            else:
+                text = ""
+            
+            return {
+                'source': self.source_name,
+                'url': url,
+                'titre': title,
+                'date': date,
+                'auteur': author,
+                'contenu': text,
+                'date_extraction': datetime.now().isoformat()
+            }
+        
+        except Exception as e:
+            logger.error(f"Erreur extraction données: {e}")
+            return None
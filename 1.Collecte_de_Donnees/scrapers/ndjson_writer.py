@@ -0,0 +1,167 @@
+import json
+import os
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TMP_SUFFIX = '.tmp'
+
+
+def segment_path(path: str, index: int) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}.{index:05d}{ext}"
+
+
+def rotated_segments(path: str, suffix: str = '') -> List[str]:
+    directory = os.path.dirname(path) or '.'
+    root, ext = os.path.splitext(os.path.basename(path))
+    ext += suffix
+    segments = []
+    for name in os.listdir(directory):
+        if not (name.startswith(root + '.') and name.endswith(ext)):
+            continue
+        index = name[len(root) + 1:len(name) - len(ext)]
+        if index.isdigit():
+            segments.append(os.path.join(directory, name))
+    return sorted(segments)
+
+
+class NDJSONWriter:
+    def __init__(self, path: str, fsync_every: int = 10, max_bytes: Optional[int] = None, append: bool = True):
+        # append=False : nouveau fichier écrit dans <path>.tmp, segments dans <segment>.tmp, tous renommés
+        # à la fermeture ; l'ancien fichier et ses segments restent seuls visibles jusque-là
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.max_bytes = max_bytes
+        self.append = append
+        self.pending = 0
+        self.count = 0
+        self.segments = []
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        if append:
+            self.write_path = path
+            self.stale_segments = []
+            self._repair_tail()
+            self.file = open(path, 'a', encoding='utf-8')
+        else:
+            self.write_path = path + TMP_SUFFIX
+            self.stale_segments = rotated_segments(path)
+            # Segments d'une collecte interrompue, jamais publiés
+            for segment in rotated_segments(path, TMP_SUFFIX):
+                os.remove(segment)
+            self.file = open(self.write_path, 'w', encoding='utf-8')
+    
+    def _repair_tail(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        
+        with open(self.path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            
+            # Dernière ligne incomplète (arrêt brutal) : on tronque au dernier saut de ligne
+            position = size
+            while position > 0:
+                step = min(65536, position)
+                position -= step
+                f.seek(position)
+                chunk = f.read(step)
+                newline = chunk.rfind(b'\n')
+                if newline != -1:
+                    position += newline + 1
+                    break
+            logger.warning(f"Ligne incomplète supprimée en fin de {self.path} ({size - position} octets)")
+            f.truncate(position)
+    
+    def write(self, record: Dict) -> None:
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        self.count += 1
+        self.pending += 1
+        
+        if self.pending >= self.fsync_every:
+            self.sync()
+        
+        if self.max_bytes and os.fstat(self.file.fileno()).st_size >= self.max_bytes:
+            self.rotate()
+    
+    def sync(self) -> None:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+    
+    def rotate(self) -> str:
+        self.sync()
+        self.file.close()
+        
+        if self.append:
+            segments = rotated_segments(self.path)
+            next_index = 1
+            if segments:
+                last = os.path.splitext(os.path.splitext(segments[-1])[0])[1]
+                next_index = int(last.lstrip('.')) + 1
+            target = segment_path(self.path, next_index)
+        else:
+            # Numérotés depuis 1, publiés par close() seulement
+            target = segment_path(self.path, len(self.segments) + 1) + TMP_SUFFIX
+        os.replace(self.write_path, target)
+        self.segments.append(target)
+        self._sync_directory()
+        logger.info(f"Rotation NDJSON: {target}")
+        
+        self.file = open(self.write_path, 'a' if self.append else 'w', encoding='utf-8')
+        return target
+    
+    def _sync_directory(self) -> None:
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        self.sync()
+        self.file.close()
+        if not self.append:
+            published = set()
+            for segment in self.segments:
+                published.add(segment[:-len(TMP_SUFFIX)])
+                os.replace(segment, segment[:-len(TMP_SUFFIX)])
+            os.replace(self.write_path, self.path)
+            # Segments d'une collecte précédente non écrasés par ceux de cette collecte
+            for segment in self.stale_segments:
+                if segment not in published:
+                    os.remove(segment)
+            self._sync_directory()
+    
+    def abort(self) -> None:
+        if self.file.closed:
+            return
+        self.sync()
+        self.file.close()
+        if not self.append:
+            logger.warning(f"Collecte interrompue: {self.path} conservé, articles partiels dans {self.write_path}"
+                           + (f" et {len(self.segments)} segments {TMP_SUFFIX}" if self.segments else ""))
+    
+    def __enter__(self) -> 'NDJSONWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,57 @@
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_worker_scraper = None
+
+
+def _init_worker(scraper_class, options: Dict) -> None:
+    # Un scraper par processus, construit une seule fois (XPath compilés, parseur lxml)
+    global _worker_scraper
+    _worker_scraper = scraper_class(**options)
+
+
+def _parse(content: bytes, url: str) -> Optional[Dict]:
+    return _worker_scraper.parse_article(content, url)
+
+
+class ParsePool:
+    def __init__(self, scraper_class, options: Dict, workers: int, max_pending: Optional[int] = None):
+        self.workers = max(1, workers)
+        self.max_pending = max_pending or self.workers * 2
+        # spawn : le processus parent a des threads actifs (pool de téléchargement)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(scraper_class, options)
+        )
+    
+    def imap(self, pages: Iterable[Tuple[str, Optional[bytes]]]) -> Iterator[Tuple[str, Optional[bytes], object]]:
+        # Résultats dans l'ordre d'entrée ; au plus max_pending pages en mémoire côté parsing
+        pending = deque()
+        try:
+            for url, content in pages:
+                future = self.executor.submit(_parse, content, url) if content else None
+                pending.append((url, content, future))
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+        finally:
+            for _, _, future in pending:
+                if future is not None:
+                    future.cancel()
+    
+    def close(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+    
+    def __enter__(self) -> 'ParsePool':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
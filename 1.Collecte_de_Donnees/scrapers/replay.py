@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import logging
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+RECORDED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def normalize_url(url: str) -> str:
+    # Même forme que request.url côté adaptateur (ex: slash final ajouté par requests)
+    prepared = requests.PreparedRequest()
+    prepared.prepare_url(url, None)
+    return prepared.url
+
+
+class FixtureStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.index_path = os.path.join(directory, 'index.ndjson')
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict] = {}
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+    
+    def _load_index(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.entries[entry['url']] = entry
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __contains__(self, url: str) -> bool:
+        return normalize_url(url) in self.entries
+    
+    def record(self, url: str, content: bytes, status: int = 200,
+               headers: Optional[Dict[str, str]] = None) -> None:
+        url = normalize_url(url)
+        filename = hashlib.sha1(url.encode('utf-8')).hexdigest() + '.bin'
+        kept_headers = {k: v for k, v in (headers or {}).items() if k in RECORDED_HEADERS}
+        entry = {'url': url, 'file': filename, 'status': status, 'headers': kept_headers}
+        
+        with self.lock:
+            with open(os.path.join(self.directory, filename), 'wb') as f:
+                f.write(content)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+            self.entries[url] = entry
+    
+    def load(self, url: str) -> Optional[Dict]:
+        entry = self.entries.get(normalize_url(url))
+        if entry is None:
+            return None
+        with open(os.path.join(self.directory, entry['file']), 'rb') as f:
+            content = f.read()
+        return {'status': entry['status'], 'headers': entry['headers'], 'content': content}
+
+
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, store: FixtureStore, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, seed: Optional[int] = None):
+        super().__init__()
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counters = {'requests': 0, 'served': 0, 'missing': 0, 'injected_errors': 0}
+    
+    def _count(self, name: str) -> None:
+        with self.lock:
+            self.counters[name] += 1
+    
+    def _build_response(self, request, status: int, content: bytes, headers: Dict[str, str]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response._content = content
+        response.headers = CaseInsensitiveDict(headers)
+        response.url = request.url
+        response.request = request
+        response.reason = 'OK' if status < 400 else 'Replay'
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+    
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        self._count('requests')
+        
+        with self.lock:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+            inject_error = self.error_rate > 0 and self.random.random() < self.error_rate
+            connection_error = inject_error and self.random.random() < 0.5
+        if delay > 0:
+            time.sleep(delay)
+        
+        if inject_error:
+            self._count('injected_errors')
+            if connection_error:
+                raise requests.ConnectionError(f"Erreur injectée (replay): {request.url}", request=request)
+            return self._build_response(request, self.error_status, b'', {})
+        
+        fixture = self.store.load(request.url)
+        if fixture is None:
+            self._count('missing')
+            return self._build_response(request, 404, b'', {})
+        
+        self._count('served')
+        return self._build_response(request, fixture['status'], fixture['content'], fixture['headers'])
+    
+    def close(self) -> None:
+        pass
+    
+    def install(self, session: requests.Session) -> None:
+        session.mount('http://', self)
+        session.mount('https://', self)
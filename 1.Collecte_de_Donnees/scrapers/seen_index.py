@@ -0,0 +1,76 @@
+import os
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+
+class SeenIndex:
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS seen (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            )
+        ''')
+        self.conn.commit()
+    
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+    
+    def __contains__(self, url: str) -> bool:
+        with self.lock:
+            row = self.conn.execute('SELECT 1 FROM seen WHERE url = ?', (url,)).fetchone()
+            return row is not None
+    
+    def filter_unseen(self, urls: Iterable[str]) -> List[str]:
+        urls = list(urls)
+        now = datetime.now().isoformat()
+        unseen = []
+        with self.lock:
+            for url in urls:
+                row = self.conn.execute('SELECT 1 FROM seen WHERE url = ?', (url,)).fetchone()
+                if row is None:
+                    unseen.append(url)
+                else:
+                    self.conn.execute('UPDATE seen SET last_seen = ? WHERE url = ?', (now, url))
+            self.conn.commit()
+        return unseen
+    
+    def record(self, articles: Iterable[Dict]) -> int:
+        now = datetime.now().isoformat()
+        count = 0
+        with self.lock:
+            for article in articles:
+                url = article.get('url')
+                if not url:
+                    continue
+                self.conn.execute(
+                    '''INSERT INTO seen (url, content_hash, first_seen, last_seen) VALUES (?, ?, ?, ?)
+                       ON CONFLICT(url) DO UPDATE SET content_hash = excluded.content_hash,
+                                                      last_seen = excluded.last_seen''',
+                    (url, self.content_hash(article.get('contenu', '')), now, now)
+                )
+                count += 1
+            self.conn.commit()
+        return count
+    
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,52 @@
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(float(capacity), 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            # Jeton emprunté : l'attente est réservée, les appels suivants se placent derrière
+            return -self.tokens / self.rate
+    
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    def __init__(self, requests_per_second: float = 1.0, burst: int = 1):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+    
+    def bucket_for(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_second, self.burst)
+                self.buckets[host] = bucket
+            return bucket
+    
+    def acquire(self, url: str) -> None:
+        self.bucket_for(url).acquire()
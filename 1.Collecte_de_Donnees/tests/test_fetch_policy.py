@@ -0,0 +1,66 @@
+import pytest
+
+from scrapers import fetch_policy
+from scrapers.fetch_policy import CircuitBreaker, RetryPolicy, parse_retry_after
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(fetch_policy.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_circuit_opens_after_threshold(clock):
+    breaker = CircuitBreaker('example.com', failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+    
+    clock[0] += 59
+    assert not breaker.allow()
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    breaker = CircuitBreaker('example.com', failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    clock[0] += 60
+    assert not breaker.is_open
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    
+    # Échec de la requête de test : nouvelle pause complète
+    breaker.record_failure()
+    assert breaker.is_open
+    clock[0] += 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker('example.com', failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retry_policy_and_retry_after():
+    policy = RetryPolicy(max_retries=2, backoff_base=1.0, backoff_max=10.0)
+    assert policy.should_retry(None) and policy.should_retry(503)
+    assert not policy.should_retry(404)
+    assert 0 <= policy.delay(1) <= 2
+    assert policy.delay(0, retry_after=5) == 5
+    assert policy.delay(0, retry_after=11) is None
+    assert policy.delay(2) is None
+    
+    assert parse_retry_after('120') == 120
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert parse_retry_after('bientôt') is None
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+from scrapers.frontier import BloomFilter, CrawlFrontier
+
+
+def drain(frontier):
+    entries = []
+    while True:
+        entry = frontier.pop()
+        if entry is None:
+            return entries
+        entries.append((entry['url'], entry['kind'], entry['depth']))
+
+
+def test_articles_before_next_page_and_no_duplicates():
+    frontier = CrawlFrontier(max_depth=1)
+    assert frontier.push('https://site/page/2', kind='listing', depth=1)
+    assert frontier.push('https://site/a')
+    assert frontier.push('https://site/b', depth=1)
+    assert not frontier.push('https://site/a')
+    assert not frontier.push('https://site/page/3', kind='listing', depth=2)
+    
+    assert drain(frontier) == [('https://site/a', 'article', 0), ('https://site/b', 'article', 1),
+                               ('https://site/page/2', 'listing', 1)]
+
+
+def test_resume_from_saved_state(tmp_path):
+    path = str(tmp_path / 'frontier' / 'krebs.json')
+    frontier = CrawlFrontier(max_depth=5, max_age_days=30)
+    for url in ('https://site/a', 'https://site/b', 'https://site/c'):
+        frontier.push(url)
+    frontier.push('https://site/page/2', kind='listing', depth=1)
+    assert frontier.pop()['url'] == 'https://site/a'
+    frontier.save(path)
+    
+    resumed = CrawlFrontier.load(path)
+    assert (resumed.max_depth, resumed.max_age_days) == (5, 30)
+    # URL déjà traitée avant l'arrêt : pas reprise
+    assert not resumed.push('https://site/a')
+    assert resumed.push('https://site/d')
+    assert drain(resumed) == [('https://site/b', 'article', 0), ('https://site/c', 'article', 0),
+                              ('https://site/d', 'article', 0), ('https://site/page/2', 'listing', 1)]
+
+
+def test_pagination_stops_at_date_limit(tmp_path):
+    frontier = CrawlFrontier(max_age_days=7)
+    old = (datetime.now(timezone.utc) - timedelta(days=8)).isoformat()
+    assert frontier.is_too_old(old)
+    assert not frontier.is_too_old(datetime.now(timezone.utc).isoformat())
+    assert not frontier.is_too_old('date inconnue')
+    
+    frontier.push('https://site/page/2', kind='listing', depth=1)
+    frontier.push('https://site/a')
+    frontier.stop_pagination()
+    assert not frontier.push('https://site/page/3', kind='listing', depth=2)
+    frontier.save(str(tmp_path / 'frontier.json'))
+    assert drain(CrawlFrontier.load(str(tmp_path / 'frontier.json'))) == [('https://site/a', 'article', 0)]
+
+
+def test_bloom_filter_round_trip():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(500):
+        assert bloom.add(f'https://site/{i}')
+    restored = BloomFilter.from_dict(bloom.to_dict())
+    assert all(f'https://site/{i}' in restored for i in range(500))
+    assert restored.count == 500
+    false_positives = sum(f'https://autre/{i}' in restored for i in range(10000))
+    assert false_positives < 300
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from scrapers.ndjson_writer import NDJSONWriter, rotated_segments, segment_path
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def visible_records(path):
+    records = []
+    for segment in rotated_segments(str(path)) + [str(path)]:
+        records.extend(read_lines(segment))
+    return records
+
+
+def test_incomplete_last_line_is_removed(tmp_path):
+    path = tmp_path / 'articles.ndjson'
+    path.write_text('{"id": 1}\n{"id": 2}\n{"id"', encoding='utf-8')
+    with NDJSONWriter(str(path)) as writer:
+        writer.write({'id': 3})
+    assert read_lines(path) == [{'id': 1}, {'id': 2}, {'id': 3}]
+
+
+def test_append_rotation_numbers_after_existing_segments(tmp_path):
+    path = tmp_path / 'articles.ndjson'
+    with NDJSONWriter(str(path), max_bytes=1) as writer:
+        writer.write({'id': 1})
+    with NDJSONWriter(str(path), max_bytes=1) as writer:
+        writer.write({'id': 2})
+        writer.write({'id': 3})
+    assert rotated_segments(str(path)) == [segment_path(str(path), index) for index in (1, 2, 3)]
+    assert visible_records(path) == [{'id': 1}, {'id': 2}, {'id': 3}]
+
+
+def test_fresh_collection_replaces_file_and_segments(tmp_path):
+    path = tmp_path / 'articles.ndjson'
+    with NDJSONWriter(str(path), max_bytes=1) as writer:
+        for index in range(3):
+            writer.write({'id': index})
+    
+    with NDJSONWriter(str(path), max_bytes=1, append=False) as writer:
+        writer.write({'id': 'new'})
+        # Rien n'est publié avant la fermeture
+        assert visible_records(path) == [{'id': 0}, {'id': 1}, {'id': 2}]
+    assert rotated_segments(str(path)) == [segment_path(str(path), 1)]
+    assert visible_records(path) == [{'id': 'new'}]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['articles.00001.ndjson', 'articles.ndjson']
+
+
+def test_abort_after_rotation_keeps_previous_collection(tmp_path):
+    path = tmp_path / 'articles.ndjson'
+    with NDJSONWriter(str(path), max_bytes=1) as writer:
+        writer.write({'id': 'old-1'})
+    path.write_text('{"id": "old-2"}\n', encoding='utf-8')
+    
+    with pytest.raises(RuntimeError):
+        with NDJSONWriter(str(path), max_bytes=1, append=False) as writer:
+            for index in range(3):
+                writer.write({'id': index})
+            raise RuntimeError('interruption')
+    assert rotated_segments(str(path)) == [segment_path(str(path), 1)]
+    assert visible_records(path) == [{'id': 'old-1'}, {'id': 'old-2'}]
+    
+    # La collecte suivante ne publie pas les segments de la collecte interrompue
+    with NDJSONWriter(str(path), append=False) as writer:
+        writer.write({'id': 'new'})
+    assert visible_records(path) == [{'id': 'new'}]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['articles.ndjson']
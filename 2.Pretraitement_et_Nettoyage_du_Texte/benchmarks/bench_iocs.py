@@ -0,0 +1,54 @@
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.normalizer import FastTextNormalizer
+from modules.ioc_extractor import IOCExtractor
+from shared.article_io import iter_articles
+
+DEFAULT_INPUT = Path(__file__).resolve().parent.parent.parent / "data" / "articles_cybersecurity.json"
+
+
+def best_time(func, texts, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark IOCExtractor vs FastTextNormalizer")
+    parser.add_argument('--input', type=Path, default=DEFAULT_INPUT)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    texts = [article.get('contenu', '') for article in iter_articles(args.input)]
+    size_mb = sum(len(text.encode('utf-8')) for text in texts) / (1024 * 1024)
+    
+    extractor = IOCExtractor()
+    normalizer = FastTextNormalizer()
+    counts = Counter()
+    for text in texts:
+        for kind, values in extractor.extract(text).items():
+            counts[kind] += len(values)
+    
+    normalizer_time = best_time(normalizer.process, texts, args.repeat)
+    extractor_time = best_time(extractor.extract, texts, args.repeat)
+    
+    print(f"Corpus: {len(texts)} textes, {size_mb:.2f} Mo ({args.input})")
+    print(f"{'étape':<20} {'temps (ms)':>11} {'Mo/s':>8}")
+    print(f"{'FastTextNormalizer':<20} {normalizer_time * 1000:>11.1f} {size_mb / normalizer_time:>8.1f}")
+    print(f"{'IOCExtractor':<20} {extractor_time * 1000:>11.1f} {size_mb / extractor_time:>8.1f}")
+    print(f"Coût relatif: {extractor_time / normalizer_time:.0%} du normaliseur")
+    print("Indicateurs: " + ", ".join(f"{kind}={count}" for kind, count in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    main()
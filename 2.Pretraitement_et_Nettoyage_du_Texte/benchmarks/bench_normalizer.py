@@ -0,0 +1,52 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.normalizer import TextNormalizer, FastTextNormalizer
+from shared.article_io import iter_articles
+
+DEFAULT_INPUT = Path(__file__).resolve().parent.parent.parent / "data" / "articles_cybersecurity.json"
+
+
+def time_normalizer(normalizer, texts, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            normalizer.process(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TextNormalizer vs FastTextNormalizer")
+    parser.add_argument('--input', type=Path, default=DEFAULT_INPUT)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    texts = []
+    for article in iter_articles(args.input):
+        texts.append(article.get('titre', ''))
+        texts.append(article.get('contenu', ''))
+    size_mb = sum(len(text.encode('utf-8')) for text in texts) / (1024 * 1024)
+    
+    reference = TextNormalizer()
+    fast = FastTextNormalizer()
+    mismatches = sum(1 for text in texts if reference.process(text) != fast.process(text))
+    
+    reference_time = time_normalizer(reference, texts, args.repeat)
+    fast_time = time_normalizer(fast, texts, args.repeat)
+    
+    print(f"Corpus: {len(texts)} textes, {size_mb:.2f} Mo ({args.input})")
+    print(f"{'normaliseur':<20} {'temps (ms)':>11} {'Mo/s':>8}")
+    print(f"{'TextNormalizer':<20} {reference_time * 1000:>11.1f} {size_mb / reference_time:>8.1f}")
+    print(f"{'FastTextNormalizer':<20} {fast_time * 1000:>11.1f} {size_mb / fast_time:>8.1f}")
+    print(f"Gain: {reference_time / fast_time:.2f}x, sorties différentes: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
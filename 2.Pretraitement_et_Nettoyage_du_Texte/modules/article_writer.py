@@ -0,0 +1,53 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+from shared.article_io import NDJSON_SUFFIXES
+
+
+class ArticleWriter:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.ndjson = self.path.suffix in NDJSON_SUFFIXES
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.count = 0
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+        if not self.ndjson:
+            self.file.write('[')
+    
+    def write(self, record: Dict) -> None:
+        if self.ndjson:
+            self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        else:
+            # Même mise en forme que json.dump(articles, indent=2) sur la liste complète
+            item = json.dumps(record, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+            self.file.write((',\n  ' if self.count else '\n  ') + item)
+        self.count += 1
+    
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        if not self.ndjson:
+            self.file.write('\n]' if self.count else ']')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+    
+    def abort(self) -> None:
+        if not self.file.closed:
+            self.file.close()
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+    
+    def __enter__(self) -> 'ArticleWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
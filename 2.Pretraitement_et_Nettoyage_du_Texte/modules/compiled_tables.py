@@ -0,0 +1,53 @@
+from typing import Dict, FrozenSet, Optional
+import logging
+import os
+import pickle
+
+logger = logging.getLogger(__name__)
+
+TABLES_VERSION = 1
+
+
+class CompiledTables:
+    def __init__(self, language: str, kind: Optional[str], stop_words: FrozenSet[str],
+                 reductions: Dict[str, str]):
+        self.language = language
+        self.kind = kind
+        self.stop_words = frozenset(stop_words)
+        self.reductions = reductions
+    
+    def matches(self, language: str, kind: Optional[str]) -> bool:
+        return self.language == language and self.kind == kind
+    
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        state = {
+            'version': TABLES_VERSION,
+            'language': self.language,
+            'kind': self.kind,
+            'stop_words': self.stop_words,
+            'reductions': self.reductions
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        logger.info(f"Tables compilées sauvegardées: {path} ({len(self.stop_words)} stopwords, "
+                    f"{len(self.reductions)} termes {self.kind or ''})")
+    
+    @classmethod
+    def load(cls, path: str) -> Optional['CompiledTables']:
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Tables compilées illisibles, ignorées ({path}): {e}")
+            return None
+        
+        if state.get('version') != TABLES_VERSION:
+            logger.warning(f"Tables compilées ignorées ({path}): version {state.get('version')}")
+            return None
+        return cls(state['language'], state['kind'], state['stop_words'], state['reductions'])
@@ -0,0 +1,171 @@
+import hashlib
+import logging
+import os
+import pickle
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 42):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        generator = np.random.RandomState(seed)
+        self.a = generator.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = generator.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+    
+    def shingles(self, text: str) -> Set[str]:
+        words = WORD_PATTERN.findall(text.lower())
+        if len(words) < self.shingle_size:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+    
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        # (a·h + b) mod p en uint64 : a et h < 2^32, le produit tient sur 64 bits ; il est réduit
+        # modulo p (< 2^61) avant l'ajout de b pour que la somme ne déborde pas
+        permuted = (np.outer(hashes, self.a) % MERSENNE_PRIME + self.b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+
+class LSHIndex:
+    def __init__(self, num_perm: int = 128, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm doit être un multiple de bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets = [defaultdict(list) for _ in range(bands)]
+    
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+    
+    def insert(self, key: str, signature: np.ndarray) -> None:
+        for band, band_key in zip(self.buckets, self._band_keys(signature)):
+            band[band_key].append(key)
+    
+    def query(self, signature: np.ndarray) -> Set[str]:
+        candidates = set()
+        for band, band_key in zip(self.buckets, self._band_keys(signature)):
+            candidates.update(band.get(band_key, ()))
+        return candidates
+
+
+class NearDuplicateDetector:
+    def __init__(self, index_path: Optional[str] = None, threshold: float = 0.8,
+                 num_perm: int = 128, bands: int = 16, shingle_size: int = 5):
+        self.index_path = index_path
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self.lsh = LSHIndex(num_perm=num_perm, bands=bands)
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.canonical: Dict[str, str] = {}
+        
+        if index_path and os.path.exists(index_path):
+            self.load(index_path)
+    
+    @staticmethod
+    def article_key(article: Dict) -> str:
+        if article.get('url'):
+            return article['url']
+        return hashlib.sha256(article.get('contenu', '').encode('utf-8')).hexdigest()
+    
+    def similarity(self, sig1: np.ndarray, sig2: np.ndarray) -> float:
+        return float(np.mean(sig1 == sig2))
+    
+    def check(self, article: Dict) -> Optional[str]:
+        key = self.article_key(article)
+        if key in self.signatures:
+            return self.canonical.get(key)
+        
+        signature = self.hasher.signature(article.get('contenu', ''))
+        if signature is None:
+            return None
+        
+        best_key, best_score = None, self.threshold
+        for candidate in self.lsh.query(signature):
+            score = self.similarity(signature, self.signatures[candidate])
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        
+        self.signatures[key] = signature
+        self.lsh.insert(key, signature)
+        
+        if best_key is None:
+            return None
+        canonical = self.canonical.get(best_key, best_key)
+        self.canonical[key] = canonical
+        return canonical
+    
+    def iter_deduplicate(self, articles: Iterable[Dict], collapse: bool = False) -> Iterator[Dict]:
+        total = duplicates = 0
+        for article in articles:
+            total += 1
+            duplicate_of = self.check(article)
+            if duplicate_of is None:
+                yield article
+                continue
+            
+            duplicates += 1
+            if not collapse:
+                article = dict(article)
+                article['duplicate_of'] = duplicate_of
+                yield article
+        
+        logger.info(f"Quasi-doublons détectés: {duplicates}/{total} (seuil {self.threshold})")
+    
+    def deduplicate(self, articles: List[Dict], collapse: bool = False) -> List[Dict]:
+        return list(self.iter_deduplicate(articles, collapse))
+    
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.index_path
+        if not path:
+            return
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        state = {
+            'num_perm': self.hasher.num_perm,
+            'shingle_size': self.hasher.shingle_size,
+            'bands': self.lsh.bands,
+            'signatures': self.signatures,
+            'canonical': self.canonical
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        logger.info(f"Index de déduplication sauvegardé: {path} ({len(self.signatures)} articles)")
+    
+    def load(self, path: str) -> None:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        
+        if (state['num_perm'] != self.hasher.num_perm or state['shingle_size'] != self.hasher.shingle_size
+                or state['bands'] != self.lsh.bands):
+            logger.warning(f"Paramètres MinHash différents, index ignoré: {path}")
+            return
+        
+        self.signatures = state['signatures']
+        self.canonical = state['canonical']
+        for key, signature in self.signatures.items():
+            self.lsh.insert(key, signature)
+        logger.info(f"Index de déduplication chargé: {len(self.signatures)} articles")
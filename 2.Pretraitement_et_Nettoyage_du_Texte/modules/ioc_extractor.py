@@ -0,0 +1,96 @@
+import re
+from typing import Dict, List
+
+# Formes "défangées" courantes : example[.]com, hxxps://, user[at]example[.]com
+DOT = r'(?:\.|\[\.\]|\(\.\)|\{\.\}|\[dot\]|\(dot\))'
+AT = r'(?:@|\[@\]|\(@\)|\[at\]|\(at\))'
+LABEL = r'[A-Za-z0-9][A-Za-z0-9-]*'
+# TLD tout en minuscules ou tout en majuscules : "EVIL[.]COM" est un domaine, "attacks.This" (point
+# sans espace dans le texte) n'en est pas un
+HOST = rf'(?:{LABEL}{DOT})+(?:[a-z]{{2,24}}|[A-Z]{{2,24}})'
+OCTET = r'(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)'
+URL_CHARS = r'[^\s<>"\'\]\[)(]*'
+
+# Le motif commence par une classe de caractères (recherche rapide en C sur les séparateurs au lieu
+# de \b testé à chaque position), puis écarte les mots sans chiffre ni ".", "@", "[", "(" ou ":"
+# avant d'essayer les alternatives. Ce filtre relit le mot d'une traite : (?=(X*))\1 remplace le
+# quantificateur possessif X*+ (Python 3.11+) et évite de revenir en arrière lettre par lettre sur
+# chaque mot écarté. Ailleurs, chaque répétition est suivie d'un caractère qu'elle ne peut pas
+# consommer : le retour arrière y est sans effet.
+IOC_PATTERN = re.compile(
+    r'[^A-Za-z0-9_](?=(?=([A-Za-z-]*))\1[.@\[(:\d])(?:'
+    rf'(?P<url>(?:[hH][tTxX]{{2}}[pP][sS]?(?:://|\[://\]|\[:\]//)|www{DOT}){URL_CHARS}(?:\[\.\]{URL_CHARS})*)'
+    r'|(?P<cve>[Cc][Vv][Ee]-\d{4}-\d{4,7})'
+    rf'|(?P<ipv4>{OCTET}(?:{DOT}{OCTET}){{3}})(?![\d.]*\d)'
+    r'|(?P<hash>[A-Fa-f0-9]{64}|[A-Fa-f0-9]{40}|[A-Fa-f0-9]{32})\b'
+    r'|(?P<version>[vV]\d+(?:\.\d+)+|\d+\.\d+\.\d+(?:\.\d+)*)\b'
+    rf'|(?P<email>[A-Za-z0-9][A-Za-z0-9._%+-]*{AT}{HOST})'
+    rf'|(?P<domain>{HOST})\b(?!\.\w|-)'
+    r')'
+)
+DEFANG_PATTERN = re.compile(r'\[\.\]|\(\.\)|\{\.\}|\[dot\]|\(dot\)|\[@\]|\(@\)|\[at\]|\(at\)|\[://\]|\[:\]')
+REFANG = {'[://]': '://', '[:]': ':', '[@]': '@', '(@)': '@', '[at]': '@', '(at)': '@'}
+HASH_TYPES = {32: 'md5', 40: 'sha1', 64: 'sha256'}
+URL_TRAILING = '.,;:!?\'"'
+# Extensions de fichiers fréquentes dans les articles, prises à tort pour des TLD
+FILE_EXTENSIONS = frozenset([
+    'exe', 'dll', 'sys', 'js', 'py', 'php', 'html', 'htm', 'aspx', 'jsp', 'json', 'xml', 'txt', 'log',
+    'zip', 'rar', 'gz', 'tar', 'pdf', 'doc', 'docx', 'docm', 'xls', 'xlsx', 'xlsm', 'ppt', 'pptx',
+    'ps1', 'bat', 'cmd', 'sh', 'vbs', 'hta', 'lnk', 'iso', 'img', 'msi', 'jar', 'apk', 'dmg', 'bin',
+    'dat', 'tmp', 'cfg', 'ini', 'yml', 'yaml', 'md', 'csv', 'jpg', 'jpeg', 'png', 'gif', 'svg', 'so'
+])
+# TLD en majuscules acceptés au-delà des codes pays (2 lettres) : "D.AMO" est un nom de produit
+UPPERCASE_TLDS = frozenset([
+    'COM', 'NET', 'ORG', 'EDU', 'GOV', 'MIL', 'INT', 'INFO', 'BIZ', 'NAME', 'PRO', 'MOBI', 'ASIA',
+    'XYZ', 'TOP', 'ONLINE', 'SITE', 'CLUB', 'APP', 'DEV', 'CLOUD', 'TECH', 'SHOP', 'STORE', 'LIVE',
+    'ONION'
+])
+
+
+def refang(value: str) -> str:
+    if value[:4].lower() == 'hxxp':
+        value = 'http' + value[4:]
+    if '[' not in value and '(' not in value and '{' not in value:
+        return value
+    return DEFANG_PATTERN.sub(lambda m: REFANG.get(m.group(0).lower(), '.'), value)
+
+
+def plausible_tld(host: str) -> bool:
+    tld = host.rsplit('.', 1)[-1]
+    return not tld.isupper() or len(tld) == 2 or tld in UPPERCASE_TLDS
+
+
+class IOCExtractor:
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        # Un seul passage sur le texte brut, avant la normalisation qui supprime URLs, emails et chiffres
+        found = {}
+        seen = set()
+        for match in IOC_PATTERN.finditer(' ' + text):
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == 'url':
+                value = refang(value.rstrip(URL_TRAILING))
+            elif kind == 'domain':
+                value = refang(value)
+                if not plausible_tld(value):
+                    continue
+                value = value.lower()
+                if value.rsplit('.', 1)[-1] in FILE_EXTENSIONS:
+                    continue
+            elif kind == 'email':
+                value = refang(value)
+                if not plausible_tld(value):
+                    continue
+                value = value.lower()
+            elif kind == 'ipv4':
+                value = refang(value)
+            elif kind == 'cve':
+                value = value.upper()
+            elif kind == 'hash':
+                kind = HASH_TYPES[len(value)]
+                value = value.lower()
+            
+            if (kind, value) not in seen:
+                seen.add((kind, value))
+                found.setdefault(kind, []).append(value)
+        return found
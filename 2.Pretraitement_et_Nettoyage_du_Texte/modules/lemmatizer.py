@@ -1,42 +1,201 @@
-from typing import List
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+import json
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
 
+class LemmaCache:
+    def __init__(self, kind: str, max_size: int = 100000, path: Optional[str] = None):
+        self.kind = kind
+        self.max_size = max_size
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.learned = None
+        
+        if path and os.path.exists(path):
+            self.load(path)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def map(self, tokens: List[str], func: Callable[[str], str]) -> List[str]:
+        if self.max_size <= 0:
+            return [func(token) for token in tokens]
+        
+        entries = self.entries
+        get = entries.get
+        move_to_end = entries.move_to_end
+        result = []
+        misses = 0
+        for token in tokens:
+            value = get(token)
+            if value is None:
+                misses += 1
+                value = func(token)
+                entries[token] = value
+                if self.learned is not None:
+                    self.learned[token] = value
+                if len(entries) > self.max_size:
+                    entries.popitem(last=False)
+                    self.evictions += 1
+            else:
+                move_to_end(token)
+            result.append(value)
+        
+        self.misses += misses
+        self.hits += len(tokens) - misses
+        return result
+    
+    def track_learned(self) -> None:
+        # Utilisé dans les processus workers : les nouvelles entrées sont renvoyées au parent
+        self.learned = {}
+    
+    def drain(self) -> Dict:
+        delta = {'entries': self.learned or {}, 'hits': self.hits, 'misses': self.misses}
+        self.learned = {} if self.learned is not None else None
+        self.hits = self.misses = 0
+        return delta
+    
+    def merge(self, delta: Dict) -> None:
+        self.hits += delta['hits']
+        self.misses += delta['misses']
+        for token, value in delta['entries'].items():
+            self.entries[token] = value
+            self.entries.move_to_end(token)
+        while self.max_size > 0 and len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'kind': self.kind,
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if not path:
+            return
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'kind': self.kind, 'entries': self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        logger.info(f"Cache {self.kind} sauvegardé: {path} ({len(self.entries)} entrées)")
+    
+    def load(self, path: str) -> None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cache illisible, ignoré ({path}): {e}")
+            return
+        
+        if state.get('kind') != self.kind:
+            logger.warning(f"Cache {state.get('kind')} ignoré ({path}), {self.kind} attendu")
+            return
+        
+        entries = list(state['entries'].items())
+        if self.max_size > 0:
+            entries = entries[-self.max_size:]
+        self.entries = OrderedDict(entries)
+        logger.info(f"Cache {self.kind} chargé: {len(self.entries)} entrées")
+
+
 class Lemmatizer:
-    def __init__(self):
+    def __init__(self, cache_size: int = 100000, cache_path: Optional[str] = None,
+                 table: Optional[Dict[str, str]] = None):
+        self.cache = LemmaCache('wordnet', cache_size, cache_path)
+        self.table = table
+        # Avec une table compilée, NLTK n'est importé qu'au premier terme absent de la table
+        self.lemmatizer = self._load() if table is None else None
+        self.loaded = table is None
+    
+    def _load(self):
         try:
             import nltk
             from nltk.stem import WordNetLemmatizer
             try:
-                self.lemmatizer = WordNetLemmatizer()
-                self.lemmatizer.lemmatize('test')
+                lemmatizer = WordNetLemmatizer()
+                lemmatizer.lemmatize('test')
             except LookupError:
                 logger.warning("NLTK wordnet non disponible, téléchargement...")
                 nltk.download('wordnet', quiet=True)
                 nltk.download('omw-1.4', quiet=True)
-                self.lemmatizer = WordNetLemmatizer()
+                lemmatizer = WordNetLemmatizer()
+            return lemmatizer
         except Exception as e:
             logger.error(f"Erreur initialisation lemmatizer: {e}")
-            self.lemmatizer = None
+            return None
+    
+    @property
+    def available(self) -> bool:
+        return self.table is not None or self.lemmatizer is not None
+    
+    def _lemmatize_token(self, token: str) -> str:
+        lemma = self.table.get(token)
+        if lemma is not None:
+            return lemma
+        if not self.loaded:
+            self.lemmatizer = self._load()
+            self.loaded = True
+        return self.lemmatizer.lemmatize(token) if self.lemmatizer else token
     
     def lemmatize(self, tokens: List[str]) -> List[str]:
+        if self.table is not None:
+            return self.cache.map(tokens, self._lemmatize_token)
         if not self.lemmatizer:
             return tokens
-        return [self.lemmatizer.lemmatize(token) for token in tokens]
+        return self.cache.map(tokens, self.lemmatizer.lemmatize)
 
 
 class Stemmer:
-    def __init__(self):
+    def __init__(self, cache_size: int = 100000, cache_path: Optional[str] = None,
+                 table: Optional[Dict[str, str]] = None):
+        self.cache = LemmaCache('porter', cache_size, cache_path)
+        self.table = table
+        self.stemmer = self._load() if table is None else None
+        self.loaded = table is None
+    
+    def _load(self):
         try:
             from nltk.stem import PorterStemmer
-            self.stemmer = PorterStemmer()
+            return PorterStemmer()
         except Exception as e:
             logger.error(f"Erreur initialisation stemmer: {e}")
-            self.stemmer = None
+            return None
+    
+    @property
+    def available(self) -> bool:
+        return self.table is not None or self.stemmer is not None
+    
+    def _stem_token(self, token: str) -> str:
+        stem = self.table.get(token)
+        if stem is not None:
+            return stem
+        if not self.loaded:
+            self.stemmer = self._load()
+            self.loaded = True
+        return self.stemmer.stem(token) if self.stemmer else token
     
     def stem(self, tokens: List[str]) -> List[str]:
+        if self.table is not None:
+            return self.cache.map(tokens, self._stem_token)
         if not self.stemmer:
             return tokens
-        return [self.stemmer.stem(token) for token in tokens]
+        return self.cache.map(tokens, self.stemmer.stem)
@@ -1,6 +1,11 @@
 import re
 import string
 
+URL_PATTERN = re.compile(r'http\S+|www\.\S+')
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+# \d (chiffres Unicode, comme remove_numbers) + ponctuation ASCII : une seule suppression
+DELETE_PATTERN = re.compile('[\\d' + re.escape(string.punctuation) + ']+')
+
 
 class TextNormalizer:
     def __init__(self):
@@ -32,3 +37,15 @@ class TextNormalizer:
         text = self.remove_punctuation(text)
         text = self.remove_extra_spaces(text)
         return text
+
+
+class FastTextNormalizer(TextNormalizer):
+    def process(self, text: str) -> str:
+        # Même résultat que TextNormalizer.process ; URLs puis emails dans le même ordre,
+        # chaque regex n'est appliquée que si son motif peut apparaître
+        text = text.lower()
+        if 'http' in text or 'www.' in text:
+            text = URL_PATTERN.sub('', text)
+        if '@' in text:
+            text = EMAIL_PATTERN.sub('', text)
+        return ' '.join(DELETE_PATTERN.sub('', text).split())
@@ -0,0 +1,86 @@
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .preprocessor import TextPreprocessor
+
+logger = logging.getLogger(__name__)
+
+_worker_preprocessor = None
+
+
+def _init_worker(options: Dict) -> None:
+    # Stopwords NLTK, WordNet et cache de lemmes chargés une seule fois par processus
+    global _worker_preprocessor
+    _worker_preprocessor = TextPreprocessor(**options)
+    cache = _worker_preprocessor.lemma_cache
+    if cache is not None:
+        cache.track_learned()
+
+
+def _process_chunk(chunk: List[Tuple[int, Dict]]) -> Tuple[List[Tuple[int, Optional[Dict], Optional[str]]], Dict]:
+    results = []
+    for index, article in chunk:
+        try:
+            results.append((index, _worker_preprocessor.preprocess_article(article), None))
+        except Exception as e:
+            results.append((index, None, str(e)))
+    
+    # Statistiques et lemmes appris depuis le lot précédent, fusionnés par le processus parent
+    deltas = {}
+    cache = _worker_preprocessor.lemma_cache
+    if cache is not None:
+        deltas['lemmas'] = cache.drain()
+    result_cache = _worker_preprocessor.result_cache
+    if result_cache is not None:
+        # Une transaction par lot : rien ne reste en attente à l'arrêt du worker
+        result_cache.commit()
+        deltas['results'] = (result_cache.hits, result_cache.misses)
+        result_cache.hits = result_cache.misses = 0
+    return results, deltas
+
+
+def iter_chunks(articles: Iterable[Dict], chunk_size: int) -> Iterator[List[Tuple[int, Dict]]]:
+    chunk = []
+    for index, article in enumerate(articles):
+        chunk.append((index, article))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parallel_preprocess(articles: Iterable[Dict], preprocessor: TextPreprocessor, workers: int,
+                        chunk_size: int = 16) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    # Résultats dans l'ordre d'entrée, au plus 2 lots par worker en vol
+    max_pending = workers * 2
+    cache = preprocessor.lemma_cache
+    result_cache = preprocessor.result_cache
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(preprocessor.options,)) as executor:
+        pending = deque()
+        chunks = iter_chunks(articles, max(1, chunk_size))
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(_process_chunk, chunk))
+                if len(pending) >= max_pending:
+                    break
+            
+            while pending:
+                results, deltas = pending.popleft().result()
+                next_chunk = next(chunks, None)
+                if next_chunk is not None:
+                    pending.append(executor.submit(_process_chunk, next_chunk))
+                
+                if cache is not None and 'lemmas' in deltas:
+                    cache.merge(deltas['lemmas'])
+                if result_cache is not None and 'results' in deltas:
+                    result_cache.hits += deltas['results'][0]
+                    result_cache.misses += deltas['results'][1]
+                yield from results
+        finally:
+            for future in pending:
+                future.cancel()
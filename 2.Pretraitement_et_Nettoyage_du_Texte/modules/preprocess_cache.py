@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+COMMIT_EVERY = 256
+
+
+class PreprocessCache:
+    def __init__(self, path: str, fingerprint: str, commit_every: int = COMMIT_EVERY):
+        # Écritures validées par transactions de commit_every articles, et à commit() / close()
+        self.path = path
+        self.fingerprint = fingerprint
+        self.commit_every = max(1, commit_every)
+        self.pending = 0
+        self.hits = 0
+        self.misses = 0
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # WAL + timeout : plusieurs processus workers peuvent écrire dans la même base
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                content_hash TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                titre_tokens TEXT NOT NULL,
+                contenu_tokens TEXT NOT NULL,
+                updated TEXT NOT NULL
+            )
+        ''')
+        invalidated = self.conn.execute('DELETE FROM entries WHERE fingerprint != ?', (fingerprint,)).rowcount
+        self.conn.commit()
+        if invalidated:
+            logger.info(f"Configuration modifiée: {invalidated} entrées du cache de prétraitement invalidées")
+    
+    @staticmethod
+    def article_hash(article: Dict) -> str:
+        key = (article.get('titre') or '') + '\0' + (article.get('contenu') or '')
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+    
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+    
+    def get(self, article: Dict) -> Optional[Tuple[List[str], List[str]]]:
+        row = self.conn.execute(
+            'SELECT titre_tokens, contenu_tokens FROM entries WHERE content_hash = ? AND fingerprint = ?',
+            (self.article_hash(article), self.fingerprint)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0]), json.loads(row[1])
+    
+    def put(self, article: Dict, titre_tokens: List[str], contenu_tokens: List[str]) -> None:
+        self.conn.execute(
+            '''INSERT OR REPLACE INTO entries (content_hash, fingerprint, titre_tokens, contenu_tokens, updated)
+               VALUES (?, ?, ?, ?, ?)''',
+            (self.article_hash(article), self.fingerprint, json.dumps(titre_tokens, ensure_ascii=False),
+             json.dumps(contenu_tokens, ensure_ascii=False), datetime.now().isoformat())
+        )
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.commit()
+    
+    def commit(self) -> None:
+        self.conn.commit()
+        self.pending = 0
+    
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def close(self) -> None:
+        self.commit()
+        self.conn.close()
@@ -1,17 +1,100 @@
-from typing import List, Dict
-from .normalizer import TextNormalizer
+from typing import List, Dict, Optional, Iterable, Iterator
+import hashlib
+import json
+import logging
+import os
+from .normalizer import FastTextNormalizer
 from .tokenizer import Tokenizer
 from .stopwords_filter import StopWordsFilter
-from .lemmatizer import Lemmatizer, Stemmer
+from .lemmatizer import Lemmatizer, Stemmer, LemmaCache
+from .preprocess_cache import PreprocessCache
+from .compiled_tables import CompiledTables
+from .ioc_extractor import IOCExtractor
+
+logger = logging.getLogger(__name__)
+
+# À incrémenter quand la normalisation ou la tokenisation change (invalide le cache de prétraitement)
+PIPELINE_VERSION = 1
 
 
 class TextPreprocessor:
-    def __init__(self, use_lemmatization: bool = True, use_stemming: bool = False):
-        self.normalizer = TextNormalizer()
+    def __init__(self, use_lemmatization: bool = True, use_stemming: bool = False,
+                 cache_size: int = 100000, cache_path: Optional[str] = None,
+                 result_cache_path: Optional[str] = None, tables_path: Optional[str] = None,
+                 extract_iocs: bool = True):
+        self.options = {
+            'use_lemmatization': use_lemmatization,
+            'use_stemming': use_stemming,
+            'cache_size': cache_size,
+            'cache_path': cache_path,
+            'result_cache_path': result_cache_path,
+            'tables_path': tables_path,
+            'extract_iocs': extract_iocs
+        }
+        language = 'english'
+        kind = 'wordnet' if use_lemmatization else 'porter' if use_stemming else None
+        tables = self._load_tables(tables_path, language, kind)
+        stop_words = tables.stop_words if tables is not None else None
+        table = tables.reductions if tables is not None else None
+        
+        self.ioc_extractor = IOCExtractor() if extract_iocs else None
+        self.normalizer = FastTextNormalizer()
         self.tokenizer = Tokenizer()
-        self.stop_words_filter = StopWordsFilter(language='english')
-        self.lemmatizer = Lemmatizer() if use_lemmatization else None
-        self.stemmer = Stemmer() if use_stemming else None
+        self.stop_words_filter = StopWordsFilter(language=language, stop_words=stop_words)
+        self.lemmatizer = Lemmatizer(cache_size, cache_path, table) if kind == 'wordnet' else None
+        self.stemmer = Stemmer(cache_size, cache_path, table) if kind == 'porter' else None
+        self.result_cache = PreprocessCache(result_cache_path, self.fingerprint()) if result_cache_path else None
+    
+    @staticmethod
+    def _load_tables(path: Optional[str], language: str, kind: Optional[str]) -> Optional[CompiledTables]:
+        if not path or not os.path.exists(path):
+            return None
+        tables = CompiledTables.load(path)
+        if tables is not None and not tables.matches(language, kind):
+            logger.warning(f"Tables compilées ignorées ({path}): {tables.language}/{tables.kind}, "
+                           f"{language}/{kind} attendu")
+            return None
+        return tables
+    
+    @property
+    def lemma_cache(self) -> Optional[LemmaCache]:
+        reducer = self.lemmatizer or self.stemmer
+        return reducer.cache if reducer else None
+    
+    def fingerprint(self) -> str:
+        # Configuration effective : un lemmatiseur ou des stopwords indisponibles changent la sortie
+        config = {
+            'version': PIPELINE_VERSION,
+            'use_lemmatization': bool(self.lemmatizer and self.lemmatizer.available),
+            'use_stemming': bool(self.stemmer and self.stemmer.available),
+            'language': self.stop_words_filter.language,
+            'stop_words': hashlib.sha256(' '.join(sorted(self.stop_words_filter.stop_words)).encode('utf-8')).hexdigest()
+        }
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def compile_tables(self, articles: Iterable[Dict]) -> CompiledTables:
+        # Stopwords et lemmes (ou racines) du vocabulaire observé, figés pour les prochains démarrages
+        vocabulary = set()
+        for article in articles:
+            for text in (article.get('titre', ''), article.get('contenu', '')):
+                tokens = self.tokenizer.tokenize(self.normalizer.process(text))
+                vocabulary.update(self.stop_words_filter.filter(tokens))
+        
+        if self.lemmatizer:
+            kind, reduce = 'wordnet', self.lemmatizer.lemmatize
+        elif self.stemmer:
+            kind, reduce = 'porter', self.stemmer.stem
+        else:
+            kind, reduce = None, None
+        if reduce is not None and not (self.lemmatizer or self.stemmer).available:
+            raise ValueError(f"{kind} indisponible")
+        if not self.stop_words_filter.stop_words:
+            logger.warning("Tables compilées sans stopwords (NLTK stopwords indisponibles)")
+        
+        terms = sorted(vocabulary)
+        reductions = dict(zip(terms, reduce(terms))) if reduce is not None else {}
+        return CompiledTables(self.stop_words_filter.language, kind,
+                              frozenset(self.stop_words_filter.stop_words), reductions)
     
     def preprocess_text(self, text: str) -> List[str]:
         text = self.normalizer.process(text)
@@ -26,10 +109,16 @@ class TextPreprocessor:
         return tokens
     
     def preprocess_article(self, article: Dict) -> Dict:
-        titre_tokens = self.preprocess_text(article.get('titre', ''))
-        contenu_tokens = self.preprocess_text(article.get('contenu', ''))
+        cached = self.result_cache.get(article) if self.result_cache is not None else None
+        if cached:
+            titre_tokens, contenu_tokens = cached
+        else:
+            titre_tokens = self.preprocess_text(article.get('titre', ''))
+            contenu_tokens = self.preprocess_text(article.get('contenu', ''))
+            if self.result_cache is not None:
+                self.result_cache.put(article, titre_tokens, contenu_tokens)
         
-        return {
+        processed = {
             'source': article.get('source', ''),
             'url': article.get('url', ''),
             'titre': article.get('titre', ''),
@@ -41,3 +130,19 @@ class TextPreprocessor:
             'nb_tokens': len(contenu_tokens),
             'date_extraction': article.get('date_extraction', '')
         }
+        
+        # Sur le texte brut : la normalisation supprime URLs, emails et chiffres
+        if self.ioc_extractor is not None:
+            processed['iocs'] = self.ioc_extractor.extract(article.get('contenu', ''))
+        
+        if article.get('duplicate_of'):
+            processed['duplicate_of'] = article['duplicate_of']
+        
+        return processed
+    
+    def preprocess_stream(self, articles: Iterable[Dict]) -> Iterator[Dict]:
+        for i, article in enumerate(articles):
+            try:
+                yield self.preprocess_article(article)
+            except Exception as e:
+                logger.error(f"Erreur article {i+1}: {e}")
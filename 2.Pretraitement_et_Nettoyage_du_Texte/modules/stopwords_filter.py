@@ -1,13 +1,14 @@
-from typing import List
+from typing import FrozenSet, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 class StopWordsFilter:
-    def __init__(self, language: str = 'english'):
+    def __init__(self, language: str = 'english', stop_words: Optional[FrozenSet[str]] = None):
         self.language = language
-        self.stop_words = self._load_stop_words()
+        # Liste fournie (tables compilées) : pas d'import NLTK
+        self.stop_words = stop_words if stop_words is not None else self._load_stop_words()
     
     def _load_stop_words(self) -> set:
         try:
@@ -1,8 +1,15 @@
+import argparse
 import json
 import logging
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator
 from pathlib import Path
 from modules.preprocessor import TextPreprocessor
+from shared.article_io import iter_articles, articles_exist
+from modules.deduplicator import NearDuplicateDetector
+from modules.parallel import parallel_preprocess
+from modules.article_writer import ArticleWriter
+from shared.token_corpus import TokenCorpusWriter
+from modules.compiled_tables import CompiledTables
 
 logging.basicConfig(
     level=logging.INFO,
@@ -11,9 +18,21 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def process_articles(articles: List[Dict], preprocessor: TextPreprocessor) -> List[Dict]:
+def process_articles(articles: List[Dict], preprocessor: TextPreprocessor, workers: int = 1,
+                     chunk_size: int = 16) -> List[Dict]:
     processed = []
     
+    if workers > 1:
+        logger.info(f"Traitement parallèle: {workers} processus, lots de {chunk_size} articles")
+        for index, processed_article, error in parallel_preprocess(articles, preprocessor, workers, chunk_size):
+            if error is not None:
+                logger.error(f"Erreur article {index+1}: {error}")
+                continue
+            processed.append(processed_article)
+            if (index + 1) % chunk_size == 0 or index + 1 == len(articles):
+                logger.info(f"Traitement {index+1}/{len(articles)}")
+        return processed
+    
     for i, article in enumerate(articles):
         try:
             logger.info(f"Traitement {i+1}/{len(articles)}: {article.get('titre', '')[:50]}...")
@@ -26,28 +45,196 @@ def process_articles(articles: List[Dict], preprocessor: TextPreprocessor) -> Li
     return processed
 
 
+def stream_articles(articles: Iterable[Dict], preprocessor: TextPreprocessor, workers: int = 1,
+                    chunk_size: int = 16) -> Iterator[Dict]:
+    if workers <= 1:
+        yield from preprocessor.preprocess_stream(articles)
+        return
+    
+    for index, processed_article, error in parallel_preprocess(articles, preprocessor, workers, chunk_size):
+        if error is not None:
+            logger.error(f"Erreur article {index+1}: {error}")
+            continue
+        yield processed_article
+
+
+def run_stream(args, preprocessor: TextPreprocessor) -> None:
+    articles = iter_articles(args.input)
+    detector = None
+    if args.dedup != 'off':
+        logger.info(f"Détection des quasi-doublons (MinHash/LSH, mode={args.dedup})...")
+        detector = NearDuplicateDetector(str(args.dedup_index), threshold=args.dedup_threshold)
+        articles = detector.iter_deduplicate(articles, collapse=(args.dedup == 'collapse'))
+    
+    total_tokens = 0
+    min_tokens = max_tokens = None
+    logger.info(f"Traitement en flux: {args.input} -> {args.output}")
+    corpus = None if args.no_token_ids else TokenCorpusWriter(args.corpus_dir)
+    try:
+        with ArticleWriter(args.output) as writer:
+            for processed_article in stream_articles(articles, preprocessor, args.workers, args.chunk_size):
+                writer.write(processed_article)
+                if corpus is not None:
+                    corpus.write(processed_article)
+                nb_tokens = processed_article['nb_tokens']
+                total_tokens += nb_tokens
+                min_tokens = nb_tokens if min_tokens is None else min(min_tokens, nb_tokens)
+                max_tokens = nb_tokens if max_tokens is None else max(max_tokens, nb_tokens)
+                if writer.count % 100 == 0:
+                    logger.info(f"{writer.count} articles traités")
+    except BaseException:
+        if corpus is not None:
+            corpus.abort()
+        raise
+    
+    if detector is not None:
+        detector.save()
+    if corpus is not None:
+        corpus.close(args.output)
+        logger.info(f"Corpus d'identifiants: {args.corpus_dir} ({len(corpus.vocabulary)} termes)")
+    
+    logger.info(f"Terminé: {writer.count} articles")
+    if writer.count:
+        logger.info(f"Total tokens: {total_tokens}")
+        logger.info(f"Moyenne: {total_tokens / writer.count:.0f} tokens/article")
+        logger.info(f"Min: {min_tokens}")
+        logger.info(f"Max: {max_tokens}")
+
+
+def report_caches(preprocessor: TextPreprocessor, cache_size: int) -> None:
+    if preprocessor.result_cache is not None:
+        stats = preprocessor.result_cache.stats()
+        logger.info(f"Cache de prétraitement: {stats['hits']} articles inchangés, "
+                    f"{stats['misses']} traités ({stats['hit_rate']:.1%})")
+        preprocessor.result_cache.close()
+    
+    cache = preprocessor.lemma_cache
+    if cache is None or cache_size <= 0:
+        return
+    stats = cache.stats()
+    logger.info(f"Cache {stats['kind']}: {stats['hits']} hits / {stats['misses']} misses "
+                f"({stats['hit_rate']:.1%}), {stats['entries']} entrées")
+    cache.save()
+
+
+def write_token_corpus(articles: List[Dict], directory: Path, source: Path) -> None:
+    with TokenCorpusWriter(directory) as corpus:
+        for article in articles:
+            corpus.write(article)
+        corpus.close(source)
+    logger.info(f"Corpus d'identifiants: {directory} ({len(corpus.vocabulary)} termes)")
+
+
+def compile_tables(input_file: Path, tables_path: Path) -> None:
+    # Compilation avec NLTK ; les termes des tables existantes compatibles sont conservés
+    logger.info(f"Compilation des tables stopwords/lemmes depuis {input_file}")
+    preprocessor = TextPreprocessor(use_lemmatization=True, cache_size=0)
+    try:
+        tables = preprocessor.compile_tables(iter_articles(input_file))
+    except (ValueError, LookupError) as e:
+        logger.error(f"Compilation des tables impossible: {e}")
+        return
+    
+    previous = CompiledTables.load(str(tables_path)) if tables_path.exists() else None
+    if (previous is not None and previous.matches(tables.language, tables.kind)
+            and previous.stop_words == tables.stop_words):
+        tables.reductions = {**previous.reductions, **tables.reductions}
+    tables.save(str(tables_path))
+
+
+def deduplicate_articles(articles: List[Dict], mode: str, index_path: Path,
+                         threshold: float = 0.8) -> List[Dict]:
+    if mode == 'off':
+        return articles
+    
+    logger.info(f"Détection des quasi-doublons (MinHash/LSH, mode={mode})...")
+    detector = NearDuplicateDetector(str(index_path), threshold=threshold)
+    articles = detector.deduplicate(articles, collapse=(mode == 'collapse'))
+    detector.save()
+    return articles
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Prétraitement des articles collectés")
+    parser.add_argument('--input', type=Path, default=Path("../data/articles_cybersecurity.json"),
+                        help="Articles bruts (tableau JSON ou NDJSON)")
+    parser.add_argument('--output', type=Path, default=Path("../data/articles_preprocessed.json"))
+    parser.add_argument('--dedup', choices=['collapse', 'flag', 'off'], default='flag',
+                        help="Quasi-doublons: supprimer (collapse), marquer (flag, champ duplicate_of) ou ignorer")
+    parser.add_argument('--dedup-threshold', type=float, default=0.8,
+                        help="Similarité de Jaccard estimée à partir de laquelle deux articles sont des doublons")
+    parser.add_argument('--dedup-index', type=Path, default=Path("../data/dedup_index.pkl"))
+    parser.add_argument('--lemma-cache', type=Path, default=Path("../data/lemma_cache.json"),
+                        help="Cache persistant token -> lemme")
+    parser.add_argument('--lemma-cache-size', type=int, default=100000,
+                        help="Nombre maximal d'entrées du cache LRU (0 : pas de cache)")
+    parser.add_argument('--preprocess-cache', type=Path, default=Path("../data/preprocess_cache.sqlite"),
+                        help="Cache des tokens par contenu d'article (titre + contenu + configuration)")
+    parser.add_argument('--no-preprocess-cache', action='store_true',
+                        help="Retraiter tous les articles sans utiliser le cache")
+    parser.add_argument('--tables', type=Path, default=Path("../data/preprocess_tables.pkl"),
+                        help="Stopwords et lemmes précompilés : démarrage sans import NLTK")
+    parser.add_argument('--compile-tables', action='store_true',
+                        help="Compiler --tables à partir du vocabulaire de --input (NLTK requis) puis quitter")
+    parser.add_argument('--no-tables', action='store_true',
+                        help="Ignorer les tables compilées et charger NLTK")
+    parser.add_argument('--no-iocs', action='store_true',
+                        help="Ne pas extraire les indicateurs (CVE, IP, hashes, URLs, emails, domaines, versions)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processus de prétraitement (1 : traitement séquentiel)")
+    parser.add_argument('--chunk-size', type=int, default=16,
+                        help="Articles envoyés à un processus par lot")
+    parser.add_argument('--stream', action='store_true',
+                        help="Lecture, prétraitement et écriture article par article (mémoire bornée)")
+    parser.add_argument('--corpus-dir', type=Path, default=Path("../data/corpus"),
+                        help="Tokens en identifiants entiers (uint32) et vocabulaire partagé, lus par les étapes 3 et 4")
+    parser.add_argument('--no-token-ids', action='store_true',
+                        help="Ne pas écrire le corpus d'identifiants")
+    return parser.parse_args()
+
+
 def main():
-    input_file = Path("../data/articles_cybersecurity.json")
-    output_file = Path("../data/articles_preprocessed.json")
+    args = parse_args()
+    input_file = args.input
+    output_file = args.output
     
-    if not input_file.exists():
+    if not articles_exist(input_file):
         logger.error(f"Fichier {input_file} non trouvé")
         return
     
+    if args.compile_tables:
+        compile_tables(input_file, args.tables)
+        return
+    
+    result_cache_path = None if args.no_preprocess_cache else str(args.preprocess_cache)
+    tables_path = None if args.no_tables else str(args.tables)
+    preprocessor = TextPreprocessor(use_lemmatization=True, cache_size=args.lemma_cache_size,
+                                    cache_path=str(args.lemma_cache), result_cache_path=result_cache_path,
+                                    tables_path=tables_path, extract_iocs=not args.no_iocs)
+    
+    if args.stream:
+        run_stream(args, preprocessor)
+        report_caches(preprocessor, args.lemma_cache_size)
+        return
+    
     logger.info(f"Chargement depuis {input_file}")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        articles = json.load(f)
+    articles = list(iter_articles(input_file))
     
     logger.info(f"Articles: {len(articles)}")
     
-    preprocessor = TextPreprocessor(use_lemmatization=True)
-    processed_articles = process_articles(articles, preprocessor)
+    articles = deduplicate_articles(articles, args.dedup, args.dedup_index, args.dedup_threshold)
+    
+    processed_articles = process_articles(articles, preprocessor, args.workers, args.chunk_size)
+    report_caches(preprocessor, args.lemma_cache_size)
     
     logger.info(f"Sauvegarde dans {output_file}")
     output_file.parent.mkdir(parents=True, exist_ok=True)
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(processed_articles, f, ensure_ascii=False, indent=2)
     
+    if not args.no_token_ids:
+        write_token_corpus(processed_articles, args.corpus_dir, output_file)
+    
     logger.info(f"Terminé: {len(processed_articles)} articles")
     
     if processed_articles:
@@ -0,0 +1,37 @@
+import hashlib
+
+import numpy as np
+
+from modules.deduplicator import NearDuplicateDetector, MinHasher
+
+PRIME = (1 << 61) - 1
+
+
+def reference_signature(hasher, text):
+    # Entiers Python : aucun débordement possible
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little')
+              for s in hasher.shingles(text)]
+    return [min((int(a) * h + int(b)) % PRIME & 0xFFFFFFFF for h in hashes) for a, b in zip(hasher.a, hasher.b)]
+
+
+def test_signature_matches_exact_arithmetic():
+    hasher = MinHasher(num_perm=64, shingle_size=3)
+    text = 'LockBit ransomware operators exploited CVE-2024-1234 in Citrix appliances to deploy payloads'
+    assert hasher.signature(text).tolist() == reference_signature(hasher, text)
+
+
+def test_signature_with_largest_operands():
+    hasher = MinHasher(num_perm=4, shingle_size=1)
+    hasher.a = np.full(4, (1 << 32) - 1, dtype=np.uint64)
+    hasher.b = np.full(4, (1 << 32) - 1, dtype=np.uint64)
+    text = ' '.join(f'mot{i}' for i in range(200))
+    assert hasher.signature(text).tolist() == reference_signature(hasher, text)
+
+
+def test_flag_keeps_duplicates():
+    text = ' '.join(f'mot{i}' for i in range(100))
+    articles = [{'url': 'https://a', 'contenu': text}, {'url': 'https://b', 'contenu': text + ' fin'},
+                {'url': 'https://c', 'contenu': 'un tout autre article sur le phishing ciblé'}]
+    flagged = NearDuplicateDetector().deduplicate(articles)
+    assert [article.get('duplicate_of') for article in flagged] == [None, 'https://a', None]
+    assert len(NearDuplicateDetector().deduplicate(articles, collapse=True)) == 2
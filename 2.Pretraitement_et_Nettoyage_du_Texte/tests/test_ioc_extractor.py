@@ -0,0 +1,37 @@
+import re
+
+from modules.ioc_extractor import IOC_PATTERN, IOCExtractor
+
+
+def test_indicators_and_defanged_forms():
+    text = ('Patch CVE-2024-12345 now; C2 at 192[.]168.1.10 and hxxps://evil[.]com/payload.exe, '
+            'hash d41d8cd98f00b204e9800998ecf8427e, contact bob[at]corp[.]com, version 2.4.1.')
+    assert IOCExtractor().extract(text) == {
+        'cve': ['CVE-2024-12345'],
+        'ipv4': ['192.168.1.10'],
+        'url': ['https://evil.com/payload.exe'],
+        'md5': ['d41d8cd98f00b204e9800998ecf8427e'],
+        'email': ['bob@corp.com'],
+        'version': ['2.4.1']
+    }
+
+
+def test_upper_case_domains_and_emails():
+    assert IOCExtractor().extract("admin@Example.COM EXAMPLE.COM") == {
+        'email': ['admin@example.com'],
+        'domain': ['example.com']
+    }
+    assert IOCExtractor().extract("Block EVIL[.]COM and bad(.)RU") == {'domain': ['evil.com', 'bad.ru']}
+
+
+def test_words_joined_by_a_dot_are_not_domains():
+    assert IOCExtractor().extract("Ransomware attacks.This week, D.AMO encrypts data.") == {}
+
+
+def test_file_names_are_not_domains():
+    assert IOCExtractor().extract("It drops update.exe and PAYLOAD.DLL next to report.pdf") == {}
+
+
+def test_pattern_compiles_before_python_3_11():
+    # Quantificateurs possessifs (*+, ++, ?+, {m,n}+) : re.error avant Python 3.11
+    assert re.search(r'[*+?}]\+', IOC_PATTERN.pattern) is None
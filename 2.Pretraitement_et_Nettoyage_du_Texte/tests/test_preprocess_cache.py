@@ -0,0 +1,38 @@
+import sqlite3
+
+from modules.preprocess_cache import PreprocessCache
+
+
+def committed_rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_puts_are_committed_in_batches(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = PreprocessCache(path, 'config', commit_every=2)
+    articles = [{'titre': f'Article {i}', 'contenu': 'ransomware'} for i in range(3)]
+    for article in articles:
+        cache.put(article, ['article'], ['ransomware'])
+    
+    assert committed_rows(path) == 2
+    assert len(cache) == 3
+    assert cache.get(articles[2]) == (['article'], ['ransomware'])
+    cache.close()
+    assert committed_rows(path) == 3
+
+
+def test_entries_of_another_configuration_are_invalidated(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = PreprocessCache(path, 'config')
+    cache.put({'titre': 'a', 'contenu': 'b'}, ['a'], ['b'])
+    cache.close()
+    
+    assert len(PreprocessCache(path, 'config')) == 1
+    cache = PreprocessCache(path, 'other')
+    assert len(cache) == 0
+    assert cache.get({'titre': 'a', 'contenu': 'b'}) is None
+    assert cache.stats()['misses'] == 1
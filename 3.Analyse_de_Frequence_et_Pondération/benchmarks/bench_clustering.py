@@ -0,0 +1,54 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.tfidf_analyzer import TFIDFAnalyzer
+from modules.thematic_analyzer import ThematicAnalyzer
+from shared.article_io import iter_articles
+
+DEFAULT_INPUT = Path(__file__).resolve().parent.parent.parent / "data" / "articles_preprocessed.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark K-means complet vs MiniBatchKMeans par lots")
+    parser.add_argument('--input', type=Path, default=DEFAULT_INPUT)
+    parser.add_argument('--copies', type=int, default=300, help="Le corpus est répété pour simuler un historique")
+    parser.add_argument('--max-features', type=int, default=20000)
+    parser.add_argument('--batch-size', type=int, default=1024)
+    parser.add_argument('--n-clusters', type=int, default=5)
+    args = parser.parse_args()
+    
+    base = [article.get('contenu_tokens', []) for article in iter_articles(args.input)]
+    documents = [[f"{token}{copy % 10}" for token in tokens] for copy in range(args.copies) for tokens in base]
+    tfidf_matrix = TFIDFAnalyzer(max_features=args.max_features, min_df=2, max_df=0.8).fit_transform(documents)
+    keys = [str(i) for i in range(tfidf_matrix.shape[0])]
+    
+    print(f"Matrice: {tfidf_matrix.shape[0]} documents × {tfidf_matrix.shape[1]} termes")
+    print(f"{'mode':<28} {'temps (ms)':>11} {'inertie':>12}")
+    results = {}
+    for name, streaming in (('KMeans (n_init=10)', False), ('MiniBatchKMeans', True)):
+        thematic = ThematicAnalyzer(n_clusters=args.n_clusters, streaming=streaming, batch_size=args.batch_size)
+        start = time.perf_counter()
+        thematic.fit(tfidf_matrix, keys)
+        elapsed = time.perf_counter() - start
+        results[name] = thematic
+        print(f"{name:<28} {elapsed * 1000:>11.1f} {thematic.inertia:>12.2f}")
+    
+    # Mise à jour des centroïdes avec 1 % de nouveaux documents
+    split = tfidf_matrix.shape[0] - max(1, tfidf_matrix.shape[0] // 100)
+    thematic = ThematicAnalyzer(n_clusters=args.n_clusters, streaming=True, batch_size=args.batch_size)
+    thematic.fit(tfidf_matrix[:split], keys[:split])
+    start = time.perf_counter()
+    thematic.partial_fit(tfidf_matrix[split:], keys[split:])
+    elapsed = time.perf_counter() - start
+    print(f"{'partial_fit (1 % nouveaux)':<28} {elapsed * 1000:>11.1f} {thematic.inertia:>12.2f}")
+    
+    drift = results['MiniBatchKMeans'].assignment_drift(results['KMeans (n_init=10)'])
+    print(f"Dérive MiniBatchKMeans / KMeans: {drift['nb_changed']}/{drift['nb_common_documents']} ({drift['drift']:.1%})")
+
+
+if __name__ == "__main__":
+    main()
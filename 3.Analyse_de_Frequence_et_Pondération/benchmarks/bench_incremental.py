@@ -0,0 +1,50 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.tfidf_analyzer import TFIDFAnalyzer
+from modules.incremental_tfidf import IncrementalTFIDFAnalyzer
+from shared.article_io import iter_articles
+
+DEFAULT_INPUT = Path(__file__).resolve().parent.parent.parent / "data" / "articles_preprocessed.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TF-IDF complet vs incrémental (partial_fit du delta)")
+    parser.add_argument('--input', type=Path, default=DEFAULT_INPUT)
+    parser.add_argument('--copies', type=int, default=100, help="Le corpus est répété pour simuler l'historique")
+    parser.add_argument('--delta', type=int, default=50, help="Nouveaux articles du jour")
+    parser.add_argument('--hashing-features', type=int, default=0)
+    args = parser.parse_args()
+    
+    base = [article.get('contenu_tokens', []) for article in iter_articles(args.input)]
+    # Suffixe par copie : le vocabulaire grandit avec l'historique comme sur un vrai corpus
+    history = [[f"{token}{copy % 10}" for token in tokens] for copy in range(args.copies) for tokens in base]
+    delta = history[:args.delta]
+    keys = [str(i) for i in range(len(history))]
+    delta_keys = [f"new-{i}" for i in range(len(delta))]
+    
+    start = time.perf_counter()
+    TFIDFAnalyzer(min_df=2, max_df=0.8).fit_transform(history + delta)
+    full_time = time.perf_counter() - start
+    
+    analyzer = IncrementalTFIDFAnalyzer(min_df=2, max_df=0.8, n_features=args.hashing_features or None)
+    analyzer.partial_fit(history, keys=keys)
+    start = time.perf_counter()
+    analyzer.partial_fit(delta, keys=delta_keys)
+    analyzer.transform(delta)
+    delta_time = time.perf_counter() - start
+    
+    print(f"Historique: {len(history)} documents, delta: {len(delta)} documents, "
+          f"{analyzer.n_terms} termes")
+    print(f"{'mode':<28} {'temps (ms)':>11}")
+    print(f"{'fit_transform complet':<28} {full_time * 1000:>11.1f}")
+    print(f"{'partial_fit + transform':<28} {delta_time * 1000:>11.1f}")
+    print(f"Gain: {full_time / delta_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
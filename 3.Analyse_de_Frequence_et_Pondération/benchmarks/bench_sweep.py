@@ -0,0 +1,42 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.tfidf_analyzer import TFIDFAnalyzer
+from modules.cluster_sweep import sweep_cluster_counts
+from shared.article_io import iter_articles
+
+DEFAULT_INPUT = Path(__file__).resolve().parent.parent.parent / "data" / "articles_preprocessed.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la sélection de k : série vs pool, silhouette complète vs échantillon")
+    parser.add_argument('--input', type=Path, default=DEFAULT_INPUT)
+    parser.add_argument('--copies', type=int, default=200, help="Le corpus est répété pour simuler un historique")
+    parser.add_argument('--k-max', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--sample', type=int, default=1000)
+    args = parser.parse_args()
+    
+    base = [article.get('contenu_tokens', []) for article in iter_articles(args.input)]
+    documents = [[f"{token}{copy % 10}" for token in tokens] for copy in range(args.copies) for tokens in base]
+    tfidf_matrix = TFIDFAnalyzer(max_features=20000, min_df=2, max_df=0.8).fit_transform(documents)
+    k_values = list(range(2, args.k_max + 1))
+    
+    print(f"Matrice: {tfidf_matrix.shape[0]} documents × {tfidf_matrix.shape[1]} termes, k = 2..{args.k_max}, "
+          f"{os.cpu_count()} cœurs")
+    print(f"{'mode':<36} {'temps (s)':>10} {'meilleur k':>11}")
+    for name, workers, sample in (('série, silhouette complète', 1, tfidf_matrix.shape[0]),
+                                  ('série, silhouette échantillonnée', 1, args.sample),
+                                  (f'{args.workers} processus, échantillonnée', args.workers, args.sample)):
+        start = time.perf_counter()
+        best_k, _ = sweep_cluster_counts(tfidf_matrix, k_values, workers=workers, sample_size=sample)
+        print(f"{name:<36} {time.perf_counter() - start:>10.2f} {best_k:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from scipy import sparse
+
+from modules.keyword_extractor import KeywordExtractor
+
+
+def dense_loop(matrix, feature_names, top_n: int, discriminant: bool = False):
+    # Ancienne méthode : ligne densifiée, moyenne du corpus recalculée et tri du vocabulaire pour chaque document
+    results = []
+    for index in range(matrix.shape[0]):
+        doc_vector = matrix[index].toarray().flatten()
+        if discriminant:
+            doc_vector = doc_vector - np.asarray(matrix.mean(axis=0)).flatten()
+        top_indices = doc_vector.argsort()[-top_n:][::-1]
+        results.append([(feature_names[i], float(doc_vector[i])) for i in top_indices if doc_vector[i] > 0])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark top-k par document : boucle par document vs blocs de lignes")
+    parser.add_argument('--docs', type=int, default=2000)
+    parser.add_argument('--features', type=int, default=50000)
+    parser.add_argument('--terms-per-doc', type=int, default=300)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    matrix = sparse.random(args.docs, args.features, density=args.terms_per_doc / args.features,
+                           format='csr', random_state=rng)
+    # Poids arrondis : nombreux ex aequo, comme des termes de même fréquence et même df
+    matrix.data = np.round(matrix.data, 2)
+    feature_names = [f"t{i}" for i in range(args.features)]
+    extractor = KeywordExtractor(matrix, feature_names)
+    
+    start = time.perf_counter()
+    reference = (dense_loop(matrix, feature_names, 15), dense_loop(matrix, feature_names, 10, discriminant=True))
+    loop_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batch = (extractor.extract_all_document_keywords(15), extractor.get_all_discriminant_terms(10))
+    batch_time = time.perf_counter() - start
+    
+    mismatches = sum(1 for old, new in zip(reference[0] + reference[1], batch[0] + batch[1]) if old != new)
+    print(f"Matrice: {args.docs} documents × {args.features} termes, {matrix.nnz} valeurs non nulles")
+    print(f"{'méthode':<24} {'temps (ms)':>11}")
+    print(f"{'boucle par document':<24} {loop_time * 1000:>11.1f}")
+    print(f"{'blocs de lignes':<24} {batch_time * 1000:>11.1f}")
+    print(f"Gain: {loop_time / batch_time:.1f}x, sorties différentes: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.metrics import pairwise_distances, silhouette_score
+from threadpoolctl import threadpool_limits
+
+from .thematic_analyzer import ThematicAnalyzer
+
+logger = logging.getLogger(__name__)
+
+_worker_state = None
+
+
+class _SharedArrays:
+    # Tableaux numpy copiés une fois en mémoire partagée ; les workers les relisent sans copie ni pickle
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.blocks = {}
+        self.specs = {}
+        try:
+            for name, array in arrays.items():
+                block = SharedMemory(create=True, size=max(1, array.nbytes))
+                self.blocks[name] = block
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+                self.specs[name] = (block.name, array.shape, array.dtype.str)
+        except BaseException:
+            self.close()
+            raise
+    
+    def close(self) -> None:
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+
+def _attach(specs: Dict) -> Tuple[Dict[str, np.ndarray], List[SharedMemory]]:
+    arrays = {}
+    blocks = []
+    for name, (block_name, shape, dtype) in specs.items():
+        block = SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return arrays, blocks
+
+
+def _init_worker(specs: Dict, shape: Tuple[int, int], options: Dict, threads: int) -> None:
+    global _worker_state
+    arrays, blocks = _attach(specs)
+    matrix = sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']), shape=shape, copy=False)
+    # Un pool de N processus × N threads OpenMP/BLAS chacun saturerait les cœurs
+    limits = threadpool_limits(limits=threads)
+    _worker_state = {'matrix': matrix, 'sample': arrays['sample'], 'distances': arrays['distances'],
+                     'options': options, 'blocks': blocks, 'limits': limits}
+
+
+def _score_k(n_clusters: int, state: Optional[Dict] = None) -> Dict:
+    state = state or _worker_state
+    start = time.perf_counter()
+    thematic = ThematicAnalyzer(n_clusters=n_clusters, **state['options'])
+    labels = thematic.fit(state['matrix'])
+    
+    sample_labels = labels[state['sample']]
+    silhouette = None
+    if 1 < len(np.unique(sample_labels)) < len(sample_labels):
+        silhouette = float(silhouette_score(state['distances'], sample_labels, metric='precomputed'))
+    return {
+        'n_clusters': n_clusters,
+        'silhouette': silhouette,
+        'inertia': thematic.inertia,
+        'seconds': round(time.perf_counter() - start, 3)
+    }
+
+
+def sweep_cluster_counts(tfidf_matrix, k_values: List[int], workers: int = 1, sample_size: int = 2000,
+                         random_state: int = 42, streaming: bool = False,
+                         batch_size: int = 1024) -> Tuple[Optional[int], List[Dict]]:
+    # Meilleur k au sens de la silhouette, calculée sur un échantillon fixe de documents : la matrice
+    # de distances de l'échantillon est calculée une fois et partagée par tous les k
+    tfidf_matrix = sparse.csr_matrix(tfidf_matrix)
+    n_docs = tfidf_matrix.shape[0]
+    k_values = sorted({k for k in k_values if 2 <= k < n_docs})
+    if not k_values:
+        return None, []
+    
+    rng = np.random.default_rng(random_state)
+    sample = np.sort(rng.choice(n_docs, size=sample_size, replace=False)) if n_docs > sample_size else np.arange(n_docs)
+    distances = pairwise_distances(tfidf_matrix[sample], metric='euclidean')
+    options = {'random_state': random_state, 'streaming': streaming, 'batch_size': batch_size}
+    
+    if workers <= 1:
+        state = {'matrix': tfidf_matrix, 'sample': sample, 'distances': distances, 'options': options}
+        scores = [_score_k(k, state) for k in k_values]
+    else:
+        workers = min(workers, len(k_values))
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        shared = _SharedArrays({'data': tfidf_matrix.data, 'indices': tfidf_matrix.indices,
+                                'indptr': tfidf_matrix.indptr, 'sample': sample, 'distances': distances})
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.specs, tfidf_matrix.shape, options, threads)) as executor:
+                scores = list(executor.map(_score_k, k_values))
+        finally:
+            shared.close()
+    
+    scored = [score for score in scores if score['silhouette'] is not None]
+    # À silhouette égale, le plus petit k
+    best_k = max(scored, key=lambda score: (score['silhouette'], -score['n_clusters']))['n_clusters'] if scored else None
+    return best_k, scores
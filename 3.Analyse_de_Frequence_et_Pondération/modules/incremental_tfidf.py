@@ -0,0 +1,161 @@
+from numbers import Integral
+from typing import Dict, Iterable, List, Optional
+import json
+import logging
+import os
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 2
+# Longueur maximale du nom d'une colonne hachée (termes en collision séparés par '|')
+MAX_NAME_LENGTH = 64
+
+
+class IncrementalTFIDFAnalyzer:
+    def __init__(self, min_df: int = 2, max_df: float = 0.8, n_features: Optional[int] = None):
+        # n_features : hachage des termes, largeur de matrice fixe ; sinon vocabulaire en ajout seul.
+        # Dans les deux cas un terme garde sa colonne d'une mise à jour à l'autre. En hachage, aucun
+        # dictionnaire terme → colonne n'est conservé : les termes en collision partagent leur colonne
+        # (df et poids additionnés) et feature_names[colonne] les liste, tronqué à MAX_NAME_LENGTH.
+        self.min_df = min_df
+        self.max_df = max_df
+        self.n_features = n_features
+        self.vocabulary: Dict[str, int] = {}
+        self.feature_names: List[str] = [''] * n_features if n_features else []
+        self.df = np.zeros(n_features or 0, dtype=np.int64)
+        self.n_docs = 0
+        self.seen = set()
+        self._idf = None
+    
+    def _column(self, term: str, learn: bool) -> int:
+        if self.n_features:
+            column = murmurhash3_32(term, positive=True) % self.n_features
+            if learn:
+                self._name_column(column, term)
+            return column
+        self.feature_names.append(term)
+        return len(self.feature_names) - 1
+    
+    def _name_column(self, column: int, term: str) -> None:
+        name = self.feature_names[column]
+        if not name:
+            self.feature_names[column] = term[:MAX_NAME_LENGTH]
+        elif len(name) < MAX_NAME_LENGTH and term not in name.split('|'):
+            self.feature_names[column] = (name + '|' + term)[:MAX_NAME_LENGTH]
+    
+    @property
+    def n_terms(self) -> int:
+        # Colonnes occupées en mode hachage
+        return int(np.count_nonzero(self.df)) if self.n_features else len(self.feature_names)
+    
+    def _counts(self, documents: Iterable[List[str]], learn: bool) -> sparse.csr_matrix:
+        # En hachage, colonnes des termes de ce lot seulement
+        vocabulary = {} if self.n_features else self.vocabulary
+        indptr = [0]
+        indices = []
+        values = []
+        for tokens in documents:
+            counter = {}
+            for term in tokens:
+                column = vocabulary.get(term)
+                if column is None:
+                    if not learn and not self.n_features:
+                        continue
+                    column = self._column(term, learn)
+                    vocabulary[term] = column
+                counter[column] = counter.get(column, 0) + 1
+            indices.extend(counter)
+            values.extend(counter.values())
+            indptr.append(len(indices))
+        
+        n_columns = self.n_features or len(self.feature_names)
+        counts = sparse.csr_matrix((np.asarray(values, dtype=np.float64), np.asarray(indices, dtype=np.int64),
+                                    np.asarray(indptr, dtype=np.int64)), shape=(len(indptr) - 1, n_columns))
+        counts.sort_indices()
+        return counts
+    
+    def partial_fit(self, documents: List[List[str]], keys: Optional[List[str]] = None) -> 'IncrementalTFIDFAnalyzer':
+        # Seuls les nouveaux documents sont comptés ; l'IDF sera recalculé au prochain transform
+        if keys is not None:
+            new = [(key, tokens) for key, tokens in zip(keys, documents) if key not in self.seen]
+            self.seen.update(key for key, _ in new)
+            documents = [tokens for _, tokens in new]
+        
+        counts = self._counts(documents, learn=True)
+        if len(self.df) < counts.shape[1]:
+            self.df = np.concatenate([self.df, np.zeros(counts.shape[1] - len(self.df), dtype=np.int64)])
+        self.df += np.bincount(counts.indices, minlength=len(self.df))
+        self.n_docs += counts.shape[0]
+        self._idf = None
+        return self
+    
+    @property
+    def idf_(self) -> np.ndarray:
+        if self._idf is None:
+            n_docs = self.n_docs
+            high = self.max_df if isinstance(self.max_df, Integral) else self.max_df * n_docs
+            low = self.min_df if isinstance(self.min_df, Integral) else self.min_df * n_docs
+            # Même lissage que TfidfVectorizer ; les termes hors [min_df, max_df] ont un poids nul
+            idf = np.log((1.0 + n_docs) / (1.0 + self.df)) + 1.0
+            idf[(self.df < max(low, 1)) | (self.df > high)] = 0.0
+            self._idf = idf
+        return self._idf
+    
+    def transform(self, documents: List[List[str]]) -> sparse.csr_matrix:
+        counts = self._counts(documents, learn=False)
+        idf = self.idf_
+        if counts.shape[1] > len(idf):
+            idf = np.concatenate([idf, np.zeros(counts.shape[1] - len(idf))])
+        counts.data *= idf[counts.indices]
+        counts.eliminate_zeros()
+        return normalize(counts, norm='l2', copy=False)
+    
+    def partial_fit_transform(self, documents: List[List[str]]) -> sparse.csr_matrix:
+        return self.partial_fit(documents).transform(documents)
+    
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        state = {
+            'version': STATE_VERSION,
+            'min_df': self.min_df,
+            'max_df': self.max_df,
+            'n_features': self.n_features,
+            'n_docs': self.n_docs,
+            'feature_names': None if self.n_features else self.feature_names,
+            'column_names': [[column, name] for column, name in enumerate(self.feature_names) if name]
+                            if self.n_features else None,
+            'seen': sorted(self.seen)
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, df=self.df, state=np.array(json.dumps(state, ensure_ascii=False)))
+        os.replace(tmp_path, path)
+        logger.info(f"État TF-IDF sauvegardé: {path} ({self.n_docs} documents, {self.n_terms} termes)")
+    
+    @classmethod
+    def load(cls, path: str) -> 'IncrementalTFIDFAnalyzer':
+        with np.load(path, allow_pickle=False) as data:
+            state = json.loads(str(data['state']))
+            df = data['df']
+        if state['version'] != STATE_VERSION:
+            raise ValueError(f"Version d'état TF-IDF non supportée: {state['version']}")
+        
+        analyzer = cls(min_df=state['min_df'], max_df=state['max_df'], n_features=state['n_features'])
+        if analyzer.n_features:
+            for column, name in state['column_names']:
+                analyzer.feature_names[column] = name
+        else:
+            analyzer.feature_names = state['feature_names']
+            analyzer.vocabulary = {term: column for column, term in enumerate(analyzer.feature_names)}
+        analyzer.df = df
+        analyzer.n_docs = state['n_docs']
+        analyzer.seen = set(state['seen'])
+        logger.info(f"État TF-IDF chargé: {path} ({analyzer.n_docs} documents, {analyzer.n_terms} termes)")
+        return analyzer
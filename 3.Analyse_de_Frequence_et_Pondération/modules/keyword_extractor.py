@@ -1,37 +1,48 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import numpy as np
+from .sparse_topk import top_k_per_row
 
 
 class KeywordExtractor:
-    def __init__(self, tfidf_matrix: np.ndarray, feature_names: List[str]):
+    def __init__(self, tfidf_matrix: np.ndarray, feature_names: List[str], mean_tfidf: Optional[np.ndarray] = None):
+        # mean_tfidf : moyenne d'un corpus de référence (modèle sauvegardé) au lieu de celle de tfidf_matrix
         self.tfidf_matrix = tfidf_matrix
         self.feature_names = feature_names
+        self._mean = mean_tfidf
+    
+    def _mean_tfidf(self) -> np.ndarray:
+        # Moyenne du corpus calculée une seule fois, partagée par tous les documents
+        if self._mean is None:
+            self._mean = np.asarray(self.tfidf_matrix.mean(axis=0)).flatten()
+        return self._mean
+    
+    def _terms(self, top: List[Tuple[int, float]]) -> List[Tuple[str, float]]:
+        return [(self.feature_names[i], score) for i, score in top]
     
     def extract_document_keywords(self, doc_index: int, top_n: int = 15) -> List[Tuple[str, float]]:
-        doc_vector = self.tfidf_matrix[doc_index].toarray().flatten()
-        top_indices = doc_vector.argsort()[-top_n:][::-1]
-        return [(self.feature_names[i], float(doc_vector[i])) for i in top_indices if doc_vector[i] > 0]
+        return self._terms(top_k_per_row(self.tfidf_matrix[doc_index], top_n)[0])
+    
+    def extract_all_document_keywords(self, top_n: int = 15) -> List[List[Tuple[str, float]]]:
+        return [self._terms(top) for top in top_k_per_row(self.tfidf_matrix, top_n)]
     
     def extract_corpus_keywords(self, top_n: int = 30) -> List[Tuple[str, float]]:
-        mean_tfidf = np.asarray(self.tfidf_matrix.mean(axis=0)).flatten()
+        mean_tfidf = self._mean_tfidf()
         top_indices = mean_tfidf.argsort()[-top_n:][::-1]
         return [(self.feature_names[i], float(mean_tfidf[i])) for i in top_indices]
     
     def get_discriminant_terms(self, doc_index: int, top_n: int = 10) -> List[Tuple[str, float]]:
-        doc_vector = self.tfidf_matrix[doc_index].toarray().flatten()
-        mean_vector = np.asarray(self.tfidf_matrix.mean(axis=0)).flatten()
-        
-        discrimination_score = doc_vector - mean_vector
-        top_indices = discrimination_score.argsort()[-top_n:][::-1]
-        
-        return [(self.feature_names[i], float(discrimination_score[i])) 
-                for i in top_indices if discrimination_score[i] > 0]
+        return self._terms(top_k_per_row(self.tfidf_matrix[doc_index], top_n, shift=self._mean_tfidf())[0])
+    
+    def get_all_discriminant_terms(self, top_n: int = 10) -> List[List[Tuple[str, float]]]:
+        return [self._terms(top) for top in top_k_per_row(self.tfidf_matrix, top_n, shift=self._mean_tfidf())]
     
     def analyze_all_documents(self, articles: List[Dict], top_n: int = 15) -> List[Dict]:
         results = []
+        all_keywords = self.extract_all_document_keywords(top_n)
+        all_discriminant = self.get_all_discriminant_terms(10)
         for i, article in enumerate(articles):
-            keywords = self.extract_document_keywords(i, top_n)
-            discriminant = self.get_discriminant_terms(i, 10)
+            keywords = all_keywords[i]
+            discriminant = all_discriminant[i]
             
             results.append({
                 'doc_index': i,
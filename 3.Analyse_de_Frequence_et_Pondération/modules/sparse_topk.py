@@ -0,0 +1,30 @@
+from typing import List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+
+# Nombre maximal de cases de la matrice de travail (lignes × termes), soit 32 Mo en float64
+BLOCK_SIZE = 1 << 22
+
+
+def top_k_per_row(matrix, top_n: int, shift: Optional[np.ndarray] = None,
+                  block_size: int = BLOCK_SIZE) -> List[List[Tuple[int, float]]]:
+    # Top-k des scores strictement positifs de chaque ligne, identique à l'ancienne boucle par document
+    # (row.argsort()[-top_n:][::-1]) y compris l'ordre des ex aequo : celui-ci dépend du tri non stable
+    # de numpy sur la ligne entière, il faut donc trier les lignes densifiées. Les lignes sont traitées
+    # par blocs (un seul argsort par bloc) et la moyenne (shift) n'est pas recalculée par document.
+    matrix = sparse.csr_matrix(matrix)
+    n_rows, n_columns = matrix.shape
+    results = []
+    if top_n <= 0:
+        return [[] for _ in range(n_rows)]
+    
+    step = max(1, block_size // max(1, n_columns))
+    for first in range(0, n_rows, step):
+        block = matrix[first:first + step].toarray()
+        if shift is not None:
+            block = block - shift
+        order = np.argsort(block, axis=1)[:, :-top_n - 1:-1]
+        scores = np.take_along_axis(block, order, axis=1)
+        for columns, row_scores in zip(order.tolist(), scores.tolist()):
+            results.append([(column, score) for column, score in zip(columns, row_scores) if score > 0])
+    return results
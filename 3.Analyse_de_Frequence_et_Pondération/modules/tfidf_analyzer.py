@@ -1,6 +1,20 @@
+from numbers import Integral
+from pathlib import Path
 from typing import List, Dict, Tuple
+import json
+import logging
+import os
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer, TfidfTransformer
+from shared.token_corpus import TokenCorpus
+from .sparse_topk import top_k_per_row
+
+logger = logging.getLogger(__name__)
+
+MODEL_VERSION = 1
+MODEL_FILE = 'tfidf.npz'
+MATRIX_FILE = 'matrix.npz'
 
 
 class TFIDFAnalyzer:
@@ -16,20 +30,78 @@ class TFIDFAnalyzer:
         )
         self.tfidf_matrix = None
         self.feature_names = None
-        
+        self.mean_tfidf = None
+    
     def fit_transform(self, documents: List[List[str]]) -> np.ndarray:
         self.tfidf_matrix = self.vectorizer.fit_transform(documents)
         self.feature_names = self.vectorizer.get_feature_names_out()
         return self.tfidf_matrix
     
+    def transform(self, documents: List[List[str]]) -> np.ndarray:
+        if self.feature_names is None:
+            raise ValueError("Must call fit_transform first")
+        return self.vectorizer.transform(documents)
+    
+    def fit_transform_ids(self, corpus: TokenCorpus) -> np.ndarray:
+        # Même matrice que fit_transform sur les tokens décodés, sans re-hacher les chaînes
+        n_docs = len(corpus)
+        rows = np.repeat(np.arange(n_docs), np.diff(corpus.offsets))
+        counts = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, np.asarray(corpus.ids, dtype=np.int64))),
+            shape=(n_docs, len(corpus.terms))
+        )
+        
+        # Colonnes dans l'ordre alphabétique des termes, comme CountVectorizer
+        order = sorted(range(len(corpus.terms)), key=corpus.terms.__getitem__)
+        counts = counts[:, order]
+        counts, kept = self._limit_features(counts, n_docs)
+        terms = [corpus.terms[order[i]] for i in kept]
+        
+        params = self.vectorizer.get_params()
+        transformer = TfidfTransformer(norm=params['norm'], use_idf=params['use_idf'],
+                                       smooth_idf=params['smooth_idf'], sublinear_tf=params['sublinear_tf'])
+        self.tfidf_matrix = transformer.fit_transform(counts)
+        
+        # Le vectoriseur est ajusté comme après fit_transform : transform() reste utilisable
+        self.vectorizer.vocabulary_ = {term: i for i, term in enumerate(terms)}
+        self.vectorizer.fixed_vocabulary_ = False
+        if params['use_idf']:
+            self.vectorizer.idf_ = transformer.idf_
+        self.feature_names = self.vectorizer.get_feature_names_out()
+        return self.tfidf_matrix
+    
+    def _limit_features(self, counts, n_docs: int) -> Tuple[sparse.csr_matrix, np.ndarray]:
+        # Élagage de CountVectorizer (méthode privée de scikit-learn, absente des paramètres publics) :
+        # df dans [min_df, max_df] (entier = nombre de documents, réel = proportion), puis les max_features
+        # termes de plus grande fréquence totale, ex aequo départagés par le même argsort que scikit-learn.
+        # tests/test_tfidf_analyzer.py vérifie l'équivalence avec fit_transform sur la version installée.
+        params = self.vectorizer.get_params()
+        max_df, min_df, limit = params['max_df'], params['min_df'], params['max_features']
+        high = max_df if isinstance(max_df, Integral) else max_df * n_docs
+        low = min_df if isinstance(min_df, Integral) else min_df * n_docs
+        if high < low:
+            raise ValueError("max_df corresponds to < documents than min_df")
+        
+        dfs = np.bincount(counts.indices, minlength=counts.shape[1])
+        mask = (dfs > 0) & (dfs <= high) & (dfs >= low)
+        if limit is not None and mask.sum() > limit:
+            tfs = np.asarray(counts.sum(axis=0)).ravel()
+            mask_inds = (-tfs[mask]).argsort()[:limit]
+            new_mask = np.zeros(len(dfs), dtype=bool)
+            new_mask[np.where(mask)[0][mask_inds]] = True
+            mask = new_mask
+        
+        kept = np.where(mask)[0]
+        if len(kept) == 0:
+            raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+        return counts[:, kept], kept
+    
     def get_top_terms_per_document(self, doc_index: int, top_n: int = 10) -> List[Tuple[str, float]]:
         if self.tfidf_matrix is None:
             raise ValueError("Must call fit_transform first")
         
-        doc_vector = self.tfidf_matrix[doc_index].toarray().flatten()
-        top_indices = doc_vector.argsort()[-top_n:][::-1]
-        
-        return [(self.feature_names[i], doc_vector[i]) for i in top_indices if doc_vector[i] > 0]
+        top = top_k_per_row(self.tfidf_matrix[doc_index], top_n)[0]
+        return [(self.feature_names[i], score) for i, score in top]
     
     def get_top_terms_corpus(self, top_n: int = 20) -> List[Tuple[str, float]]:
         if self.tfidf_matrix is None:
@@ -41,11 +113,66 @@ class TFIDFAnalyzer:
         return [(self.feature_names[i], mean_tfidf[i]) for i in top_indices]
     
     def get_document_keywords(self, documents: List[List[str]], top_n: int = 10) -> List[Dict]:
+        if self.tfidf_matrix is None:
+            raise ValueError("Must call fit_transform first")
+        
         results = []
-        for i in range(len(documents)):
-            keywords = self.get_top_terms_per_document(i, top_n)
+        for i, top in enumerate(top_k_per_row(self.tfidf_matrix[:len(documents)], top_n)):
+            keywords = [(self.feature_names[j], score) for j, score in top]
             results.append({
                 'doc_index': i,
                 'keywords': keywords
             })
         return results
+    
+    def save(self, directory: Path) -> None:
+        if self.tfidf_matrix is None:
+            raise ValueError("Must call fit_transform first")
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        
+        params = self.vectorizer.get_params()
+        state = {
+            'version': MODEL_VERSION,
+            'params': {name: params[name] for name in ('max_features', 'min_df', 'max_df', 'norm', 'use_idf',
+                                                      'smooth_idf', 'sublinear_tf')},
+            'feature_names': [str(term) for term in self.feature_names]
+        }
+        # Moyenne du corpus conservée : les termes discriminants d'un nouvel article se calculent sans la matrice
+        mean_tfidf = np.asarray(self.tfidf_matrix.mean(axis=0)).flatten()
+        idf = self.vectorizer.idf_ if params['use_idf'] else np.empty(0)
+        tmp_path = directory / (MODEL_FILE + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, idf=idf, mean_tfidf=mean_tfidf, state=np.array(json.dumps(state, ensure_ascii=False)))
+        os.replace(tmp_path, directory / MODEL_FILE)
+        
+        tmp_path = directory / (MATRIX_FILE + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            sparse.save_npz(f, sparse.csr_matrix(self.tfidf_matrix), compressed=False)
+        os.replace(tmp_path, directory / MATRIX_FILE)
+        logger.info(f"Modèle TF-IDF sauvegardé: {directory} ({self.tfidf_matrix.shape[0]} documents, "
+                    f"{len(self.feature_names)} termes)")
+    
+    @classmethod
+    def load(cls, directory: Path, load_matrix: bool = True) -> 'TFIDFAnalyzer':
+        directory = Path(directory)
+        with np.load(directory / MODEL_FILE, allow_pickle=False) as data:
+            state = json.loads(str(data['state']))
+            idf = data['idf']
+            mean_tfidf = data['mean_tfidf']
+        if state['version'] != MODEL_VERSION:
+            raise ValueError(f"Version de modèle TF-IDF non supportée: {state['version']}")
+        
+        params = state['params']
+        analyzer = cls(max_features=params['max_features'], min_df=params['min_df'], max_df=params['max_df'])
+        analyzer.vectorizer.set_params(norm=params['norm'], use_idf=params['use_idf'],
+                                       smooth_idf=params['smooth_idf'], sublinear_tf=params['sublinear_tf'])
+        analyzer.vectorizer.vocabulary_ = {term: i for i, term in enumerate(state['feature_names'])}
+        analyzer.vectorizer.fixed_vocabulary_ = False
+        if params['use_idf']:
+            analyzer.vectorizer.idf_ = idf
+        analyzer.feature_names = analyzer.vectorizer.get_feature_names_out()
+        analyzer.mean_tfidf = mean_tfidf
+        if load_matrix:
+            analyzer.tfidf_matrix = sparse.load_npz(directory / MATRIX_FILE)
+        return analyzer
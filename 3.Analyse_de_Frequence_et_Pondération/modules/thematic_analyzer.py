@@ -1,21 +1,144 @@
-from typing import List, Dict, Tuple
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+import json
+import logging
+import os
 import numpy as np
-from sklearn.cluster import KMeans
+from scipy import sparse
+from scipy.optimize import linear_sum_assignment
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import pairwise_distances_argmin_min
 from collections import Counter
 
+logger = logging.getLogger(__name__)
+
+CLUSTERS_VERSION = 2
+CLUSTERS_FILE = 'clusters.npz'
+
 
 class ThematicAnalyzer:
-    def __init__(self, n_clusters: int = 5, random_state: int = 42):
+    def __init__(self, n_clusters: int = 5, random_state: int = 42, streaming: bool = False,
+                 batch_size: int = 1024, max_passes: int = 10):
+        # streaming : MiniBatchKMeans alimenté par tranches de batch_size lignes (partial_fit),
+        # au plus max_passes passages sur la matrice
+        if batch_size < 1:
+            raise ValueError(f"batch_size doit être positif: {batch_size}")
         self.n_clusters = n_clusters
-        self.kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
+        self.random_state = random_state
+        self.streaming = streaming
+        self.batch_size = batch_size
+        self.max_passes = max_passes
+        if streaming:
+            self.kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, batch_size=batch_size)
+        else:
+            self.kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
         self.labels = None
         self.cluster_centers = None
+        self.counts = None
+        self.keys = None
+        self.inertia = None
+    
+    def _chunks(self, tfidf_matrix, first_size: int = 0):
+        # first_size : taille minimale de la première tranche (MiniBatchKMeans s'initialise sur au moins
+        # n_clusters lignes, même si batch_size est plus petit)
+        start = 0
+        size = max(self.batch_size, first_size)
+        while start < tfidf_matrix.shape[0]:
+            yield tfidf_matrix[start:start + size]
+            start += size
+            size = self.batch_size
     
-    def fit(self, tfidf_matrix: np.ndarray) -> np.ndarray:
-        self.labels = self.kmeans.fit_predict(tfidf_matrix)
-        self.cluster_centers = self.kmeans.cluster_centers_
+    def _assign(self, tfidf_matrix) -> Tuple[np.ndarray, float]:
+        labels = []
+        inertia = 0.0
+        for chunk in self._chunks(tfidf_matrix):
+            chunk_labels, distances = pairwise_distances_argmin_min(chunk, self.cluster_centers)
+            labels.append(chunk_labels)
+            inertia += float(np.dot(distances, distances))
+        return np.concatenate(labels) if labels else np.empty(0, dtype=np.int64), inertia
+    
+    def fit(self, tfidf_matrix: np.ndarray, keys: Optional[List[str]] = None) -> np.ndarray:
+        if self.streaming:
+            for _ in range(self.max_passes):
+                previous = getattr(self.kmeans, 'cluster_centers_', None)
+                previous = None if previous is None else previous.copy()
+                for chunk in self._chunks(tfidf_matrix, self.n_clusters):
+                    self.kmeans.partial_fit(chunk)
+                if previous is not None and np.allclose(previous, self.kmeans.cluster_centers_, atol=1e-6):
+                    break
+            self.cluster_centers = self.kmeans.cluster_centers_
+            self.labels, self.inertia = self._assign(tfidf_matrix)
+        else:
+            self.labels = self.kmeans.fit_predict(tfidf_matrix)
+            self.cluster_centers = self.kmeans.cluster_centers_
+            self.inertia = float(self.kmeans.inertia_)
+        self.counts = np.bincount(self.labels, minlength=self.n_clusters)
+        self.keys = list(keys) if keys is not None else None
         return self.labels
     
+    def partial_fit(self, tfidf_matrix, keys: Optional[List[str]] = None) -> np.ndarray:
+        # Mise à jour des centroïdes existants avec de nouveaux articles. Chaque centroïde entre dans le
+        # premier lot comme un point pondéré par le nombre de documents qu'il résume : les nouveaux
+        # articles le déplacent d'autant moins qu'il est établi.
+        if self.cluster_centers is None:
+            return self.fit(tfidf_matrix, keys)
+        
+        # Articles déjà résumés par les centroïdes (même clé) : affectés mais ni recomptés ni réappris
+        fresh = list(range(tfidf_matrix.shape[0]))
+        if keys is not None and self.keys is not None:
+            known = set(self.keys)
+            fresh = []
+            for index, key in enumerate(keys):
+                if key not in known:
+                    known.add(key)
+                    fresh.append(index)
+        new_matrix = tfidf_matrix[fresh]
+        
+        if new_matrix.shape[0]:
+            kmeans = MiniBatchKMeans(n_clusters=self.n_clusters, init=self.cluster_centers, n_init=1,
+                                     random_state=self.random_state, batch_size=self.batch_size)
+            for index, chunk in enumerate(self._chunks(new_matrix)):
+                if index == 0:
+                    chunk = sparse.vstack([sparse.csr_matrix(self.cluster_centers), chunk], format='csr')
+                    weights = np.concatenate([np.maximum(self.counts, 1), np.ones(chunk.shape[0] - self.n_clusters)])
+                    kmeans.partial_fit(chunk, sample_weight=weights)
+                else:
+                    kmeans.partial_fit(chunk)
+            self.cluster_centers = kmeans.cluster_centers_
+        
+        labels, self.inertia = self._assign(tfidf_matrix)
+        new_labels = labels[fresh]
+        self.labels = new_labels if self.labels is None else np.concatenate([self.labels, new_labels])
+        self.counts = self.counts + np.bincount(new_labels, minlength=self.n_clusters)
+        if self.keys is not None and keys is not None:
+            self.keys.extend(keys[index] for index in fresh)
+        else:
+            self.keys = None
+        return labels
+    
+    def predict(self, tfidf_matrix: np.ndarray) -> np.ndarray:
+        # Centroïde le plus proche, comme KMeans.predict ; utilisable après load()
+        if self.cluster_centers is None:
+            raise ValueError("Must call fit first")
+        return self._assign(tfidf_matrix)[0]
+    
+    def assignment_drift(self, previous: 'ThematicAnalyzer') -> Optional[Dict]:
+        # Documents communs aux deux runs (même clé) dont le cluster a changé. Les numéros de clusters
+        # de deux K-means indépendants sont arbitraires : ils sont d'abord appariés au mieux.
+        if self.keys is None or previous.keys is None:
+            return None
+        previous_labels = dict(zip(previous.keys, previous.labels.tolist()))
+        pairs = [(previous_labels[key], label) for key, label in zip(self.keys, self.labels.tolist())
+                 if key in previous_labels]
+        if not pairs:
+            return None
+        
+        contingency = np.zeros((previous.n_clusters, self.n_clusters), dtype=np.int64)
+        np.add.at(contingency, tuple(np.array(pairs).T), 1)
+        rows, columns = linear_sum_assignment(contingency, maximize=True)
+        nb_changed = len(pairs) - int(contingency[rows, columns].sum())
+        return {'nb_common_documents': len(pairs), 'nb_changed': nb_changed, 'drift': nb_changed / len(pairs)}
+    
     def get_cluster_distribution(self) -> Dict[int, int]:
         if self.labels is None:
             raise ValueError("Must call fit first")
@@ -57,9 +180,50 @@ class ThematicAnalyzer:
         for cluster_id in range(self.n_clusters):
             summary.append({
                 'cluster_id': cluster_id,
-                'nb_documents': distribution[cluster_id],
+                'nb_documents': distribution.get(cluster_id, 0),
                 'top_terms': cluster_terms[cluster_id],
                 'documents': document_clusters[cluster_id]
             })
         
         return summary
+    
+    def save(self, directory: Path) -> None:
+        if self.cluster_centers is None:
+            raise ValueError("Must call fit first")
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        
+        state = {
+            'version': CLUSTERS_VERSION,
+            'n_clusters': self.n_clusters,
+            'random_state': self.random_state,
+            'streaming': self.streaming,
+            'batch_size': self.batch_size,
+            'inertia': self.inertia,
+            'keys': self.keys
+        }
+        tmp_path = directory / (CLUSTERS_FILE + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, cluster_centers=self.cluster_centers, labels=self.labels, counts=self.counts,
+                     state=np.array(json.dumps(state, ensure_ascii=False)))
+        os.replace(tmp_path, directory / CLUSTERS_FILE)
+        logger.info(f"Centroïdes sauvegardés: {directory / CLUSTERS_FILE} ({self.n_clusters} clusters)")
+    
+    @classmethod
+    def load(cls, directory: Path) -> 'ThematicAnalyzer':
+        with np.load(Path(directory) / CLUSTERS_FILE, allow_pickle=False) as data:
+            state = json.loads(str(data['state']))
+            if state['version'] != CLUSTERS_VERSION:
+                raise ValueError(f"Version de centroïdes non supportée: {state['version']}")
+            cluster_centers = data['cluster_centers']
+            labels = data['labels']
+            counts = data['counts']
+        
+        thematic = cls(n_clusters=state['n_clusters'], random_state=state['random_state'],
+                       streaming=state['streaming'], batch_size=state['batch_size'])
+        thematic.cluster_centers = cluster_centers
+        thematic.labels = labels
+        thematic.counts = counts
+        thematic.keys = state['keys']
+        thematic.inertia = state['inertia']
+        return thematic
@@ -1,10 +1,16 @@
+import argparse
 import json
 import logging
+import time
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from modules.tfidf_analyzer import TFIDFAnalyzer
 from modules.keyword_extractor import KeywordExtractor
-from modules.thematic_analyzer import ThematicAnalyzer
+from modules.thematic_analyzer import ThematicAnalyzer, CLUSTERS_FILE
+from shared.article_io import iter_articles, articles_exist
+from shared.token_corpus import TokenCorpus
+from modules.incremental_tfidf import IncrementalTFIDFAnalyzer
+from modules.cluster_sweep import sweep_cluster_counts
 
 logging.basicConfig(
     level=logging.INFO,
@@ -13,10 +19,36 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def load_preprocessed_articles(file_path: Path) -> List[Dict]:
-    logger.info(f"Chargement depuis {file_path}")
-    with open(file_path, 'r', encoding='utf-8') as f:
-        articles = json.load(f)
+# Champs lus dans le corpus en colonnes : ni contenu_original ni tokens texte
+ARTICLE_COLUMNS = ['titre', 'source', 'url', 'nb_tokens']
+
+
+def read_token_corpus(corpus_dir: Path) -> Optional[TokenCorpus]:
+    if not TokenCorpus.exists(corpus_dir):
+        return None
+    try:
+        return TokenCorpus(corpus_dir)
+    except (OSError, ValueError, KeyError) as e:
+        # Ex: corpus version 1 (identifiants seuls) écrit avant le format en colonnes
+        logger.warning(f"Corpus en colonnes illisible, ignoré ({corpus_dir}): {e}")
+        return None
+
+
+def open_columnar_corpus(input_path: Path, corpus_dir: Path) -> Optional[TokenCorpus]:
+    # --input peut désigner directement le corpus en colonnes
+    if input_path.is_dir():
+        return read_token_corpus(input_path)
+    corpus = read_token_corpus(corpus_dir)
+    return corpus if corpus is not None and corpus.describes(input_path) else None
+
+
+def load_preprocessed_articles(file_path: Path, corpus: Optional[TokenCorpus] = None) -> List[Dict]:
+    if corpus is not None:
+        logger.info(f"Chargement depuis {corpus.directory} (colonnes: {', '.join(ARTICLE_COLUMNS)})")
+        articles = corpus.articles(ARTICLE_COLUMNS)
+    else:
+        logger.info(f"Chargement depuis {file_path}")
+        articles = list(iter_articles(file_path))
     logger.info(f"Articles chargés: {len(articles)}")
     return articles
 
@@ -32,10 +64,25 @@ def extract_tokens(articles: List[Dict]) -> List[List[str]]:
     return documents
 
 
-def analyze_tfidf(articles: List[Dict], documents: List[List[str]]) -> tuple:
+def load_token_corpus(corpus_dir: Path, articles: List[Dict]) -> Optional[TokenCorpus]:
+    corpus = read_token_corpus(corpus_dir)
+    if corpus is None:
+        return None
+    if not corpus.matches(articles):
+        logger.warning(f"Corpus d'identifiants {corpus_dir} périmé, utilisation des tokens texte")
+        return None
+    logger.info(f"Corpus d'identifiants: {len(corpus.terms)} termes, {corpus.manifest['nb_tokens']} tokens")
+    return corpus
+
+
+def analyze_tfidf(articles: List[Dict], documents: Optional[List[List[str]]],
+                  corpus: Optional[TokenCorpus] = None) -> tuple:
     logger.info("Calcul TF-IDF...")
     analyzer = TFIDFAnalyzer(max_features=1000, min_df=2, max_df=0.8)
-    tfidf_matrix = analyzer.fit_transform(documents)
+    if corpus is not None:
+        tfidf_matrix = analyzer.fit_transform_ids(corpus)
+    else:
+        tfidf_matrix = analyzer.fit_transform(documents)
     
     logger.info(f"Matrice TF-IDF: {tfidf_matrix.shape[0]} documents × {tfidf_matrix.shape[1]} termes")
     logger.info(f"Densité: {(tfidf_matrix.nnz / (tfidf_matrix.shape[0] * tfidf_matrix.shape[1])) * 100:.2f}%")
@@ -60,10 +107,47 @@ def extract_keywords(analyzer: TFIDFAnalyzer, tfidf_matrix, articles: List[Dict]
     }
 
 
-def perform_clustering(tfidf_matrix, articles: List[Dict], feature_names, n_clusters: int = 5) -> Dict:
-    logger.info(f"Clustering K-means (k={n_clusters})...")
-    thematic = ThematicAnalyzer(n_clusters=n_clusters)
-    thematic.fit(tfidf_matrix)
+def select_cluster_count(tfidf_matrix, k_min: int, k_max: int, workers: int, sample_size: int,
+                         streaming: bool = False, batch_size: int = 1024) -> tuple:
+    logger.info(f"Sélection de k entre {k_min} et {k_max} ({workers} processus, silhouette sur "
+                f"{min(sample_size, tfidf_matrix.shape[0])} documents)...")
+    best_k, scores = sweep_cluster_counts(tfidf_matrix, list(range(k_min, k_max + 1)), workers=workers,
+                                          sample_size=sample_size, streaming=streaming, batch_size=batch_size)
+    for score in scores:
+        silhouette = 'n/a' if score['silhouette'] is None else f"{score['silhouette']:.4f}"
+        logger.info(f"  k={score['n_clusters']}: silhouette {silhouette}, inertie {score['inertia']:.4f} "
+                    f"({score['seconds']:.2f} s)")
+    if best_k is None:
+        logger.warning("Aucun k évaluable, k par défaut conservé")
+    else:
+        logger.info(f"Meilleur k: {best_k}")
+    return best_k, scores
+
+
+def load_previous_clusters(model_dir: Path) -> Optional[ThematicAnalyzer]:
+    if not (model_dir / CLUSTERS_FILE).exists():
+        return None
+    try:
+        return ThematicAnalyzer.load(model_dir)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Clusters précédents illisibles, dérive non calculée ({model_dir}): {e}")
+        return None
+
+
+def perform_clustering(tfidf_matrix, articles: List[Dict], feature_names, n_clusters: int = 5,
+                       streaming: bool = False, batch_size: int = 1024,
+                       previous: Optional[ThematicAnalyzer] = None) -> tuple:
+    if streaming:
+        logger.info(f"Clustering MiniBatchKMeans (k={n_clusters}, lots de {batch_size} documents)...")
+    else:
+        logger.info(f"Clustering K-means (k={n_clusters})...")
+    thematic = ThematicAnalyzer(n_clusters=n_clusters, streaming=streaming, batch_size=batch_size)
+    thematic.fit(tfidf_matrix, keys=[article.get('url', '') for article in articles])
+    logger.info(f"Inertie: {thematic.inertia:.4f}")
+    drift = thematic.assignment_drift(previous) if previous is not None else None
+    if drift is not None:
+        logger.info(f"Dérive des affectations: {drift['nb_changed']}/{drift['nb_common_documents']} "
+                    f"documents ont changé de cluster ({drift['drift']:.1%})")
     
     distribution = thematic.get_cluster_distribution()
     logger.info("Distribution des clusters:")
@@ -72,13 +156,109 @@ def perform_clustering(tfidf_matrix, articles: List[Dict], feature_names, n_clus
     
     cluster_summary = thematic.get_cluster_summary(articles, feature_names, top_terms=10)
     
-    return {
+    return thematic, {
         'n_clusters': n_clusters,
         'distribution': distribution,
-        'clusters': cluster_summary
+        'clusters': cluster_summary,
+        'inertia': thematic.inertia,
+        'drift': drift
     }
 
 
+def load_unseen_articles(file_path: Path, corpus: Optional[TokenCorpus], seen: set) -> tuple:
+    # Les URLs sont lues d'abord ; les tokens ne sont décodés (ou conservés) que pour les nouveaux articles
+    if corpus is not None:
+        logger.info(f"Chargement depuis {corpus.directory} (colonnes: {', '.join(ARTICLE_COLUMNS)})")
+        articles = corpus.articles(ARTICLE_COLUMNS)
+        new_indices = [index for index, article in enumerate(articles) if article.get('url') not in seen]
+        new_articles = [articles[index] for index in new_indices]
+        documents = [corpus.decode(index, 'contenu_tokens') for index in new_indices]
+        return new_articles, documents, len(articles)
+    
+    logger.info(f"Chargement depuis {file_path}")
+    new_articles = []
+    total = 0
+    for article in iter_articles(file_path):
+        total += 1
+        if article.get('url') not in seen:
+            new_articles.append(article)
+    return new_articles, [article.pop('contenu_tokens', []) for article in new_articles], total
+
+
+def run_incremental(input_path: Path, corpus: Optional[TokenCorpus], state_path: Path, output_path: Path,
+                    n_features: int) -> None:
+    # Seuls les articles absents de l'état sont comptés et transformés
+    if state_path.exists():
+        analyzer = IncrementalTFIDFAnalyzer.load(str(state_path))
+    else:
+        analyzer = IncrementalTFIDFAnalyzer(min_df=2, max_df=0.8, n_features=n_features or None)
+    
+    new_articles, documents, total = load_unseen_articles(input_path, corpus, analyzer.seen)
+    logger.info(f"TF-IDF incrémental: {len(new_articles)} nouveaux articles sur {total}")
+    if not new_articles:
+        return
+    
+    analyzer.partial_fit(documents, keys=[article.get('url') for article in new_articles])
+    tfidf_matrix = analyzer.transform(documents)
+    
+    extractor = KeywordExtractor(tfidf_matrix, analyzer.feature_names)
+    results = {
+        'metadata': {
+            'nb_documents_total': analyzer.n_docs,
+            'nb_new_documents': len(new_articles),
+            'nb_terms': analyzer.n_terms,
+            'n_features': analyzer.n_features
+        },
+        'batch_keywords': extractor.extract_corpus_keywords(top_n=30),
+        'documents': extractor.analyze_all_documents(new_articles, top_n=15)
+    }
+    save_results(results, output_path)
+    analyzer.save(str(state_path))
+
+
+def score_articles(input_path: Path, model_dir: Path, output_path: Path, update_clusters: bool = False) -> None:
+    # Transform seul : vocabulaire, IDF et centroïdes du dernier run complet, sans réajustement
+    analyzer = TFIDFAnalyzer.load(model_dir, load_matrix=False)
+    thematic = ThematicAnalyzer.load(model_dir)
+    articles = list(iter_articles(input_path))
+    logger.info(f"Modèle {model_dir}: {len(analyzer.feature_names)} termes, {thematic.n_clusters} clusters; "
+                f"{len(articles)} articles à évaluer")
+    
+    start = time.perf_counter()
+    tfidf_matrix = analyzer.transform(extract_tokens(articles))
+    extractor = KeywordExtractor(tfidf_matrix, analyzer.feature_names, mean_tfidf=analyzer.mean_tfidf)
+    documents = extractor.analyze_all_documents(articles, top_n=15)
+    labels = thematic.predict(tfidf_matrix)
+    drift = None
+    if update_clusters:
+        # Centroïdes mis à jour avec ces articles (partial_fit), puis réaffectation
+        updated = thematic.partial_fit(tfidf_matrix, keys=[article.get('url', '') for article in articles])
+        nb_changed = int((updated != labels).sum())
+        drift = {'nb_common_documents': len(articles), 'nb_changed': nb_changed,
+                 'drift': nb_changed / len(articles) if articles else 0.0}
+        labels = updated
+    for document, article, cluster_id in zip(documents, articles, labels.tolist()):
+        document['url'] = article.get('url', '')
+        document['cluster_id'] = cluster_id
+    logger.info(f"Évaluation: {(time.perf_counter() - start) * 1000:.1f} ms")
+    if update_clusters:
+        logger.info(f"Inertie des nouveaux articles: {thematic.inertia:.4f}, "
+                    f"{drift['nb_changed']} ont changé de cluster après mise à jour des centroïdes")
+        thematic.save(model_dir)
+    
+    save_results({
+        'metadata': {
+            'model_dir': str(model_dir),
+            'nb_documents': len(articles),
+            'nb_features': len(analyzer.feature_names),
+            'n_clusters': thematic.n_clusters,
+            'inertia': thematic.inertia if update_clusters else None,
+            'drift': drift
+        },
+        'documents': documents
+    }, output_path)
+
+
 def save_results(results: Dict, output_path: Path):
     logger.info(f"Sauvegarde résultats: {output_path}")
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -86,27 +266,93 @@ def save_results(results: Dict, output_path: Path):
         json.dump(results, f, ensure_ascii=False, indent=2)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input', type=Path, default=Path("../data/articles_preprocessed.json"),
+                        help="Articles prétraités (tableau JSON ou NDJSON, ou répertoire du corpus en colonnes)")
+    parser.add_argument('--corpus-dir', type=Path, default=Path("../data/corpus"),
+                        help="Corpus en colonnes de l'étape 2, lu à la place de --input s'il a été écrit avec")
+    parser.add_argument('--no-token-ids', action='store_true',
+                        help="Ignorer le corpus en colonnes et repartir des tokens texte de --input")
+    parser.add_argument('--incremental-state', type=Path, default=None,
+                        help="TF-IDF incrémental : fréquences documentaires persistantes, seuls les nouveaux articles sont traités")
+    parser.add_argument('--hashing-features', type=int, default=0,
+                        help="Nombre de colonnes par hachage des termes pour un nouvel état incrémental (0 : vocabulaire)")
+    parser.add_argument('--model-dir', type=Path, default=Path("../data/tfidf_model"),
+                        help="Vocabulaire, IDF, matrice TF-IDF et centroïdes K-means sauvegardés après chaque analyse")
+    parser.add_argument('--score', type=Path, default=None,
+                        help="Évaluer ces articles prétraités avec le modèle de --model-dir (mots-clés, cluster) sans réajuster")
+    parser.add_argument('--score-output', type=Path, default=Path("../data/tfidf_scores.json"))
+    parser.add_argument('--update-clusters', action='store_true',
+                        help="Avec --score : mettre à jour les centroïdes sauvegardés avec les articles évalués")
+    parser.add_argument('--clustering', choices=['kmeans', 'minibatch'], default='kmeans',
+                        help="K-means complet ou MiniBatchKMeans alimenté par lots (partial_fit)")
+    parser.add_argument('--batch-size', type=int, default=1024,
+                        help="Documents par lot pour --clustering minibatch et --update-clusters")
+    parser.add_argument('--n-clusters', type=int, default=5)
+    parser.add_argument('--auto-k', action='store_true',
+                        help="Choisir le nombre de clusters entre --k-min et --k-max (silhouette)")
+    parser.add_argument('--k-min', type=int, default=2)
+    parser.add_argument('--k-max', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processus pour --auto-k, un k par processus (matrice en mémoire partagée)")
+    parser.add_argument('--silhouette-sample', type=int, default=2000,
+                        help="Documents échantillonnés pour la silhouette (distances calculées une fois)")
+    return parser.parse_args()
+
+
 def main():
-    input_file = Path("../data/articles_preprocessed.json")
+    args = parse_args()
+    input_file = args.input
     output_file = Path("../data/tfidf_analysis.json")
     
-    if not input_file.exists():
+    if args.score is not None:
+        if not articles_exist(args.score):
+            logger.error(f"Fichier introuvable: {args.score}")
+            return
+        score_articles(args.score, args.model_dir, args.score_output, args.update_clusters)
+        return
+    
+    columnar = None if args.no_token_ids else open_columnar_corpus(input_file, args.corpus_dir)
+    if columnar is None and (input_file.is_dir() or not articles_exist(input_file)):
         logger.error(f"Fichier introuvable: {input_file}")
         return
     
-    articles = load_preprocessed_articles(input_file)
-    documents = extract_tokens(articles)
+    if args.incremental_state is not None:
+        run_incremental(input_file, columnar, args.incremental_state, Path("../data/tfidf_incremental.json"),
+                        args.hashing_features)
+        return
     
-    analyzer, tfidf_matrix = analyze_tfidf(articles, documents)
+    articles = load_preprocessed_articles(input_file, columnar)
+    if columnar is not None:
+        corpus, documents = columnar, None
+    else:
+        documents = extract_tokens(articles)
+        corpus = None if args.no_token_ids else load_token_corpus(args.corpus_dir, articles)
+    
+    analyzer, tfidf_matrix = analyze_tfidf(articles, documents, corpus)
     
     keywords_results = extract_keywords(analyzer, tfidf_matrix, articles)
     
-    clustering_results = perform_clustering(
+    n_clusters = args.n_clusters
+    k_selection = None
+    if args.auto_k:
+        best_k, scores = select_cluster_count(tfidf_matrix, args.k_min, args.k_max, args.workers,
+                                              args.silhouette_sample, args.clustering == 'minibatch', args.batch_size)
+        n_clusters = best_k or n_clusters
+        k_selection = {'best_k': best_k, 'scores': scores}
+    
+    thematic, clustering_results = perform_clustering(
         tfidf_matrix, 
         articles, 
         analyzer.feature_names,
-        n_clusters=5
+        n_clusters=n_clusters,
+        streaming=(args.clustering == 'minibatch'),
+        batch_size=args.batch_size,
+        previous=load_previous_clusters(args.model_dir)
     )
+    if k_selection is not None:
+        clustering_results['k_selection'] = k_selection
     
     results = {
         'metadata': {
@@ -119,6 +365,8 @@ def main():
     }
     
     save_results(results, output_file)
+    analyzer.save(args.model_dir)
+    thematic.save(args.model_dir)
     logger.info("Analyse terminée")
     
     logger.info("\n=== RÉSUMÉ ===")
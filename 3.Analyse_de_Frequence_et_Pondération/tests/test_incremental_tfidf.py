@@ -0,0 +1,74 @@
+import json
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from modules.incremental_tfidf import MAX_NAME_LENGTH, IncrementalTFIDFAnalyzer
+
+TERMS = ['ransomware', 'phishing', 'cve', 'botnet', 'exploit', 'patch', 'malware', 'apt', 'zero-day', 'leak']
+
+
+def random_documents(n_documents, seed):
+    rng = np.random.default_rng(seed)
+    return [list(rng.choice(TERMS, size=rng.integers(1, 12))) for _ in range(n_documents)]
+
+
+def refit_by_term(documents):
+    # Référence : TfidfVectorizer réajusté sur tout l'historique
+    vectorizer = TfidfVectorizer(analyzer=lambda tokens: tokens, min_df=2, max_df=0.8)
+    matrix = vectorizer.fit_transform(documents).toarray()
+    return [{term: matrix[row, column] for term, column in vectorizer.vocabulary_.items() if matrix[row, column]}
+            for row in range(len(documents))]
+
+
+def incremental_by_term(analyzer, documents):
+    matrix = analyzer.transform(documents).toarray()
+    return [{analyzer.feature_names[column]: matrix[row, column] for column in np.flatnonzero(matrix[row])}
+            for row in range(len(documents))]
+
+
+def assert_same_weights(actual, expected):
+    assert [sorted(row) for row in actual] == [sorted(row) for row in expected]
+    for actual_row, expected_row in zip(actual, expected):
+        for term, weight in expected_row.items():
+            assert actual_row[term] == pytest.approx(weight)
+
+
+@pytest.mark.parametrize('n_features', [None, 1 << 20])
+def test_partial_fit_matches_refit(n_features):
+    history = random_documents(40, seed=0)
+    delta = random_documents(10, seed=1)
+    analyzer = IncrementalTFIDFAnalyzer(min_df=2, max_df=0.8, n_features=n_features)
+    analyzer.partial_fit(history, keys=[f'h{i}' for i in range(40)])
+    # Articles déjà vus : ignorés
+    analyzer.partial_fit(history[:5] + delta, keys=[f'h{i}' for i in range(5)] + [f'd{i}' for i in range(10)])
+    
+    assert analyzer.n_docs == 50
+    assert_same_weights(incremental_by_term(analyzer, history + delta), refit_by_term(history + delta))
+
+
+def test_hashing_state_keeps_no_term_dictionary(tmp_path):
+    analyzer = IncrementalTFIDFAnalyzer(n_features=1 << 20)
+    analyzer.partial_fit(random_documents(20, seed=2))
+    assert analyzer.vocabulary == {}
+    
+    path = str(tmp_path / 'state.npz')
+    analyzer.save(path)
+    with np.load(path) as data:
+        state = json.loads(str(data['state']))
+    assert 'vocabulary' not in state
+    assert len(state['column_names']) == analyzer.n_terms == len(TERMS)
+    
+    loaded = IncrementalTFIDFAnalyzer.load(path)
+    assert loaded.feature_names == analyzer.feature_names
+    documents = random_documents(5, seed=3)
+    assert (loaded.transform(documents) != analyzer.transform(documents)).nnz == 0
+
+
+def test_colliding_terms_share_a_bounded_column_name():
+    analyzer = IncrementalTFIDFAnalyzer(min_df=1, max_df=1.0, n_features=1)
+    analyzer.partial_fit([['ransomware', 'phishing'], ['ransomware'], ['x' * 100]])
+    assert analyzer.df.tolist() == [3]
+    assert analyzer.feature_names[0] == ('ransomware|phishing|' + 'x' * 100)[:MAX_NAME_LENGTH]
+    assert analyzer.transform([['phishing']]).toarray().tolist() == [[1.0]]
@@ -0,0 +1,79 @@
+import json
+import shutil
+import sys
+from array import array
+from pathlib import Path
+
+import run
+from shared.token_corpus import MANIFEST_FILE, VOCABULARY_FILE, TokenCorpusWriter, urls_hash
+
+ARTICLES_FILE = Path(__file__).resolve().parents[2] / 'data' / 'articles_preprocessed.json'
+
+
+def write_version_1_corpus(directory: Path, articles) -> None:
+    # Format écrit par l'étape 2 avant le corpus en colonnes : identifiants seuls
+    directory.mkdir(parents=True)
+    vocabulary = {}
+    ids = array('I')
+    offsets = array('Q', [0])
+    for article in articles:
+        for token in article['contenu_tokens']:
+            ids.append(vocabulary.setdefault(token, len(vocabulary)))
+        offsets.append(len(ids))
+    with open(directory / 'token_ids.u32', 'wb') as f:
+        ids.tofile(f)
+    with open(directory / 'offsets.u64', 'wb') as f:
+        offsets.tofile(f)
+    (directory / VOCABULARY_FILE).write_text(json.dumps(list(vocabulary)), encoding='utf-8')
+    (directory / MANIFEST_FILE).write_text(json.dumps({
+        'version': 1,
+        'field': 'contenu_tokens',
+        'nb_documents': len(articles),
+        'nb_tokens': len(ids),
+        'vocabulary_size': len(vocabulary),
+        'urls_hash': urls_hash(article['url'] for article in articles)
+    }), encoding='utf-8')
+
+
+def test_version_1_corpus_is_ignored(tmp_path, caplog):
+    articles = [{'url': 'https://a', 'contenu_tokens': ['ransomware', 'cve']},
+                {'url': 'https://b', 'contenu_tokens': ['cve']}]
+    input_path = tmp_path / 'articles.json'
+    input_path.write_text(json.dumps(articles), encoding='utf-8')
+    corpus_dir = tmp_path / 'corpus'
+    write_version_1_corpus(corpus_dir, articles)
+    
+    assert run.open_columnar_corpus(input_path, corpus_dir) is None
+    assert run.open_columnar_corpus(corpus_dir, corpus_dir) is None
+    assert run.load_token_corpus(corpus_dir, articles) is None
+    assert 'Version de corpus non supportée: 1' in caplog.text
+
+
+def test_current_corpus_is_used(tmp_path):
+    articles = [{'url': 'https://a', 'contenu_tokens': ['ransomware', 'cve']}]
+    input_path = tmp_path / 'articles.json'
+    input_path.write_text(json.dumps(articles), encoding='utf-8')
+    writer = TokenCorpusWriter(tmp_path / 'corpus')
+    writer.write(articles[0])
+    writer.close(source=input_path)
+    
+    corpus = run.open_columnar_corpus(input_path, tmp_path / 'corpus')
+    assert corpus is not None and corpus.decode(0) == ['ransomware', 'cve']
+
+
+def test_main_falls_back_to_input_with_version_1_corpus(tmp_path, monkeypatch):
+    # Arborescence du dépôt reproduite : run.py écrit dans ../data
+    stage_dir = tmp_path / 'stage'
+    data_dir = tmp_path / 'data'
+    stage_dir.mkdir()
+    data_dir.mkdir()
+    shutil.copy(ARTICLES_FILE, data_dir / ARTICLES_FILE.name)
+    write_version_1_corpus(data_dir / 'corpus', json.loads(ARTICLES_FILE.read_text(encoding='utf-8')))
+    monkeypatch.chdir(stage_dir)
+    monkeypatch.setattr(sys, 'argv', ['run.py'])
+    
+    run.main()
+    
+    with open(data_dir / 'tfidf_analysis.json', encoding='utf-8') as f:
+        results = json.load(f)
+    assert results['metadata']['nb_documents'] == 30
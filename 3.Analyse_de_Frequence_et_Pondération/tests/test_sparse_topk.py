@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from modules.keyword_extractor import KeywordExtractor
+from modules.sparse_topk import top_k_per_row
+from modules.tfidf_analyzer import TFIDFAnalyzer
+from shared.article_io import iter_articles
+
+ARTICLES_FILE = Path(__file__).resolve().parents[2] / 'data' / 'articles_preprocessed.json'
+BASELINE_FILE = Path(__file__).resolve().parent / 'fixtures' / 'baseline_keywords.json'
+
+
+def dense_reference(matrix, top_n, shift=None):
+    # Boucle par document d'origine
+    results = []
+    for index in range(matrix.shape[0]):
+        doc_vector = matrix[index].toarray().flatten()
+        if shift is not None:
+            doc_vector = doc_vector - shift
+        top_indices = doc_vector.argsort()[-top_n:][::-1]
+        results.append([(int(i), float(doc_vector[i])) for i in top_indices if doc_vector[i] > 0])
+    return results
+
+
+@pytest.mark.parametrize('block_size', [1, 1000, 1 << 22])
+def test_matches_dense_loop_with_ties(block_size):
+    rng = np.random.default_rng(0)
+    matrix = sparse.random(60, 400, density=0.05, format='csr', random_state=rng)
+    # Poids arrondis : nombreux ex aequo, y compris à la limite du top-k
+    matrix.data = np.round(matrix.data, 1)
+    mean = np.asarray(matrix.mean(axis=0)).flatten()
+    
+    assert top_k_per_row(matrix, 15, block_size=block_size) == dense_reference(matrix, 15)
+    assert top_k_per_row(matrix, 10, shift=mean, block_size=block_size) == dense_reference(matrix, 10, mean)
+
+
+def test_empty_rows_and_zero_top_n():
+    matrix = sparse.csr_matrix(np.array([[0.0, 0.0, 0.0], [0.5, 0.0, 0.5]]))
+    assert top_k_per_row(matrix, 0) == [[], []]
+    assert top_k_per_row(matrix, 5) == dense_reference(matrix, 5)
+    assert top_k_per_row(matrix, 5)[0] == []
+
+
+def test_keywords_match_baseline_output():
+    # Sortie de l'étape 3 avant l'extraction par lots (data/tfidf_analysis.json d'origine)
+    articles = list(iter_articles(ARTICLES_FILE))
+    analyzer = TFIDFAnalyzer(max_features=1000, min_df=2, max_df=0.8)
+    tfidf_matrix = analyzer.fit_transform([article['contenu_tokens'] for article in articles])
+    extractor = KeywordExtractor(tfidf_matrix, analyzer.feature_names)
+    documents = json.loads(json.dumps(extractor.analyze_all_documents(articles, top_n=15)))
+    
+    with open(BASELINE_FILE, encoding='utf-8') as f:
+        baseline = json.load(f)
+    assert [document['keywords'] for document in documents] == \
+        [document['keywords'] for document in baseline['documents']]
+    assert [document['discriminant_terms'] for document in documents] == \
+        [document['discriminant_terms'] for document in baseline['documents']]
+    assert json.loads(json.dumps(extractor.extract_corpus_keywords(top_n=30))) == baseline['corpus_keywords']
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from modules.tfidf_analyzer import TFIDFAnalyzer
+from shared.article_io import iter_articles
+from shared.token_corpus import TokenCorpus, TokenCorpusWriter
+
+ARTICLES_FILE = Path(__file__).resolve().parents[2] / 'data' / 'articles_preprocessed.json'
+
+
+def write_corpus(directory, documents):
+    with TokenCorpusWriter(directory) as writer:
+        for index, tokens in enumerate(documents):
+            writer.write({'url': f'https://example.com/{index}', 'contenu_tokens': tokens})
+    return TokenCorpus(directory)
+
+
+def random_documents(n_documents=80, n_terms=300, seed=0):
+    rng = np.random.default_rng(seed)
+    # Loi de Zipf tronquée : nombreux termes rares de même fréquence totale (ex aequo pour max_features)
+    terms = [f'term{i:03d}' for i in range(n_terms)]
+    return [[terms[min(rank, n_terms) - 1] for rank in rng.zipf(1.3, size=rng.integers(0, 60))]
+            for _ in range(n_documents)]
+
+
+def assert_same_model(documents, corpus, **params):
+    expected = TFIDFAnalyzer(**params)
+    expected_matrix = expected.fit_transform(documents)
+    actual = TFIDFAnalyzer(**params)
+    actual_matrix = actual.fit_transform_ids(corpus)
+    
+    assert list(actual.feature_names) == list(expected.feature_names)
+    assert abs(actual_matrix - expected_matrix).max() < 1e-12
+    np.testing.assert_allclose(actual.vectorizer.idf_, expected.vectorizer.idf_)
+    assert (actual.transform(documents[:5]) != expected.transform(documents[:5])).nnz == 0
+
+
+@pytest.mark.parametrize('params', [
+    {'min_df': 2, 'max_df': 0.8},
+    {'min_df': 1, 'max_df': 1.0},
+    {'min_df': 0.05, 'max_df': 30},
+    {'max_features': 39, 'min_df': 1, 'max_df': 1.0},
+    {'max_features': 25, 'min_df': 2, 'max_df': 0.5},
+])
+def test_fit_transform_ids_matches_fit_transform(tmp_path, params):
+    # _limit_features reprend l'élagage de CountVectorizer : cette équivalence est vérifiée
+    # avec la version de scikit-learn installée
+    documents = random_documents()
+    assert_same_model(documents, write_corpus(tmp_path / 'corpus', documents), **params)
+
+
+def test_fit_transform_ids_matches_on_articles(tmp_path):
+    documents = [article['contenu_tokens'] for article in iter_articles(ARTICLES_FILE)]
+    assert_same_model(documents, write_corpus(tmp_path / 'corpus', documents),
+                      max_features=1000, min_df=2, max_df=0.8)
+
+
+def test_no_term_left_after_pruning(tmp_path):
+    documents = [['a'], ['b']]
+    corpus = write_corpus(tmp_path / 'corpus', documents)
+    with pytest.raises(ValueError):
+        TFIDFAnalyzer(min_df=2).fit_transform_ids(corpus)
+    with pytest.raises(ValueError):
+        TFIDFAnalyzer(min_df=2).fit_transform(documents)
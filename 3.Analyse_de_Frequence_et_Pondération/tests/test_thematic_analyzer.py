@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from modules.thematic_analyzer import ThematicAnalyzer
+
+
+def random_matrix(n_rows=40, n_columns=30, seed=0):
+    return sparse.random(n_rows, n_columns, density=0.3, format='csr', random_state=seed)
+
+
+@pytest.mark.parametrize('batch_size', [1, 8, 11, 64])
+def test_streaming_fit_with_batches_smaller_than_k(batch_size):
+    matrix = random_matrix()
+    thematic = ThematicAnalyzer(n_clusters=12, streaming=True, batch_size=batch_size)
+    labels = thematic.fit(matrix)
+    assert labels.shape == (40,)
+    assert thematic.cluster_centers.shape == (12, 30)
+    assert thematic.counts.sum() == 40
+
+
+def test_partial_fit_with_batches_smaller_than_k():
+    thematic = ThematicAnalyzer(n_clusters=12, streaming=True, batch_size=5)
+    thematic.fit(random_matrix(seed=1), keys=[f'a{i}' for i in range(40)])
+    labels = thematic.partial_fit(random_matrix(seed=2), keys=[f'b{i}' for i in range(40)])
+    assert labels.shape == (40,)
+    assert thematic.counts.sum() == 80
+
+
+def test_invalid_batch_size():
+    with pytest.raises(ValueError):
+        ThematicAnalyzer(n_clusters=3, streaming=True, batch_size=0)
+
+
+def test_summary_with_empty_cluster():
+    thematic = ThematicAnalyzer(n_clusters=3)
+    thematic.cluster_centers = np.eye(3)
+    thematic.labels = np.array([0, 0, 2])
+    articles = [{'titre': f'Article {i}'} for i in range(3)]
+    summary = thematic.get_cluster_summary(articles, ['a', 'b', 'c'], top_terms=2)
+    assert [cluster['nb_documents'] for cluster in summary] == [2, 0, 1]
+    assert summary[1]['documents'] == []
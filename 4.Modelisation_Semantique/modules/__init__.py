@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Lecture des articles et corpus en colonnes : package shared/ à la racine du dépôt, commun aux étapes 2 à 4
+ROOT_DIR = str(Path(__file__).resolve().parents[2])
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
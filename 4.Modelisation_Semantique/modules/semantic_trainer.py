@@ -1,10 +1,24 @@
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
 from gensim.models import Word2Vec
 import logging
+from shared.token_corpus import TokenCorpus
 
 logger = logging.getLogger(__name__)
 
 
+class _DecodedSentences:
+    # Ré-itérable (une passe par époque), un seul document décodé à la fois
+    def __init__(self, corpus: TokenCorpus):
+        self.corpus = corpus
+    
+    def __iter__(self) -> Iterator[List[str]]:
+        for index in range(len(self.corpus)):
+            tokens = self.corpus.decode(index)
+            if tokens:
+                yield tokens
+
+
 class SemanticModelTrainer:
     def __init__(self, vector_size: int = 200, window: int = 5, min_count: int = 2, 
                  sg: int = 1, epochs: int = 10, workers: int = 4):
@@ -35,6 +49,32 @@ class SemanticModelTrainer:
         logger.info(f"Vocabulaire: {len(self.model.wv)} mots")
         return self.model
     
+    def train_from_ids(self, corpus: TokenCorpus) -> Word2Vec:
+        logger.info(f"Entraînement Word2Vec depuis le corpus d'identifiants (sg={self.sg}, vector_size={self.vector_size})")
+        logger.info(f"  - Fenêtre: {self.window}, Min count: {self.min_count}")
+        logger.info(f"  - Époque: {self.epochs}, Workers: {self.workers}")
+        
+        # Fréquences calculées sur les entiers, dans l'ordre de première apparition comme scan_vocab
+        counts = np.bincount(corpus.ids, minlength=len(corpus.terms))
+        word_freq = {corpus.terms[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+        sentences = _DecodedSentences(corpus)
+        nb_sentences = corpus.count_nonempty()
+        
+        self.model = Word2Vec(
+            vector_size=self.vector_size,
+            window=self.window,
+            min_count=self.min_count,
+            sg=self.sg,
+            epochs=self.epochs,
+            workers=self.workers,
+            seed=42
+        )
+        self.model.build_vocab_from_freq(word_freq, corpus_count=nb_sentences)
+        self.model.train(sentences, total_examples=nb_sentences, epochs=self.epochs)
+        
+        logger.info(f"Vocabulaire: {len(self.model.wv)} mots")
+        return self.model
+    
     def save(self, filepath: str):
         if self.model is None:
             raise ValueError("Model not trained yet")
@@ -1,10 +1,13 @@
+import argparse
 import json
 import logging
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from modules.semantic_trainer import SemanticModelTrainer
 from modules.semantic_explorer import SemanticExplorer
 from modules.semantic_visualizer import SemanticVisualizer
+from shared.article_io import iter_articles, articles_exist
+from shared.token_corpus import TokenCorpus
 
 logging.basicConfig(
     level=logging.INFO,
@@ -13,10 +16,36 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def load_preprocessed_articles(file_path: Path) -> List[Dict]:
-    logger.info(f"Chargement depuis {file_path}")
-    with open(file_path, 'r', encoding='utf-8') as f:
-        articles = json.load(f)
+# Champs lus dans le corpus en colonnes : ni contenu_original ni tokens texte
+ARTICLE_COLUMNS = ['nb_tokens']
+
+
+def read_token_corpus(corpus_dir: Path) -> Optional[TokenCorpus]:
+    if not TokenCorpus.exists(corpus_dir):
+        return None
+    try:
+        return TokenCorpus(corpus_dir)
+    except (OSError, ValueError, KeyError) as e:
+        # Ex: corpus version 1 (identifiants seuls) écrit avant le format en colonnes
+        logger.warning(f"Corpus en colonnes illisible, ignoré ({corpus_dir}): {e}")
+        return None
+
+
+def open_columnar_corpus(input_path: Path, corpus_dir: Path) -> Optional[TokenCorpus]:
+    # --input peut désigner directement le corpus en colonnes
+    if input_path.is_dir():
+        return read_token_corpus(input_path)
+    corpus = read_token_corpus(corpus_dir)
+    return corpus if corpus is not None and corpus.describes(input_path) else None
+
+
+def load_preprocessed_articles(file_path: Path, corpus: Optional[TokenCorpus] = None) -> List[Dict]:
+    if corpus is not None:
+        logger.info(f"Chargement depuis {corpus.directory} (colonnes: {', '.join(ARTICLE_COLUMNS)})")
+        articles = corpus.articles(ARTICLE_COLUMNS)
+    else:
+        logger.info(f"Chargement depuis {file_path}")
+        articles = list(iter_articles(file_path))
     logger.info(f"Articles chargés: {len(articles)}")
     return articles
 
@@ -32,7 +61,19 @@ def extract_sentences(articles: List[Dict]) -> List[List[str]]:
     return sentences
 
 
-def train_semantic_model(sentences: List[List[str]]) -> SemanticModelTrainer:
+def load_token_corpus(corpus_dir: Path, articles: List[Dict]) -> Optional[TokenCorpus]:
+    corpus = read_token_corpus(corpus_dir)
+    if corpus is None:
+        return None
+    if not corpus.matches(articles):
+        logger.warning(f"Corpus d'identifiants {corpus_dir} périmé, utilisation des tokens texte")
+        return None
+    logger.info(f"Corpus d'identifiants: {len(corpus.terms)} termes, {corpus.manifest['nb_tokens']} tokens")
+    return corpus
+
+
+def train_semantic_model(sentences: Optional[List[List[str]]],
+                         corpus: Optional[TokenCorpus] = None) -> SemanticModelTrainer:
     trainer = SemanticModelTrainer(
         vector_size=200,
         window=5,
@@ -42,7 +83,10 @@ def train_semantic_model(sentences: List[List[str]]) -> SemanticModelTrainer:
         workers=4
     )
     
-    trainer.train(sentences)
+    if corpus is not None:
+        trainer.train_from_ids(corpus)
+    else:
+        trainer.train(sentences)
     return trainer
 
 
@@ -107,24 +151,44 @@ def save_model_and_results(trainer: SemanticModelTrainer, results: Dict,
     logger.info(f"Résultats sauvegardés: {results_path}")
 
 
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--input', type=Path, default=Path("../data/articles_preprocessed.json"),
+                        help="Articles prétraités (tableau JSON ou NDJSON, ou répertoire du corpus en colonnes)")
+    parser.add_argument('--corpus-dir', type=Path, default=Path("../data/corpus"),
+                        help="Corpus en colonnes de l'étape 2, lu à la place de --input s'il a été écrit avec")
+    parser.add_argument('--no-token-ids', action='store_true',
+                        help="Ignorer le corpus en colonnes et repartir des tokens texte de --input")
+    return parser.parse_args()
+
+
 def main():
-    input_file = Path("../data/articles_preprocessed.json")
+    args = parse_args()
+    input_file = args.input
     model_path = Path("../data/word2vec_model")
     results_path = Path("../data/semantic_analysis.json")
     output_dir = Path("../data/visualizations")
     
-    if not input_file.exists():
+    columnar = None if args.no_token_ids else open_columnar_corpus(input_file, args.corpus_dir)
+    if columnar is None and (input_file.is_dir() or not articles_exist(input_file)):
         logger.error(f"Fichier introuvable: {input_file}")
         return
     
-    articles = load_preprocessed_articles(input_file)
-    sentences = extract_sentences(articles)
-    
-    if not sentences:
+    articles = load_preprocessed_articles(input_file, columnar)
+    if columnar is not None:
+        corpus, sentences = columnar, None
+        nb_sentences = corpus.count_nonempty()
+        logger.info(f"Phrases extraites: {nb_sentences}")
+    else:
+        sentences = extract_sentences(articles)
+        nb_sentences = len(sentences)
+        corpus = None if args.no_token_ids else load_token_corpus(args.corpus_dir, articles)
+    
+    if not nb_sentences:
         logger.error("Aucune phrase extraite")
         return
     
-    trainer = train_semantic_model(sentences)
+    trainer = train_semantic_model(sentences, corpus)
     
     exploration_results = explore_semantics(trainer)
     
@@ -133,7 +197,7 @@ def main():
     save_model_and_results(trainer, exploration_results, model_path, results_path)
     
     logger.info("\n=== RÉSUMÉ ===")
-    logger.info(f"Phrases d'entraînement: {len(sentences)}")
+    logger.info(f"Phrases d'entraînement: {nb_sentences}")
     logger.info(f"Vocabulaire: {len(trainer.get_model().wv)} mots")
     logger.info(f"Dimensions vecteur: {trainer.get_model().vector_size}")
     logger.info(f"Mots similaires testés: {len(exploration_results['similar_words'])}")
@@ -0,0 +1,49 @@
+import json
+from array import array
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('gensim')
+
+import run
+from shared.token_corpus import MANIFEST_FILE, VOCABULARY_FILE, urls_hash
+
+
+def write_version_1_corpus(directory: Path, articles) -> None:
+    # Format écrit par l'étape 2 avant le corpus en colonnes : identifiants seuls
+    directory.mkdir(parents=True)
+    vocabulary = {}
+    ids = array('I')
+    offsets = array('Q', [0])
+    for article in articles:
+        for token in article['contenu_tokens']:
+            ids.append(vocabulary.setdefault(token, len(vocabulary)))
+        offsets.append(len(ids))
+    with open(directory / 'token_ids.u32', 'wb') as f:
+        ids.tofile(f)
+    with open(directory / 'offsets.u64', 'wb') as f:
+        offsets.tofile(f)
+    (directory / VOCABULARY_FILE).write_text(json.dumps(list(vocabulary)), encoding='utf-8')
+    (directory / MANIFEST_FILE).write_text(json.dumps({
+        'version': 1,
+        'field': 'contenu_tokens',
+        'nb_documents': len(articles),
+        'nb_tokens': len(ids),
+        'vocabulary_size': len(vocabulary),
+        'urls_hash': urls_hash(article['url'] for article in articles)
+    }), encoding='utf-8')
+
+
+def test_version_1_corpus_is_ignored(tmp_path, caplog):
+    articles = [{'url': 'https://a', 'contenu_tokens': ['ransomware', 'cve']},
+                {'url': 'https://b', 'contenu_tokens': ['cve']}]
+    input_path = tmp_path / 'articles.json'
+    input_path.write_text(json.dumps(articles), encoding='utf-8')
+    corpus_dir = tmp_path / 'corpus'
+    write_version_1_corpus(corpus_dir, articles)
+    
+    assert run.open_columnar_corpus(input_path, corpus_dir) is None
+    assert run.open_columnar_corpus(corpus_dir, corpus_dir) is None
+    assert run.load_token_corpus(corpus_dir, articles) is None
+    assert 'Version de corpus non supportée: 1' in caplog.text
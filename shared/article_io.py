@@ -0,0 +1,115 @@
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl')
+WHITESPACE = ' \t\n\r'
+
+
+def ndjson_segments(path: Path) -> List[Path]:
+    rotated = [
+        p for p in path.parent.glob(f"{path.stem}.*{path.suffix}")
+        if p.name[len(path.stem) + 1:-len(path.suffix)].isdigit()
+    ]
+    segments = sorted(rotated)
+    if path.exists():
+        segments.append(path)
+    return segments
+
+
+def iter_ndjson(path: Path) -> Iterator[Dict]:
+    for segment in ndjson_segments(path):
+        with open(segment, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Ligne invalide ignorée: {segment}:{line_number}")
+
+
+def iter_json_array(path: Path, chunk_size: int = 1 << 16) -> Iterator[Dict]:
+    # Lecture incrémentale d'un tableau JSON : seuls le tampon courant et l'élément décodé sont en mémoire
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size)
+        position = 0
+        eof = not buffer
+        
+        def refill() -> bool:
+            nonlocal buffer, position, eof
+            if eof:
+                return False
+            chunk = f.read(max(chunk_size, len(buffer) - position))
+            buffer = buffer[position:] + chunk
+            position = 0
+            eof = not chunk
+            return not eof
+        
+        def skip(characters: str) -> None:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in characters:
+                    position += 1
+                if position < len(buffer) or not refill():
+                    return
+        
+        skip(WHITESPACE)
+        if position >= len(buffer) or buffer[position] != '[':
+            raise ValueError(f"Tableau JSON attendu: {path}")
+        position += 1
+        skip(WHITESPACE)
+        if position < len(buffer) and buffer[position] == ']':
+            return
+        
+        while True:
+            if position >= len(buffer):
+                raise ValueError(f"Tableau JSON non terminé: {path}")
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Élément coupé par la fin du tampon : on relit plus loin
+                if refill():
+                    continue
+                raise
+            
+            # Un nombre coupé par la fin du tampon se décode sans erreur ("2." pour "2.5e3") : l'élément
+            # n'est accepté qu'une fois suivi de son séparateur
+            delimiter = end
+            while delimiter < len(buffer) and buffer[delimiter] in WHITESPACE:
+                delimiter += 1
+            if delimiter >= len(buffer) or buffer[delimiter] not in ',]':
+                if refill():
+                    continue
+                if delimiter >= len(buffer):
+                    raise ValueError(f"Tableau JSON non terminé: {path}")
+                raise ValueError(f"',' ou ']' attendu après un élément (caractère {buffer[delimiter]!r}): {path}")
+            
+            yield item
+            position = delimiter + 1
+            if buffer[delimiter] == ']':
+                return
+            skip(WHITESPACE)
+            if position < len(buffer) and buffer[position] in ',]':
+                raise ValueError(f"Élément attendu après ',': {path}")
+
+
+def iter_articles(path: Path) -> Iterator[Dict]:
+    path = Path(path)
+    if path.suffix in NDJSON_SUFFIXES:
+        yield from iter_ndjson(path)
+        return
+    
+    yield from iter_json_array(path)
+
+
+def articles_exist(path: Path) -> bool:
+    path = Path(path)
+    if path.suffix in NDJSON_SUFFIXES:
+        return bool(ndjson_segments(path))
+    return path.exists()
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from shared.article_io import articles_exist, iter_articles, iter_json_array, ndjson_segments
+
+ARTICLES = [
+    {'titre': 'Patch [urgent], "CVE-2024-1234"', 'contenu': 'Échappements \\ \" et émojis 🔒', 'score': 2.5e3},
+    {'titre': '', 'tags': ['a', {'b': [1, 2, {'c': None}]}], 'nb': -12, 'ratio': 0.125, 'ok': True},
+    [], 'texte', 1234567890, 1e-7, None,
+]
+
+
+def write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 1 << 16])
+def test_array_matches_json_load_at_any_buffer_boundary(tmp_path, chunk_size):
+    for text in (json.dumps(ARTICLES), json.dumps(ARTICLES, indent=2, ensure_ascii=False),
+                 '\n  ' + json.dumps(ARTICLES, separators=(',', ':')) + '  \n'):
+        path = write(tmp_path / 'articles.json', text)
+        assert list(iter_json_array(path, chunk_size=chunk_size)) == ARTICLES
+
+
+@pytest.mark.parametrize('chunk_size', [1, 4, 1 << 16])
+@pytest.mark.parametrize('text', ['[]', '  [ \n ]  ', '[2.5e3]', '[ 1 , 2 ]'])
+def test_small_arrays(tmp_path, chunk_size, text):
+    path = write(tmp_path / 'articles.json', text)
+    assert list(iter_json_array(path, chunk_size=chunk_size)) == json.loads(text)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 1 << 16])
+@pytest.mark.parametrize('text', ['', '{"a": 1}', '[{"a": 1}', '[{"a": 1},', '[1 2]', '[1,]', '[1,,2]',
+                                  '[{"a": ', '[2.5e]', '["non terminé]'])
+def test_malformed_arrays_raise(tmp_path, chunk_size, text):
+    path = write(tmp_path / 'articles.json', text)
+    with pytest.raises(ValueError):
+        list(iter_json_array(path, chunk_size=chunk_size))
+
+
+def test_elements_before_an_error_are_yielded(tmp_path):
+    path = write(tmp_path / 'articles.json', '[{"a": 1}, {"b": 2} {"c": 3}]')
+    items = iter_json_array(path, chunk_size=4)
+    assert next(items) == {'a': 1}
+    with pytest.raises(ValueError):
+        next(items)
+
+
+def test_ndjson_segments_in_order(tmp_path):
+    path = tmp_path / 'articles.ndjson'
+    write(tmp_path / 'articles.00002.ndjson', '{"id": 2}\n')
+    write(tmp_path / 'articles.00001.ndjson', '{"id": 1}\n\n{"id": \n')
+    write(tmp_path / 'articles.00003.ndjson.tmp', '{"id": "non publié"}\n')
+    write(tmp_path / 'articles.old.ndjson', '{"id": "autre fichier"}\n')
+    assert not articles_exist(tmp_path / 'absent.ndjson')
+    write(path, '{"id": 3}\n')
+    
+    assert [p.name for p in ndjson_segments(path)] == ['articles.00001.ndjson', 'articles.00002.ndjson',
+                                                      'articles.ndjson']
+    assert articles_exist(path)
+    # Ligne invalide ignorée
+    assert [article['id'] for article in iter_articles(path)] == [1, 2, 3]
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from shared.token_corpus import MANIFEST_FILE, TokenCorpus, TokenCorpusWriter
+
+ARTICLES = [
+    {'url': 'https://a', 'titre': 'Rançongiciel', 'source': 'Krebs', 'date': '2024-05-01', 'auteur': 'Brian',
+     'titre_tokens': ['rançongiciel'], 'contenu_tokens': ['ransomware', 'cve', 'ransomware'],
+     'iocs': {'cve': ['CVE-2024-1234']}, 'contenu_original': 'non conservé'},
+    {'url': 'https://b', 'titre': 'Vide', 'source': 'BleepingComputer', 'contenu_tokens': [], 'titre_tokens': []},
+    {'url': 'https://c', 'titre': 'Doublon', 'contenu_tokens': ['cve', 'patch'], 'duplicate_of': 'https://a'},
+]
+
+
+def write_corpus(directory, articles=ARTICLES, source=None):
+    writer = TokenCorpusWriter(directory)
+    for article in articles:
+        writer.write(article)
+    writer.close(source=source)
+    return TokenCorpus(directory)
+
+
+def test_round_trip(tmp_path):
+    corpus = write_corpus(tmp_path / 'corpus')
+    assert len(corpus) == 3
+    assert corpus.count_nonempty() == 2
+    assert [corpus.decode(index) for index in range(3)] == [article['contenu_tokens'] for article in ARTICLES]
+    assert corpus.decode(0, 'titre_tokens') == ['rançongiciel']
+    # Vocabulaire commun aux colonnes de tokens
+    assert [ids.tolist() for ids in corpus] == [[0, 1, 0], [], [1, 3]]
+    assert corpus.terms == ['ransomware', 'cve', 'rançongiciel', 'patch']
+    
+    articles = corpus.articles(['url', 'titre', 'auteur', 'iocs', 'duplicate_of', 'nb_tokens'])
+    assert articles == [
+        {'url': 'https://a', 'titre': 'Rançongiciel', 'auteur': 'Brian', 'iocs': {'cve': ['CVE-2024-1234']},
+         'nb_tokens': 3},
+        {'url': 'https://b', 'titre': 'Vide', 'auteur': '', 'nb_tokens': 0},
+        {'url': 'https://c', 'titre': 'Doublon', 'auteur': '', 'duplicate_of': 'https://a', 'nb_tokens': 2},
+    ]
+    assert corpus.matches(ARTICLES)
+    assert not corpus.matches(ARTICLES[:2])
+
+
+def test_only_requested_columns_are_mapped(tmp_path):
+    corpus = write_corpus(tmp_path / 'corpus')
+    assert set(corpus.column_data) == {'contenu_tokens'}
+    corpus.articles(['titre', 'nb_tokens'])
+    assert set(corpus.column_data) == {'contenu_tokens', 'titre'}
+    with pytest.raises(KeyError):
+        corpus.articles(['contenu_original'])
+
+
+def test_source_signature(tmp_path):
+    source = tmp_path / 'articles.json'
+    source.write_text(json.dumps(ARTICLES), encoding='utf-8')
+    corpus = write_corpus(tmp_path / 'corpus', source=source)
+    assert corpus.describes(source)
+    source.write_text(json.dumps(ARTICLES[:1]), encoding='utf-8')
+    assert not corpus.describes(source)
+    assert not write_corpus(tmp_path / 'other').describes(source)
+
+
+def test_aborted_writer_leaves_no_manifest(tmp_path):
+    with pytest.raises(RuntimeError):
+        with TokenCorpusWriter(tmp_path / 'corpus') as writer:
+            writer.write(ARTICLES[0])
+            raise RuntimeError('interruption')
+    assert not TokenCorpus.exists(tmp_path / 'corpus')
+    assert not list((tmp_path / 'corpus').glob('*.tmp'))
+
+
+def test_unsupported_version(tmp_path):
+    write_corpus(tmp_path / 'corpus')
+    manifest_path = tmp_path / 'corpus' / MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    manifest['version'] = 1
+    manifest_path.write_text(json.dumps(manifest), encoding='utf-8')
+    with pytest.raises(ValueError):
+        TokenCorpus(tmp_path / 'corpus')
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+VOCABULARY_FILE = 'vocabulary.json'
+MANIFEST_FILE = 'manifest.json'
+FORMAT_VERSION = 2
+
+# contenu_original n'est pas conservé : les étapes 3 et 4 n'en ont pas besoin
+TOKEN_COLUMNS = ('contenu_tokens', 'titre_tokens')
+STRING_COLUMNS = ('source', 'url', 'titre', 'date', 'auteur', 'date_extraction')
+JSON_COLUMNS = ('iocs', 'duplicate_of')
+
+
+def urls_hash(urls: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for url in urls:
+        digest.update((url or '').encode('utf-8') + b'\n')
+    return digest.hexdigest()
+
+
+def file_signature(path: Path) -> Dict:
+    stat = Path(path).stat()
+    return {'name': Path(path).name, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _replace(tmp_path: Path, path: Path) -> None:
+    with open(tmp_path, 'rb+') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _map(path: Path, dtype) -> np.ndarray:
+    if path.stat().st_size == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r')
+
+
+class _ColumnWriter:
+    # Valeurs bout à bout dans <nom>.<ext>, bornes de chaque document dans <nom>.offsets.u64
+    def __init__(self, directory: Path, name: str, extension: str):
+        self.directory = directory
+        self.data_name = f"{name}.{extension}"
+        self.offsets_name = f"{name}.offsets.u64"
+        self.offsets = array('Q', [0])
+        self.file = open(directory / (self.data_name + '.tmp'), 'wb')
+    
+    def append(self, data: bytes, length: int) -> None:
+        self.file.write(data)
+        self.offsets.append(self.offsets[-1] + length)
+    
+    def close(self) -> None:
+        self.file.close()
+        _replace(self.directory / (self.data_name + '.tmp'), self.directory / self.data_name)
+        offsets_tmp = self.directory / (self.offsets_name + '.tmp')
+        with open(offsets_tmp, 'wb') as f:
+            self.offsets.tofile(f)
+        _replace(offsets_tmp, self.directory / self.offsets_name)
+    
+    def abort(self) -> None:
+        if not self.file.closed:
+            self.file.close()
+        tmp_path = self.directory / (self.data_name + '.tmp')
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+class TokenCorpusWriter:
+    def __init__(self, directory: Path, field: str = 'contenu_tokens'):
+        self.directory = Path(directory)
+        self.field = field
+        self.vocabulary: Dict[str, int] = {}
+        self.urls = hashlib.sha256()
+        self.count = 0
+        self.closed = False
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.columns = {name: _ColumnWriter(self.directory, name, 'u32') for name in TOKEN_COLUMNS}
+        for name in STRING_COLUMNS + JSON_COLUMNS:
+            self.columns[name] = _ColumnWriter(self.directory, name, 'utf8')
+    
+    def _ids(self, tokens: List[str]) -> array:
+        vocabulary = self.vocabulary
+        ids = array('I')
+        for token in tokens:
+            token_id = vocabulary.get(token)
+            if token_id is None:
+                token_id = vocabulary[token] = len(vocabulary)
+            ids.append(token_id)
+        return ids
+    
+    def write(self, article: Dict) -> None:
+        for name in TOKEN_COLUMNS:
+            ids = self._ids(article.get(name, []))
+            self.columns[name].append(ids.tobytes(), len(ids))
+        for name in STRING_COLUMNS:
+            data = (article.get(name) or '').encode('utf-8')
+            self.columns[name].append(data, len(data))
+        for name in JSON_COLUMNS:
+            # Chaîne vide : champ absent de l'article
+            data = json.dumps(article[name], ensure_ascii=False).encode('utf-8') if name in article else b''
+            self.columns[name].append(data, len(data))
+        self.urls.update((article.get('url') or '').encode('utf-8') + b'\n')
+        self.count += 1
+    
+    def close(self, source: Optional[Path] = None) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for column in self.columns.values():
+            column.close()
+        
+        vocabulary_tmp = self.directory / (VOCABULARY_FILE + '.tmp')
+        with open(vocabulary_tmp, 'w', encoding='utf-8') as f:
+            json.dump(list(self.vocabulary), f, ensure_ascii=False)
+        _replace(vocabulary_tmp, self.directory / VOCABULARY_FILE)
+        
+        # Manifeste écrit en dernier : un corpus sans manifeste à jour est ignoré par les étapes 3 et 4
+        manifest_tmp = self.directory / (MANIFEST_FILE + '.tmp')
+        with open(manifest_tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': FORMAT_VERSION,
+                'field': self.field,
+                'nb_documents': self.count,
+                'nb_tokens': self.columns[self.field].offsets[-1],
+                'vocabulary_size': len(self.vocabulary),
+                'urls_hash': self.urls.hexdigest(),
+                'token_columns': list(TOKEN_COLUMNS),
+                'string_columns': list(STRING_COLUMNS),
+                'json_columns': list(JSON_COLUMNS),
+                'source': file_signature(source) if source is not None else None
+            }, f, indent=2)
+        _replace(manifest_tmp, self.directory / MANIFEST_FILE)
+    
+    def abort(self) -> None:
+        self.closed = True
+        for column in self.columns.values():
+            column.abort()
+    
+    def __enter__(self) -> 'TokenCorpusWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class TokenCorpus:
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        with open(self.directory / MANIFEST_FILE, encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Version de corpus non supportée: {self.manifest.get('version')}")
+        
+        with open(self.directory / VOCABULARY_FILE, encoding='utf-8') as f:
+            self.terms: List[str] = json.load(f)
+        self.column_offsets = {}
+        self.column_data = {}
+        self.offsets, self.ids = self._column(self.manifest['field'])
+        
+        if len(self.offsets) - 1 != self.manifest['nb_documents'] or len(self.ids) != self.offsets[-1]:
+            raise ValueError(f"Corpus incohérent: {self.directory}")
+    
+    @classmethod
+    def exists(cls, directory: Path) -> bool:
+        return (Path(directory) / MANIFEST_FILE).exists()
+    
+    def _column(self, name: str):
+        # Colonnes projetées à la demande : seuls les fichiers lus sont mappés
+        if name not in self.column_data:
+            extension, dtype = ('u32', np.uint32) if name in self.manifest['token_columns'] else ('utf8', np.uint8)
+            self.column_offsets[name] = _map(self.directory / f"{name}.offsets.u64", np.uint64).astype(np.int64)
+            self.column_data[name] = _map(self.directory / f"{name}.{extension}", dtype)
+        return self.column_offsets[name], self.column_data[name]
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def document_ids(self, index: int) -> np.ndarray:
+        return self.ids[self.offsets[index]:self.offsets[index + 1]]
+    
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for index in range(len(self)):
+            yield self.document_ids(index)
+    
+    def count_nonempty(self) -> int:
+        return int(np.count_nonzero(np.diff(self.offsets)))
+    
+    def decode(self, index: int, name: Optional[str] = None) -> List[str]:
+        offsets, ids = self._column(name or self.manifest['field'])
+        terms = self.terms
+        return [terms[token_id] for token_id in ids[offsets[index]:offsets[index + 1]].tolist()]
+    
+    def describes(self, path: Path) -> bool:
+        # Corpus écrit lors du même passage que ce fichier d'articles (taille et date identiques)
+        source = self.manifest.get('source')
+        return source is not None and Path(path).exists() and file_signature(path) == source
+    
+    def matches(self, articles: List[Dict]) -> bool:
+        return (len(articles) == len(self)
+                and urls_hash(article.get('url') for article in articles) == self.manifest['urls_hash'])
+    
+    def articles(self, columns: Iterable[str]) -> List[Dict]:
+        articles = [{} for _ in range(len(self))]
+        for name in columns:
+            if name == 'nb_tokens':
+                for article, count in zip(articles, np.diff(self.offsets).tolist()):
+                    article[name] = count
+            elif name in self.manifest['token_columns']:
+                for index, article in enumerate(articles):
+                    article[name] = self.decode(index, name)
+            elif name in self.manifest['string_columns'] or name in self.manifest['json_columns']:
+                offsets, data = self._column(name)
+                raw = data.tobytes()
+                bounds = offsets.tolist()
+                is_json = name in self.manifest['json_columns']
+                for index, article in enumerate(articles):
+                    value = raw[bounds[index]:bounds[index + 1]].decode('utf-8')
+                    if is_json:
+                        if value:
+                            article[name] = json.loads(value)
+                    else:
+                        article[name] = value
+            else:
+                raise KeyError(f"Colonne inconnue: {name}")
+        return articles